@@ -15,6 +15,8 @@ from app.shared.entities.request_status_entity import RequestStatus
 from app.shared.entities.client_profile_entity import ClientProfile
 from app.shared.entities.notifications_user_entity import NotificationsUser
 from app.shared.entities.notification_entity import Notification
+from app.shared.entities.idempotency_key_entity import IdempotencyKey
+from app.shared.entities.request_aggregate_entity import RequestAggregate
 
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if project_root not in sys.path:
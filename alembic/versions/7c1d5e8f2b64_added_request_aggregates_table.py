@@ -0,0 +1,79 @@
+"""AddedRequestAggregatesTable
+
+Revision ID: 7c1d5e8f2b64
+Revises: 4e7b2c9d1a30
+Create Date: 2026-10-19 16:05:12.734118
+
+"""
+
+# ruff: noqa: F401
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = "7c1d5e8f2b64"
+down_revision: Union[str, None] = "4e7b2c9d1a30"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mismos umbrales que risk_level_for en calculate_risk_service
+RISK_LEVEL_CASE = """
+    CASE
+        WHEN risk_score IS NULL THEN 'SIN_EVALUAR'
+        WHEN risk_score <= 15 THEN 'MUY_BAJO'
+        WHEN risk_score <= 25 THEN 'BAJO'
+        WHEN risk_score <= 40 THEN 'MEDIO'
+        WHEN risk_score <= 60 THEN 'ALTO'
+        WHEN risk_score <= 80 THEN 'MUY_ALTO'
+        ELSE 'CRITICO'
+    END
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "request_aggregates",
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("status_id", sa.Uuid(), nullable=False),
+        sa.Column("credit_type_id", sa.Uuid(), nullable=False),
+        sa.Column(
+            "risk_level", sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False
+        ),
+        sa.Column("request_count", sa.Integer(), nullable=False),
+        sa.Column("requested_amount", sa.Float(), nullable=False),
+        sa.Column("approved_amount", sa.Float(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["credit_type_id"], ["credit_types.id"]),
+        sa.ForeignKeyConstraint(["status_id"], ["request_statuses.id"]),
+        sa.PrimaryKeyConstraint("month", "status_id", "credit_type_id", "risk_level"),
+    )
+
+    # Carga inicial desde las solicitudes existentes
+    if op.get_bind().dialect.name == "postgresql":
+        month = "CAST(date_trunc('month', created_at) AS DATE)"
+        now = "now()"
+    else:
+        month = "strftime('%Y-%m-01', created_at)"
+        now = "CURRENT_TIMESTAMP"
+    op.execute(
+        f"""
+        INSERT INTO request_aggregates (
+            month, status_id, credit_type_id, risk_level,
+            request_count, requested_amount, approved_amount, updated_at
+        )
+        SELECT
+            {month}, status_id, credit_type_id, {RISK_LEVEL_CASE},
+            COUNT(*), SUM(requested_amount), SUM(COALESCE(approved_amount, 0)), {now}
+        FROM requests
+        GROUP BY 1, 2, 3, 4
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("request_aggregates")
@@ -0,0 +1,122 @@
+import math
+from typing import Hashable, List, Optional, Sequence
+from fastapi import HTTPException, Request, status
+from app.admission.limiter import (
+    SHED_RATE_LIMITED,
+    AdmissionQueue,
+    RateLimiter,
+    RouteClass,
+)
+from app.metrics.registry import MetricFamily, Registry, registry as default_registry
+
+WRITE_METHODS = frozenset(("POST", "PUT", "PATCH", "DELETE"))
+READ_METHODS = frozenset(("GET", "HEAD"))
+DEFAULT_AUTH_PREFIXES = ("/auth",)
+# Operación y documentación: deben responder aun con el servicio saturado
+DEFAULT_EXEMPT_PREFIXES = ("/metrics", "/admin", "/docs", "/redoc", "/openapi.json")
+
+
+class AdmissionController:
+    """
+    Clasifica los requests (writes, reads, exports, auth) y aplica a cada
+    clase su cola acotada y su límite por usuario. Los rechazos se cuentan
+    en admission_shed_total por clase y motivo.
+    """
+
+    def __init__(
+        self,
+        classes: Sequence[RouteClass],
+        registry: Registry = default_registry,
+        auth_prefixes: Sequence[str] = DEFAULT_AUTH_PREFIXES,
+        exempt_prefixes: Sequence[str] = DEFAULT_EXEMPT_PREFIXES,
+    ):
+        self.classes = {c.name: c for c in classes}
+        self.queues = {c.name: AdmissionQueue(c) for c in classes}
+        self.rate_limiter = RateLimiter()
+        self.auth_prefixes = tuple(auth_prefixes)
+        self.exempt_prefixes = tuple(exempt_prefixes)
+        self.shed = registry.counter(
+            "admission_shed",
+            "Requests rechazados por control de admisión.",
+            ("route_class", "reason"),
+        )
+
+    def classify(self, method: str, path: str) -> Optional[RouteClass]:
+        if path.startswith(self.exempt_prefixes):
+            return None
+        if path.startswith(self.auth_prefixes):
+            name = "auth"
+        elif path.rstrip("/").endswith("/export"):
+            name = "exports"
+        elif method in WRITE_METHODS:
+            name = "writes"
+        elif method in READ_METHODS:
+            name = "reads"
+        else:
+            return None
+        return self.classes.get(name)
+
+    async def acquire(self, route_class: RouteClass) -> Optional[str]:
+        reason = await self.queues[route_class.name].acquire()
+        if reason is not None:
+            self.shed.inc(route_class=route_class.name, reason=reason)
+        return reason
+
+    def release(self, route_class: RouteClass) -> None:
+        self.queues[route_class.name].release()
+
+    def check_rate(self, user_id: Hashable, method: str, path: str) -> None:
+        """HTTP 429 con Retry-After si el usuario agotó su bucket"""
+        route_class = self.classify(method, path)
+        if route_class is None:
+            return
+        wait = self.rate_limiter.check(user_id, route_class)
+        if wait <= 0:
+            return
+        self.shed.inc(route_class=route_class.name, reason=SHED_RATE_LIMITED)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Demasiadas solicitudes, reintente más tarde.",
+            headers={"Retry-After": str(max(1, math.ceil(wait)))},
+        )
+
+    def families(self) -> List[MetricFamily]:
+        queues = self.queues.items()
+        return [
+            (
+                "admission_in_flight",
+                "gauge",
+                "Requests admitidos en ejecución por clase de ruta.",
+                [
+                    ("admission_in_flight", {"route_class": name}, q.active)
+                    for name, q in queues
+                ],
+            ),
+            (
+                "admission_queued",
+                "gauge",
+                "Requests esperando lugar por clase de ruta.",
+                [
+                    ("admission_queued", {"route_class": name}, q.queued)
+                    for name, q in queues
+                ],
+            ),
+        ]
+
+
+_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> Optional[AdmissionController]:
+    return _controller
+
+
+def set_admission_controller(controller: Optional[AdmissionController]) -> None:
+    global _controller
+    _controller = controller
+
+
+def enforce_rate_limit(request: Request, user_id: Hashable) -> None:
+    """Lo llama jwt_guard una vez por request, con el usuario ya verificado"""
+    if _controller is not None:
+        _controller.check_rate(user_id, request.method, request.url.path)
@@ -0,0 +1,127 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Deque, Hashable, Optional, Tuple
+
+SHED_QUEUE_FULL = "queue_full"
+SHED_QUEUE_TIMEOUT = "queue_timeout"
+SHED_RATE_LIMITED = "rate_limited"
+
+
+@dataclass(frozen=True)
+class RouteClass:
+    name: str
+    max_concurrent: int
+    max_queue: int
+    queue_timeout: float = 2.0
+    retry_after: int = 1
+    # Límite por usuario: tokens por minuto (0 lo desactiva) y ráfaga
+    rate_per_minute: float = 0.0
+    burst: int = 10
+
+
+class AdmissionQueue:
+    """
+    Semáforo con cola acotada: hasta `max_concurrent` requests a la vez y
+    `max_queue` esperando, cada uno como mucho `queue_timeout` segundos.
+    Fuera de eso el request se rechaza de inmediato en lugar de acumularse.
+    Vive en el event loop del worker: no es seguro entre hilos.
+    """
+
+    def __init__(self, route_class: RouteClass):
+        self.route_class = route_class
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> Optional[str]:
+        """None si se obtuvo un lugar; si no, el motivo del rechazo"""
+        if self.active < self.route_class.max_concurrent and not self._waiters:
+            self.active += 1
+            return None
+        if len(self._waiters) >= self.route_class.max_queue:
+            return SHED_QUEUE_FULL
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # release() transfiere su lugar al resolver el future
+            await asyncio.wait_for(waiter, self.route_class.queue_timeout)
+            return None
+        except asyncio.TimeoutError:
+            self._discard(waiter)
+            return SHED_QUEUE_TIMEOUT
+        except asyncio.CancelledError:
+            # El cliente se fue: devolver el lugar si ya se le había cedido
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                self._discard(waiter)
+            raise
+
+    def _discard(self, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def take(self, now: float) -> float:
+        """0 si había un token; si no, segundos hasta el próximo"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """
+    Token buckets por (usuario, clase de ruta). Se conservan los
+    `max_buckets` usados más recientemente; un bucket descartado vuelve
+    lleno, lo que solo favorece al usuario.
+    """
+
+    def __init__(self, max_buckets: int = 10_000, clock=time.monotonic):
+        self.max_buckets = max_buckets
+        self.clock = clock
+        self._buckets: "OrderedDict[Tuple[Hashable, str], TokenBucket]" = OrderedDict()
+
+    def check(self, user_id: Hashable, route_class: RouteClass) -> float:
+        if route_class.rate_per_minute <= 0:
+            return 0.0
+        now = self.clock()
+        key = (user_id, route_class.name)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(
+                route_class.rate_per_minute / 60, route_class.burst, now
+            )
+            while len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket.take(now)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
@@ -0,0 +1,37 @@
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.admission.controller import AdmissionController
+
+
+class AdmissionMiddleware:
+    """
+    Admite cada request HTTP en la cola de su clase de ruta. Si la cola está
+    llena o la espera se agota responde 503 con Retry-After sin llegar al
+    endpoint, para que una clase saturada no arrastre a las demás.
+    """
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        route_class = self.controller.classify(scope["method"], scope["path"])
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        if await self.controller.acquire(route_class) is not None:
+            response = JSONResponse(
+                {"detail": "Servicio saturado, reintente más tarde."},
+                status_code=503,
+                headers={"Retry-After": str(route_class.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(route_class)
@@ -0,0 +1,54 @@
+import os
+from typing import Optional
+from fastapi import FastAPI
+from app.admission.controller import AdmissionController, set_admission_controller
+from app.admission.limiter import RouteClass
+from app.admission.middleware import AdmissionMiddleware
+from app.core.env import load_env
+from app.metrics.registry import Registry, registry as default_registry
+
+load_env()
+
+# Por worker: (concurrencia, cola, espera máxima en cola, Retry-After)
+DEFAULT_CLASSES = {
+    "writes": (8, 32, 5.0, 2),
+    "reads": (24, 96, 2.0, 1),
+    "exports": (2, 2, 1.0, 10),
+    "auth": (8, 32, 2.0, 1),
+}
+
+
+def _route_class(name: str, defaults: tuple) -> RouteClass:
+    concurrency, queue, timeout, retry_after = defaults
+    prefix = f"ADMISSION_{name.upper()}"
+    return RouteClass(
+        name=name,
+        max_concurrent=int(os.getenv(f"{prefix}_CONCURRENCY", concurrency)),
+        max_queue=int(os.getenv(f"{prefix}_QUEUE", queue)),
+        queue_timeout=float(os.getenv(f"{prefix}_QUEUE_TIMEOUT", timeout)),
+        retry_after=int(os.getenv(f"{prefix}_RETRY_AFTER", retry_after)),
+        rate_per_minute=float(os.getenv(f"RATE_LIMIT_{name.upper()}_PER_MINUTE", 0)),
+        burst=int(os.getenv(f"RATE_LIMIT_{name.upper()}_BURST", 10)),
+    )
+
+
+def setup_admission(
+    app: FastAPI, registry: Registry = default_registry
+) -> Optional[AdmissionController]:
+    """
+    Instala el control de admisión salvo con ADMISSION_ENABLED=false. Los
+    límites son por worker: con N workers la capacidad total es N veces.
+    """
+    if os.getenv("ADMISSION_ENABLED", "true").lower() in ("0", "false", "no"):
+        set_admission_controller(None)
+        return None
+    auth_prefixes = os.getenv("ADMISSION_AUTH_PREFIXES", "/auth")
+    controller = AdmissionController(
+        [_route_class(name, defaults) for name, defaults in DEFAULT_CLASSES.items()],
+        registry=registry,
+        auth_prefixes=tuple(p for p in auth_prefixes.split(",") if p),
+    )
+    app.add_middleware(AdmissionMiddleware, controller=controller)
+    registry.register_collector(controller.families)
+    set_admission_controller(controller)
+    return controller
@@ -0,0 +1,193 @@
+import asyncio
+from unittest.mock import MagicMock
+from uuid import uuid4
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+from app.admission.controller import (
+    AdmissionController,
+    enforce_rate_limit,
+    set_admission_controller,
+)
+from app.admission.limiter import (
+    SHED_QUEUE_FULL,
+    SHED_QUEUE_TIMEOUT,
+    AdmissionQueue,
+    RateLimiter,
+    RouteClass,
+)
+from app.admission.middleware import AdmissionMiddleware
+from app.config.cors import setup_cors
+from app.metrics.registry import Registry
+
+
+def route_class(name="writes", **kwargs):
+    options = {"max_concurrent": 1, "max_queue": 1, "queue_timeout": 1.0}
+    options.update(kwargs)
+    return RouteClass(name=name, **options)
+
+
+def controller(**kwargs):
+    classes = [
+        route_class(name, **kwargs) for name in ("writes", "reads", "exports", "auth")
+    ]
+    return AdmissionController(classes, registry=Registry())
+
+
+@pytest.mark.asyncio
+async def test_queue_admits_up_to_limit_then_queues_then_sheds():
+    queue = AdmissionQueue(route_class(max_concurrent=1, max_queue=1))
+
+    assert await queue.acquire() is None
+    waiter = asyncio.create_task(queue.acquire())
+    await asyncio.sleep(0)
+    assert queue.queued == 1
+    assert await queue.acquire() == SHED_QUEUE_FULL
+
+    queue.release()
+    assert await waiter is None
+    assert (queue.active, queue.queued) == (1, 0)
+    queue.release()
+    assert queue.active == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_wait_times_out():
+    queue = AdmissionQueue(route_class(queue_timeout=0.01))
+    await queue.acquire()
+
+    assert await queue.acquire() == SHED_QUEUE_TIMEOUT
+    assert queue.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_a_slot():
+    queue = AdmissionQueue(route_class())
+    await queue.acquire()
+    waiter = asyncio.create_task(queue.acquire())
+    await asyncio.sleep(0)
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    queue.release()
+
+    assert (queue.active, queue.queued) == (0, 0)
+
+
+def test_token_bucket_allows_burst_then_refills():
+    now = [0.0]
+    limiter = RateLimiter(clock=lambda: now[0])
+    limited = route_class(rate_per_minute=60, burst=2)
+
+    assert limiter.check("u1", limited) == 0
+    assert limiter.check("u1", limited) == 0
+    assert limiter.check("u1", limited) == pytest.approx(1.0)
+    assert limiter.check("u2", limited) == 0
+    now[0] = 1.0
+    assert limiter.check("u1", limited) == 0
+    assert limiter.check("u1", route_class(rate_per_minute=0)) == 0
+
+
+def test_rate_limiter_keeps_bounded_buckets():
+    limiter = RateLimiter(max_buckets=2)
+    limited = route_class(rate_per_minute=60)
+
+    for user in ("a", "b", "c"):
+        limiter.check(user, limited)
+
+    assert len(limiter) == 2
+
+
+def test_classify_by_method_and_path():
+    admission = controller()
+
+    assert admission.classify("POST", "/requests/").name == "writes"
+    assert admission.classify("PATCH", "/requests/1/approve").name == "writes"
+    assert admission.classify("GET", "/requests/paginated-list").name == "reads"
+    assert admission.classify("GET", "/requests/export").name == "exports"
+    assert admission.classify("POST", "/auth/token").name == "auth"
+    assert admission.classify("GET", "/metrics") is None
+    assert admission.classify("OPTIONS", "/requests/") is None
+
+
+@pytest.mark.asyncio
+async def test_middleware_sheds_saturated_class_without_blocking_others():
+    admission = controller(max_concurrent=1, max_queue=0)
+    release = asyncio.Event()
+    app = FastAPI()
+
+    @app.post("/slow")
+    async def slow():
+        await release.wait()
+        return {"ok": True}
+
+    @app.get("/fast")
+    async def fast():
+        return {"ok": True}
+
+    transport = httpx.ASGITransport(app=AdmissionMiddleware(app, admission))
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+        first = asyncio.create_task(client.post("/slow"))
+        await asyncio.sleep(0.05)
+        shed = await client.post("/slow")
+        read = await client.get("/fast")
+        release.set()
+        assert (await first).status_code == 200
+
+    assert shed.status_code == 503
+    assert shed.headers["retry-after"] == "1"
+    assert read.status_code == 200
+    assert admission.shed.value(route_class="writes", reason=SHED_QUEUE_FULL) == 1
+    assert admission.queues["writes"].active == 0
+
+
+@pytest.mark.asyncio
+async def test_shed_response_carries_cors_headers(monkeypatch):
+    monkeypatch.setenv("ENVIRONMENT", "development")
+    admission = controller(max_concurrent=1, max_queue=0)
+    release = asyncio.Event()
+    app = FastAPI()
+
+    @app.post("/slow")
+    async def slow():
+        await release.wait()
+        return {"ok": True}
+
+    app.add_middleware(AdmissionMiddleware, controller=admission)
+    setup_cors(app)
+
+    origin = {"Origin": "http://front.test"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+        first = asyncio.create_task(client.post("/slow", headers=origin))
+        await asyncio.sleep(0.05)
+        shed = await client.post("/slow", headers=origin)
+        release.set()
+        await first
+
+    assert shed.status_code == 503
+    assert "access-control-allow-origin" in shed.headers
+    assert "retry-after" in shed.headers["access-control-expose-headers"].lower()
+
+
+def test_enforce_rate_limit_raises_429_with_retry_after():
+    admission = controller(rate_per_minute=6, burst=1)
+    request = MagicMock(method="POST")
+    request.url.path = "/requests/"
+    user_id = uuid4()
+    set_admission_controller(admission)
+    try:
+        enforce_rate_limit(request, user_id)
+        with pytest.raises(HTTPException) as exc:
+            enforce_rate_limit(request, user_id)
+    finally:
+        set_admission_controller(None)
+
+    assert exc.value.status_code == 429
+    assert exc.value.headers == {"Retry-After": "10"}
+    assert admission.shed.value(route_class="writes", reason="rate_limited") == 1
+    families = {name: samples for name, _, _, samples in admission.families()}
+    assert ("admission_in_flight", {"route_class": "writes"}, 0) in families[
+        "admission_in_flight"
+    ]
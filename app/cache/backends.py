@@ -0,0 +1,203 @@
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+# Costo aproximado por entrada además de clave y valor (dict, tupla, bytes)
+ENTRY_OVERHEAD = 120
+
+
+class CacheBackend(ABC):
+    """Almacén de bytes con TTL y presupuesto de memoria en bytes"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]: ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    @abstractmethod
+    def add(self, key: str, factory: Callable[[], bytes], ttl: float) -> bytes:
+        """Valor actual de `key`; si no existe, guarda y devuelve factory()"""
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]: ...
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    LRU del proceso acotado por `max_bytes`. Cada worker tiene el suyo: las
+    invalidaciones de un worker no llegan a los demás, que dependen del TTL.
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024, clock=time.monotonic):
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.bytes = 0
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _size(key: str, value: bytes) -> int:
+        return len(key) + len(value) + ENTRY_OVERHEAD
+
+    def _get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= self.clock():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= self._size(key, entry[1])
+
+    def _set(self, key: str, value: bytes, ttl: float) -> None:
+        size = self._size(key, value)
+        if size > self.max_bytes // 8:
+            return  # una sola entrada no puede desplazar gran parte de la caché
+        self._remove(key)
+        self._entries[key] = (self.clock() + ttl, value)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            oldest, (_, old_value) = self._entries.popitem(last=False)
+            self.bytes -= self._size(oldest, old_value)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            return self._get(key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            self._set(key, value, ttl)
+
+    def add(self, key: str, factory: Callable[[], bytes], ttl: float) -> bytes:
+        with self._lock:
+            value = self._get(key)
+            if value is None:
+                value = factory()
+                self._set(key, value, ttl)
+            return value
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "bytes": self.bytes}
+
+
+class SqliteCacheBackend(CacheBackend):
+    """
+    Caché compartida entre los workers de un mismo host en un archivo SQLite
+    (sustituto local de un servidor de caché). Las invalidaciones son
+    inmediatas para todos los workers. Cuando la suma de tamaños supera
+    `max_bytes` se descartan las entradas usadas hace más tiempo.
+    """
+
+    def __init__(
+        self, path: str, max_bytes: int = 64 * 1024 * 1024, evict_every: int = 100
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.evict_every = evict_every
+        self._local = threading.local()
+        self._writes = 0
+        self._execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB"
+            " NOT NULL, size INTEGER NOT NULL, expires_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._execute(
+            "CREATE INDEX IF NOT EXISTS ix_cache_accessed_at ON cache (accessed_at)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        # Una conexión por hilo y por proceso: no se heredan a través de fork
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _execute(self, sql: str, parameters=()) -> sqlite3.Cursor:
+        return self._connection().execute(sql, parameters)
+
+    def get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        row = self._execute(
+            "UPDATE cache SET accessed_at = ? WHERE key = ? AND expires_at > ?"
+            " RETURNING value",
+            (now, key, now),
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        now = time.time()
+        self._execute(
+            "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)",
+            (key, value, len(key) + len(value), now + ttl, now),
+        )
+        self._writes += 1
+        if self._writes % self.evict_every == 0:
+            self.evict()
+
+    def add(self, key: str, factory: Callable[[], bytes], ttl: float) -> bytes:
+        value = self.get(key)
+        if value is not None:
+            return value
+        now = time.time()
+        candidate = factory()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "DELETE FROM cache WHERE key = ? AND expires_at <= ?", (key, now)
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO cache VALUES (?, ?, ?, ?, ?)",
+                (key, candidate, len(key) + len(candidate), now + ttl, now),
+            )
+            row = conn.execute("SELECT value FROM cache WHERE key = ?", (key,))
+            value = row.fetchone()[0]
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return value
+
+    def delete(self, key: str) -> None:
+        self._execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def evict(self) -> None:
+        now = time.time()
+        self._execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+        total = self._execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Borra las menos usadas hasta bajar a 90 % del presupuesto
+        excess = total - int(self.max_bytes * 0.9)
+        self._execute(
+            "DELETE FROM cache WHERE key IN (SELECT key FROM (SELECT key,"
+            " SUM(size) OVER (ORDER BY accessed_at, key) - size AS before"
+            " FROM cache) WHERE before < ?)",
+            (excess,),
+        )
+
+    def stats(self) -> Dict[str, int]:
+        entries, size = self._execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache"
+        ).fetchone()
+        return {"entries": entries, "bytes": size}
@@ -0,0 +1,127 @@
+import logging
+import os
+import tempfile
+import uuid
+from typing import Callable, List, Optional
+from app.cache.backends import CacheBackend, MemoryCacheBackend, SqliteCacheBackend
+from app.core.env import load_env
+from app.metrics.registry import MetricFamily, Registry, registry as default_registry
+
+load_env()
+
+logger = logging.getLogger(__name__)
+
+
+def _new_version() -> bytes:
+    return uuid.uuid4().hex[:16].encode()
+
+
+class VersionedCache:
+    """
+    Caché read-through de respuestas serializadas con invalidación por
+    versión:
+    - Cada clave lógica (p. ej. una solicitud) tiene un token de versión y
+      las respuestas se guardan bajo "clave@versión".
+    - Invalidar borra el token: la próxima lectura crea uno nuevo y las
+      entradas anteriores quedan inalcanzables hasta que las desplacen el
+      LRU o el TTL.
+    - Una lectura que cargó datos viejos mientras se escribía los guarda
+      bajo la versión anterior, que ya nadie consulta; por eso hay que
+      invalidar después del commit.
+    Los errores del backend no fallan el request: se lee de la base.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend],
+        ttl: float = 300,
+        registry: Registry = default_registry,
+    ):
+        self.backend = backend
+        self.ttl = ttl
+        self.lookups = registry.counter(
+            "response_cache_lookups",
+            "Lecturas de la caché de respuestas por resultado.",
+            ("result",),
+        )
+        self.invalidations = registry.counter(
+            "response_cache_invalidations",
+            "Claves invalidadas en la caché de respuestas.",
+        )
+
+    def _version(self, key: str) -> str:
+        return self.backend.add(f"v:{key}", _new_version, self.ttl).decode()
+
+    def get_or_load(self, key: str, loader: Callable[[], bytes]) -> bytes:
+        if self.backend is None:
+            return loader()
+        try:
+            entry_key = f"{key}@{self._version(key)}"
+            body = self.backend.get(entry_key)
+        except Exception as e:
+            logger.warning("Caché de respuestas no disponible: %s", e)
+            return loader()
+        if body is not None:
+            self.lookups.inc(result="hit")
+            return body
+
+        self.lookups.inc(result="miss")
+        body = loader()
+        try:
+            self.backend.set(entry_key, body, self.ttl)
+        except Exception as e:
+            logger.warning("No se pudo guardar en la caché de respuestas: %s", e)
+        return body
+
+    def invalidate(self, *keys: str) -> None:
+        if self.backend is None:
+            return
+        for key in keys:
+            try:
+                self.backend.delete(f"v:{key}")
+                self.invalidations.inc()
+            except Exception as e:
+                logger.warning("No se pudo invalidar '%s': %s", key, e)
+
+    def families(self) -> List[MetricFamily]:
+        if self.backend is None:
+            return []
+        stats = self.backend.stats()
+        return [
+            (
+                "response_cache_bytes",
+                "gauge",
+                "Bytes ocupados por la caché de respuestas.",
+                [("response_cache_bytes", {}, stats["bytes"])],
+            ),
+            (
+                "response_cache_entries",
+                "gauge",
+                "Entradas (respuestas y versiones) en la caché de respuestas.",
+                [("response_cache_entries", {}, stats["entries"])],
+            ),
+        ]
+
+
+def create_backend(name: str) -> Optional[CacheBackend]:
+    if name == "memory":
+        return MemoryCacheBackend(
+            int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+        )
+    if name == "sqlite":
+        path = os.getenv("RESPONSE_CACHE_PATH") or os.path.join(
+            tempfile.gettempdir(), "agricapital-response-cache.db"
+        )
+        return SqliteCacheBackend(
+            path, int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+        )
+    if name in ("", "none"):
+        return None
+    raise ValueError(f"Backend de caché desconocido: {name}")
+
+
+response_cache = VersionedCache(
+    create_backend(os.getenv("RESPONSE_CACHE_BACKEND", "memory")),
+    ttl=float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "60")),
+)
+default_registry.register_collector(response_cache.families)
@@ -0,0 +1,110 @@
+from unittest.mock import MagicMock
+import pytest
+from app.cache.backends import ENTRY_OVERHEAD, MemoryCacheBackend, SqliteCacheBackend
+from app.cache.response_cache import VersionedCache
+from app.metrics.registry import Registry
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_memory_backend_evicts_least_recently_used_within_budget():
+    backend = MemoryCacheBackend(max_bytes=8 * (ENTRY_OVERHEAD + 12))
+    for i in range(8):
+        backend.set(f"k{i}", b"0123456789", ttl=60)
+    backend.get("k0")
+
+    backend.set("k8", b"0123456789", ttl=60)
+
+    assert backend.get("k0") is not None
+    assert backend.get("k1") is None
+    assert backend.stats()["bytes"] <= backend.max_bytes
+
+
+def test_memory_backend_skips_oversized_values_and_expires_entries():
+    clock = Clock()
+    backend = MemoryCacheBackend(max_bytes=8000, clock=clock)
+
+    backend.set("big", b"x" * 2000, ttl=60)
+    backend.set("small", b"x", ttl=10)
+    clock.now = 11
+
+    assert backend.get("big") is None
+    assert backend.get("small") is None
+    assert backend.stats() == {"entries": 0, "bytes": 0}
+
+
+def test_sqlite_backend_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "cache.db")
+    worker_a, worker_b = SqliteCacheBackend(path), SqliteCacheBackend(path)
+
+    worker_a.set("k", b"body", ttl=60)
+    assert worker_b.get("k") == b"body"
+    assert worker_b.add("v", lambda: b"1", ttl=60) == b"1"
+    assert worker_a.add("v", lambda: b"2", ttl=60) == b"1"
+    worker_b.delete("k")
+    assert worker_a.get("k") is None
+    worker_a.set("old", b"x", ttl=-1)
+    assert worker_a.get("old") is None
+
+
+def test_sqlite_backend_evicts_least_recently_used(tmp_path):
+    backend = SqliteCacheBackend(str(tmp_path / "cache.db"), max_bytes=100)
+    for i in range(10):
+        backend.set(f"k{i}", b"x" * 18, ttl=60)  # 20 bytes con la clave
+    backend.get("k0")
+
+    backend.evict()
+
+    assert backend.stats()["bytes"] <= 90
+    assert backend.get("k0") is not None
+    assert backend.get("k1") is None
+
+
+@pytest.fixture
+def cache():
+    return VersionedCache(MemoryCacheBackend(), ttl=60, registry=Registry())
+
+
+def test_read_through_hits_until_invalidated(cache):
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return b'{"v": %d}' % len(loads)
+
+    assert cache.get_or_load("request:1", loader) == b'{"v": 1}'
+    assert cache.get_or_load("request:1", loader) == b'{"v": 1}'
+    cache.invalidate("request:1")
+    assert cache.get_or_load("request:1", loader) == b'{"v": 2}'
+
+    assert cache.lookups.value(result="hit") == 1
+    assert cache.lookups.value(result="miss") == 2
+    assert cache.invalidations.value() == 1
+
+
+def test_load_racing_with_a_write_does_not_cache_stale_data(cache):
+    def stale_loader():
+        # La escritura se confirma mientras la lectura carga datos viejos
+        cache.invalidate("request:1")
+        return b"old"
+
+    cache.get_or_load("request:1", stale_loader)
+
+    assert cache.get_or_load("request:1", lambda: b"new") == b"new"
+
+
+def test_backend_errors_fall_back_to_the_database():
+    backend = MagicMock()
+    backend.add.side_effect = OSError("disk I/O error")
+    cache = VersionedCache(backend, registry=Registry())
+
+    assert cache.get_or_load("request:1", lambda: b"db") == b"db"
+    assert VersionedCache(None, registry=Registry()).get_or_load(
+        "k", lambda: b"db"
+    ) == (b"db")
@@ -0,0 +1,87 @@
+import asyncio
+import os
+from typing import Callable, Optional, Tuple
+from uuid import UUID
+from fastapi import Depends, Request
+from fastapi.encoders import jsonable_encoder
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import Response
+from app.coalescing.singleflight import SingleFlight
+from app.core.env import load_env
+from app.metrics.registry import registry
+from app.shared.guards.jwtGuard import jwt_guard
+from app.shared.responses.json_response import FastJSONResponse
+
+load_env()
+
+# Scope compartido por todos los autenticados: solo para rutas cuya respuesta
+# no depende de quién llama
+SCOPE_AUTHENTICATED = "authenticated"
+
+# (status, cuerpo serializado, media type) que comparten los requests
+SharedResponse = Tuple[int, bytes, str]
+
+single_flight = SingleFlight()
+coalesced_requests = registry.counter(
+    "coalesced_requests",
+    "Lecturas concurrentes idénticas: leader ejecuta y follower reutiliza su respuesta.",
+    ("route", "result"),
+)
+
+
+def _enabled() -> bool:
+    return os.getenv("COALESCING_ENABLED", "true").lower() not in ("0", "false", "no")
+
+
+async def _execute(handler: Callable) -> SharedResponse:
+    if asyncio.iscoroutinefunction(handler):
+        result = await handler()
+    else:
+        result = await run_in_threadpool(handler)
+    if not isinstance(result, Response):
+        # Igual que FastAPI con un endpoint sin response_model
+        result = FastJSONResponse(jsonable_encoder(result))
+    return result.status_code, bytes(result.body), result.media_type
+
+
+def _response(shared: SharedResponse) -> Response:
+    status_code, body, media_type = shared
+    return Response(body, status_code=status_code, media_type=media_type)
+
+
+class Coalescing:
+    """
+    Comparte una ejecución (consulta y respuesta serializada) entre requests
+    idénticos y simultáneos: misma plantilla de ruta, mismos parámetros de
+    query (sin importar el orden) y mismo scope de autorización. Por defecto
+    el scope es el usuario que llama: solo se comparten respuestas entre sus
+    propios requests. Solo para lecturas sin efectos.
+    """
+
+    def __init__(self, request: Request, user_id: UUID, enabled: bool = True):
+        self.request = request
+        self.user_id = user_id
+        self.enabled = enabled
+
+    def key(self, scope: Optional[str] = None) -> tuple:
+        if scope is None:
+            scope = str(self.user_id)
+        route = self.request.scope.get("route")
+        path = getattr(route, "path", self.request.url.path)
+        query = tuple(sorted(self.request.query_params.multi_items()))
+        return (self.request.method, path, query, scope)
+
+    async def run(self, handler: Callable, scope: Optional[str] = None):
+        """`handler` puede ser async o sync (se ejecuta en el threadpool)"""
+        if not self.enabled:
+            return _response(await _execute(handler))
+        key = self.key(scope)
+        shared, is_follower = await single_flight.do(key, lambda: _execute(handler))
+        coalesced_requests.inc(
+            route=key[1], result="follower" if is_follower else "leader"
+        )
+        return _response(shared)
+
+
+def get_coalescing(request: Request, user_id: UUID = Depends(jwt_guard)) -> Coalescing:
+    return Coalescing(request, user_id, enabled=_enabled())
@@ -0,0 +1,57 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+def _consume(future: asyncio.Future) -> None:
+    # Evita "Future exception was never retrieved" cuando nadie esperaba
+    if not future.cancelled():
+        future.exception()
+
+
+class SingleFlight:
+    """
+    Ejecuciones compartidas por clave: mientras una llamada con la clave X
+    está en curso, las demás con la misma clave esperan su resultado (o su
+    excepción) en lugar de ejecutarse. No guarda nada después: al terminar,
+    la siguiente llamada vuelve a ejecutar.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(
+        self, key: Hashable, fn: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """(resultado, compartido); compartido es True si otra llamada lo produjo"""
+        while True:
+            pending = self._calls.get(key)
+            if pending is None:
+                break
+            try:
+                return await asyncio.shield(pending), True
+            except asyncio.CancelledError:
+                # Si se canceló la llamada original (el cliente se fue) y no
+                # esta, se vuelve a intentar como líder
+                if not pending.cancelled() or asyncio.current_task().cancelling():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_consume)
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
@@ -0,0 +1,171 @@
+import asyncio
+from unittest.mock import MagicMock
+from uuid import uuid4
+import pytest
+from fastapi import HTTPException
+from starlette.datastructures import QueryParams
+from app.coalescing.dependencies import (
+    SCOPE_AUTHENTICATED,
+    Coalescing,
+    coalesced_requests,
+)
+from app.coalescing.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    release = asyncio.Event()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await release.wait()
+        return "rows"
+
+    tasks = [asyncio.create_task(flight.do("k", fetch)) for _ in range(4)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert calls == [1]
+    assert sorted(shared for _, shared in results) == [False, True, True, True]
+    assert {value for value, _ in results} == {"rows"}
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_sequential_calls_execute_again_and_errors_are_shared():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise HTTPException(status_code=500, detail="db")
+
+    results = await asyncio.gather(
+        flight.do("k", fetch), flight.do("k", fetch), return_exceptions=True
+    )
+    with pytest.raises(HTTPException):
+        await flight.do("k", fetch)
+
+    assert all(isinstance(r, HTTPException) for r in results)
+    assert calls == [1, 1]
+
+
+@pytest.mark.asyncio
+async def test_follower_takes_over_when_leader_is_cancelled():
+    flight = SingleFlight()
+    started = asyncio.Event()
+
+    async def slow():
+        started.set()
+        await asyncio.sleep(10)
+
+    async def fast():
+        return "ok"
+
+    leader = asyncio.create_task(flight.do("k", slow))
+    await started.wait()
+    follower = asyncio.create_task(flight.do("k", fast))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == ("ok", False)
+
+
+def request(query: str, path="/requests/paginated-list"):
+    mock = MagicMock(method="GET", query_params=QueryParams(query))
+    mock.scope = {"route": MagicMock(path=path)}
+    return mock
+
+
+def test_key_normalizes_query_order_and_includes_scope():
+    user_id = uuid4()
+    first = Coalescing(request("page=1&per_page=10"), user_id)
+    second = Coalescing(request("per_page=10&page=1"), user_id)
+
+    assert first.key() == second.key()
+    assert first.key() != Coalescing(request("page=1&per_page=10"), uuid4()).key()
+    assert first.key("a") != first.key("b")
+    assert first.key("a") != Coalescing(request("page=2&per_page=10"), uuid4()).key("a")
+
+
+@pytest.mark.asyncio
+async def test_run_shares_serialized_response_and_counts_hits():
+    route = "/coalescing-test"
+    user_id = uuid4()
+    calls = []
+
+    def handler():
+        calls.append(1)
+        return {"data": [1, 2]}
+
+    async def run():
+        return await Coalescing(request("", path=route), user_id).run(handler)
+
+    responses = await asyncio.gather(run(), run(), run())
+
+    assert len(calls) == 1
+    assert {r.body for r in responses} == {b'{"data":[1,2]}'}
+    assert coalesced_requests.value(route=route, result="leader") == 1
+    assert coalesced_requests.value(route=route, result="follower") == 2
+
+
+@pytest.mark.asyncio
+async def test_different_users_do_not_share_responses():
+    release = asyncio.Event()
+    calls = []
+
+    async def handler():
+        calls.append(1)
+        await release.wait()
+        return {"ok": True}
+
+    async def run():
+        return await Coalescing(request("", path="/per-user"), uuid4()).run(handler)
+
+    tasks = [asyncio.create_task(run()) for _ in range(2)]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert calls == [1, 1]
+
+
+@pytest.mark.asyncio
+async def test_shared_scope_collapses_requests_from_different_users():
+    release = asyncio.Event()
+    calls = []
+
+    async def handler():
+        calls.append(1)
+        await release.wait()
+        return {"ok": True}
+
+    async def run():
+        coalescing = Coalescing(request("", path="/shared"), uuid4())
+        return await coalescing.run(handler, scope=SCOPE_AUTHENTICATED)
+
+    tasks = [asyncio.create_task(run()) for _ in range(2)]
+    await asyncio.sleep(0)
+    release.set()
+    responses = await asyncio.gather(*tasks)
+
+    assert calls == [1]
+    assert {r.body for r in responses} == {b'{"ok":true}'}
+
+
+@pytest.mark.asyncio
+async def test_disabled_coalescing_runs_every_request():
+    calls = []
+
+    async def handler():
+        calls.append(1)
+        return {"ok": True}
+
+    for _ in range(2):
+        await Coalescing(request(""), uuid4(), enabled=False).run(handler)
+
+    assert calls == [1, 1]
@@ -0,0 +1,296 @@
+import os
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Dict, Optional
+from app.core.env import load_env
+from app.metrics.http import UNMATCHED_ROUTE
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli es opcional
+    brotli = None
+
+load_env()
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "text/",
+)
+
+
+def parse_accept_encoding(value: str) -> Dict[str, float]:
+    """{"gzip": 1.0, "br": 0.5, ...}; se descartan las codificaciones con q=0"""
+    encodings = {}
+    for item in value.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, raw = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(raw)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            encodings[name] = q
+    return encodings
+
+
+def choose_encoding(accept_encoding: str, brotli_enabled: bool) -> Optional[str]:
+    accepted = parse_accept_encoding(accept_encoding)
+    candidates = []
+    if brotli_enabled:
+        candidates.append("br")
+    candidates.append("gzip")
+    best, best_q = None, 0.0
+    for encoding in candidates:
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class _Compressor:
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        """Comprime un fragmento; si no es el último, lo vacía (sync flush)"""
+        if self.encoding == "br":
+            out = self._brotli.process(data)
+            return out + (self._brotli.finish() if final else self._brotli.flush())
+        out = self._zlib.compress(data)
+        return out + self._zlib.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+@dataclass
+class RouteCompressionStats:
+    responses: int = 0
+    compressed: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    cpu_seconds: float = 0.0
+
+    def as_dict(self) -> dict:
+        saved = self.bytes_in - self.bytes_out
+        return {
+            "responses": self.responses,
+            "compressed": self.compressed,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "bytes_saved": saved,
+            "ratio": (
+                round(self.bytes_out / self.bytes_in, 4) if self.bytes_in else None
+            ),
+            "cpu_ms": round(self.cpu_seconds * 1000, 3),
+            "cpu_ms_per_mb_saved": (
+                round(self.cpu_seconds * 1000 / (saved / 1_000_000), 3)
+                if saved > 0
+                else None
+            ),
+        }
+
+
+class CompressionStats:
+    """Costo de CPU frente a bytes ahorrados, por plantilla de ruta"""
+
+    def __init__(self):
+        self._routes: Dict[str, RouteCompressionStats] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self, route: str, bytes_in: int, bytes_out: int, cpu: float, compressed: bool
+    ) -> None:
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                stats = self._routes[route] = RouteCompressionStats()
+            stats.responses += 1
+            stats.bytes_in += bytes_in
+            stats.bytes_out += bytes_out
+            stats.cpu_seconds += cpu
+            if compressed:
+                stats.compressed += 1
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {route: s.as_dict() for route, s in self._routes.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+compression_stats = CompressionStats()
+
+
+def _route_name(scope: Scope) -> str:
+    """Plantilla de ruta; las rutas crudas (404, scanners) no crean series"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class CompressionMiddleware:
+    """
+    Compresión gzip/brotli negociada con Accept-Encoding, en ASGI puro:
+    - Respuestas completas menores a `minimum_size` se envían sin comprimir.
+    - Respuestas en streaming se comprimen fragmento a fragmento (sync
+      flush), de modo que el cliente recibe datos a medida que se generan.
+    - No se tocan WebSockets, respuestas ya codificadas ni tipos de
+      contenido no comprimibles.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        stats: Optional[CompressionStats] = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.brotli_enabled = brotli is not None
+        self.stats = stats if stats is not None else compression_stats
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), self.brotli_enabled
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await _CompressedResponder(self, scope, encoding, send).run(receive)
+
+
+class _CompressedResponder:
+    def __init__(
+        self, middleware: CompressionMiddleware, scope: Scope, encoding: str, send
+    ):
+        self.middleware = middleware
+        self.scope = scope
+        self.encoding = encoding
+        self.send = send
+        self.start_message: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu = 0.0
+
+    async def run(self, receive: Receive):
+        await self.middleware.app(self.scope, receive, self.send_wrapper)
+
+    def _should_compress(self, headers: Headers) -> bool:
+        if "content-encoding" in headers:
+            return False
+        media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return media_type.startswith(COMPRESSIBLE_TYPES)
+
+    def _compress(self, data: bytes, final: bool) -> bytes:
+        start = time.thread_time()
+        out = self.compressor.compress(data, final)
+        self.cpu += time.thread_time() - start
+        self.bytes_in += len(data)
+        self.bytes_out += len(out)
+        return out
+
+    def _record(self, compressed: bool):
+        self.middleware.stats.record(
+            _route_name(self.scope),
+            self.bytes_in,
+            self.bytes_out,
+            self.cpu,
+            compressed,
+        )
+
+    async def send_wrapper(self, message: Message):
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            self.start_message = message
+            self.passthrough = not self._should_compress(
+                Headers(raw=message.get("headers", []))
+            )
+            if self.passthrough:
+                await self.send(message)
+            return
+
+        if message_type != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            if not more_body and len(body) < self.middleware.minimum_size:
+                # Respuesta completa y pequeña: no vale la pena comprimir
+                self.bytes_in = self.bytes_out = len(body)
+                self._record(compressed=False)
+                await self.send(self.start_message)
+                await self.send(message)
+                return
+            self.compressor = _Compressor(
+                self.encoding,
+                self.middleware.gzip_level,
+                self.middleware.brotli_quality,
+            )
+            headers = MutableHeaders(raw=list(self.start_message.get("headers", [])))
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                del headers["Content-Length"]
+            compressed = self._compress(body, final=not more_body)
+            if not more_body:
+                headers["Content-Length"] = str(len(compressed))
+            self.start_message["headers"] = headers.raw
+            await self.send(self.start_message)
+            await self.send(
+                {
+                    "type": "http.response.body",
+                    "body": compressed,
+                    "more_body": more_body,
+                }
+            )
+        else:
+            compressed = self._compress(body, final=not more_body)
+            await self.send(
+                {
+                    "type": "http.response.body",
+                    "body": compressed,
+                    "more_body": more_body,
+                }
+            )
+
+        if not more_body:
+            self._record(compressed=True)
+
+
+def setup_compression(app):
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=int(os.getenv("COMPRESSION_MIN_SIZE", "1024")),
+        gzip_level=int(os.getenv("COMPRESSION_GZIP_LEVEL", "6")),
+        brotli_quality=int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4")),
+    )
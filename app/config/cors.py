@@ -1,9 +1,9 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import os
-from dotenv import load_dotenv
+from app.core.env import load_env
 
-load_dotenv()
+load_env()
 
 
 def setup_cors(app: FastAPI):
@@ -21,4 +21,5 @@ def setup_cors(app: FastAPI):
         allow_credentials=True,
         allow_methods=methods,
         allow_headers=headers,
+        expose_headers=["Retry-After"],
     )
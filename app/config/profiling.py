@@ -0,0 +1,260 @@
+import asyncio
+import cProfile
+import functools
+import hmac
+import io
+import itertools
+import marshal
+import os
+import pstats
+import random
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, List, Optional
+from app.core.env import load_env
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from starlette.routing import request_response
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+load_env()
+
+PROFILE_HEADER = "x-profile"
+
+
+@dataclass
+class ProfileSession:
+    """Perfil en curso de un request; lo completa el endpoint perfilado"""
+
+    trigger: str
+    profiles: List[cProfile.Profile] = field(default_factory=list)
+
+
+@dataclass
+class ProfileRecord:
+    id: int
+    created_at: datetime
+    method: str
+    path: str
+    route: str
+    status: Optional[int]
+    duration_ms: float
+    trigger: str
+    stats: bytes = field(repr=False)
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "created_at": self.created_at.isoformat(),
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status": self.status,
+            "duration_ms": self.duration_ms,
+            "trigger": self.trigger,
+        }
+
+    def text(self, limit: int = 40) -> str:
+        """Resumen legible ordenado por tiempo acumulado"""
+        stream = io.StringIO()
+        stats = pstats.Stats(_StatsSource(marshal.loads(self.stats)), stream=stream)
+        stats.sort_stats("cumulative").print_stats(limit)
+        return stream.getvalue()
+
+
+class _StatsSource:
+    """Adaptador para cargar en pstats.Stats un diccionario ya deserializado"""
+
+    def __init__(self, stats: dict):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+class ProfileStore:
+    """Últimos `max_entries` perfiles del proceso, en memoria"""
+
+    def __init__(self, max_entries: int = 50):
+        self.max_entries = max_entries
+        self._records: OrderedDict[int, ProfileRecord] = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def add(self, **kwargs) -> ProfileRecord:
+        with self._lock:
+            record = ProfileRecord(id=next(self._ids), **kwargs)
+            self._records[record.id] = record
+            while len(self._records) > self.max_entries:
+                self._records.popitem(last=False)
+            return record
+
+    def list(self) -> List[ProfileRecord]:
+        with self._lock:
+            return list(reversed(self._records.values()))
+
+    def get(self, profile_id: int) -> Optional[ProfileRecord]:
+        with self._lock:
+            return self._records.get(profile_id)
+
+
+profile_store = ProfileStore(int(os.getenv("PROFILING_MAX_PROFILES", "50")))
+_session: ContextVar[Optional[ProfileSession]] = ContextVar(
+    "profile_session", default=None
+)
+# Desde Python 3.12 cProfile es global al proceso: un perfil a la vez
+_profiler_lock = threading.Lock()
+
+
+def _merge(profiles: List[cProfile.Profile]) -> bytes:
+    stats = pstats.Stats(profiles[0])
+    for profile in profiles[1:]:
+        stats.add(profile)
+    return marshal.dumps(stats.stats)
+
+
+def _start_profile(session: ProfileSession) -> Optional[cProfile.Profile]:
+    """
+    Activa un perfil si ningún otro está activo; si no, el request corre sin
+    perfilar. El perfilado nunca debe hacer fallar el request.
+    """
+    if not _profiler_lock.acquire(blocking=False):
+        return None
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:
+        # Otra herramienta (debugger, coverage) ya usa el profiler
+        _profiler_lock.release()
+        return None
+    session.profiles.append(profile)
+    return profile
+
+
+def _stop_profile(profile: Optional[cProfile.Profile]) -> None:
+    if profile is not None:
+        profile.disable()
+        _profiler_lock.release()
+
+
+def profiled(func: Callable) -> Callable:
+    """
+    Envuelve un endpoint: si el request está marcado para perfilar, lo
+    ejecuta bajo cProfile en el hilo donde corre (threadpool para endpoints
+    síncronos, event loop para los asíncronos). En los asíncronos el perfil
+    incluye lo que otras tareas ejecutan mientras el endpoint espera.
+    """
+    if asyncio.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            session = _session.get()
+            if session is None:
+                return await func(*args, **kwargs)
+            profile = _start_profile(session)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                _stop_profile(profile)
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        session = _session.get()
+        if session is None:
+            return func(*args, **kwargs)
+        profile = _start_profile(session)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _stop_profile(profile)
+
+    return wrapper
+
+
+class ProfilingMiddleware:
+    """
+    Marca para perfilar los requests con el encabezado `X-Profile: <token>`
+    o, si se configura, una fracción aleatoria `sample_rate` de ellos.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        token: Optional[str] = None,
+        sample_rate: float = 0.0,
+        store: Optional[ProfileStore] = None,
+    ):
+        self.app = app
+        self.token = token.encode() if token else None
+        self.sample_rate = sample_rate
+        self.store = store if store is not None else profile_store
+
+    def _trigger(self, scope: Scope) -> Optional[str]:
+        if self.token is not None:
+            for name, value in scope.get("headers", ()):
+                if name == PROFILE_HEADER.encode():
+                    if hmac.compare_digest(value, self.token):
+                        return "header"
+                    break
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sample"
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        trigger = self._trigger(scope) if scope["type"] == "http" else None
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        session = ProfileSession(trigger=trigger)
+        status = None
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        token = _session.set(session)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _session.reset(token)
+            if session.profiles:
+                route = scope.get("route")
+                self.store.add(
+                    created_at=datetime.now(),
+                    method=scope.get("method", ""),
+                    path=scope.get("path", ""),
+                    route=getattr(route, "path", scope.get("path", "")),
+                    status=status,
+                    duration_ms=round((time.perf_counter() - start) * 1000, 3),
+                    trigger=trigger,
+                    stats=_merge(session.profiles),
+                )
+
+
+def install_profiling(app: FastAPI) -> bool:
+    """
+    Activa el perfilado si PROFILING_TOKEN o PROFILING_SAMPLE_RATE están
+    definidos. Si no, no se instala nada y los requests no pagan ningún costo.
+    Debe llamarse después de registrar los routers.
+    """
+    token = os.getenv("PROFILING_TOKEN") or None
+    sample_rate = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+    if token is None and sample_rate <= 0:
+        return False
+
+    for route in app.router.routes:
+        if isinstance(route, APIRoute):
+            route.dependant.call = profiled(route.dependant.call)
+            route.app = request_response(route.get_route_handler())
+    app.add_middleware(ProfilingMiddleware, token=token, sample_rate=sample_rate)
+    return True
@@ -1,25 +1,44 @@
-from fastapi import FastAPI, Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+SECURITY_HEADERS = {
+    "Strict-Transport-Security": "max-age=63072000; includeSubDomains",
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "X-XSS-Protection": "1; mode=block",
+    "Referrer-Policy": "no-referrer",
+    "Permissions-Policy": "geolocation=(), microphone=()",
+}
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        response: Response = await call_next(request)
-        response.headers["Strict-Transport-Security"] = (
-            "max-age=63072000; includeSubDomains"
-        )
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Referrer-Policy"] = "no-referrer"
-        response.headers["Permissions-Policy"] = "geolocation=(), microphone=()"
-        return response
 
+class SecurityHeadersMiddleware:
+    """
+    Middleware ASGI puro: agrega los encabezados de seguridad en
+    `http.response.start`, sin envolver ni copiar el cuerpo de la respuesta
+    (compatible con respuestas en streaming).
+    """
 
-app = FastAPI()
-app.add_middleware(SecurityHeadersMiddleware)
+    def __init__(self, app: ASGIApp, headers: dict = SECURITY_HEADERS):
+        self.app = app
+        self.raw_headers = [
+            (name.lower().encode("latin-1"), value.encode("latin-1"))
+            for name, value in headers.items()
+        ]
+        self._names = {name for name, _ in self.raw_headers}
 
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-@app.get("/")
-async def root():
-    return {"message": "Headers seguros activados 🔐"}
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                headers = [
+                    header
+                    for header in message.get("headers", [])
+                    if header[0].lower() not in self._names
+                ]
+                headers.extend(self.raw_headers)
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
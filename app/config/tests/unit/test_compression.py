@@ -0,0 +1,182 @@
+import gzip
+import zlib
+from types import SimpleNamespace
+import pytest
+from fastapi import FastAPI, Response, WebSocket
+from fastapi.testclient import TestClient
+from app.config.compression import (
+    CompressionMiddleware,
+    CompressionStats,
+    choose_encoding,
+    parse_accept_encoding,
+)
+
+LARGE = [{"id": i, "warning_flags": ["Sin seguro agrícola"]} for i in range(200)]
+
+
+def build_app(stats: CompressionStats) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500, stats=stats)
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/items/{item_id}")
+    def items(item_id: int):
+        return LARGE
+
+    @app.get("/image")
+    def image():
+        return Response(b"\x89PNG" * 1000, media_type="image/png")
+
+    @app.get("/encoded")
+    def encoded():
+        return Response(
+            gzip.compress(b"x" * 2000),
+            media_type="application/json",
+            headers={"Content-Encoding": "gzip"},
+        )
+
+    @app.websocket("/ws")
+    async def ws(websocket: WebSocket):
+        await websocket.accept()
+        await websocket.send_text("x" * 5000)
+        await websocket.close()
+
+    return app
+
+
+@pytest.fixture
+def stats():
+    return CompressionStats()
+
+
+def test_parse_accept_encoding_honors_q_values():
+    assert parse_accept_encoding("gzip;q=0.5, br, identity;q=0") == {
+        "gzip": 0.5,
+        "br": 1.0,
+    }
+
+
+def test_choose_encoding_prefers_brotli_only_when_available():
+    assert choose_encoding("gzip, br", brotli_enabled=True) == "br"
+    assert choose_encoding("gzip, br", brotli_enabled=False) == "gzip"
+    assert choose_encoding("br;q=0.2, gzip", brotli_enabled=True) == "gzip"
+    assert choose_encoding("identity", brotli_enabled=True) is None
+
+
+def test_large_json_is_gzipped(stats):
+    client = TestClient(build_app(stats))
+
+    response = client.get("/items/1", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.json() == LARGE
+    route = stats.snapshot()["/items/{item_id}"]
+    assert route["compressed"] == 1
+    assert 0 < route["bytes_out"] < route["bytes_in"]
+
+
+def test_small_body_is_not_compressed(stats):
+    client = TestClient(build_app(stats))
+
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert stats.snapshot()["/small"]["compressed"] == 0
+
+
+def test_no_accept_encoding_passes_through(stats):
+    client = TestClient(build_app(stats))
+
+    response = client.get("/items/1", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in response.headers
+    assert response.json() == LARGE
+
+
+def test_non_compressible_and_encoded_bodies_are_untouched(stats):
+    client = TestClient(build_app(stats))
+
+    image = client.get("/image", headers={"Accept-Encoding": "gzip"})
+    encoded = client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in image.headers
+    assert image.content.startswith(b"\x89PNG")
+    assert encoded.headers["content-encoding"] == "gzip"
+    assert encoded.content == b"x" * 2000
+
+
+@pytest.mark.asyncio
+async def test_streaming_response_is_compressed_per_chunk(stats):
+    chunks = [f'{{"row": {i}}}\n'.encode() * 50 for i in range(3)]
+
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/x-ndjson")],
+            }
+        )
+        for i, chunk in enumerate(chunks):
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": i < len(chunks) - 1,
+                }
+            )
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "path": "/export",
+        "route": SimpleNamespace(path="/export"),
+        "headers": [(b"accept-encoding", b"gzip")],
+    }
+    await CompressionMiddleware(app, minimum_size=500, stats=stats)(scope, None, send)
+
+    headers = dict(sent[0]["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+    # Cada fragmento se puede descomprimir apenas llega (sync flush)
+    decompressor = zlib.decompressobj(31)
+    bodies = [decompressor.decompress(m["body"]) for m in sent[1:]]
+    assert bodies == chunks
+    assert stats.snapshot()["/export"]["compressed"] == 1
+
+
+def test_websocket_is_not_compressed(stats):
+    client = TestClient(build_app(stats))
+
+    with client.websocket_connect(
+        "/ws", headers={"Accept-Encoding": "gzip"}
+    ) as websocket:
+        assert websocket.receive_text() == "x" * 5000
+
+
+def test_brotli_when_installed(stats):
+    brotli = pytest.importorskip("brotli")
+    client = TestClient(build_app(stats))
+
+    response = client.get("/items/1", headers={"Accept-Encoding": "br"})
+
+    assert response.headers["content-encoding"] == "br"
+    assert brotli.decompress(response.content)
+
+
+def test_unmatched_paths_share_one_route_label(stats):
+    client = TestClient(build_app(stats))
+
+    for path in ("/wp-login.php", "/.env", "/admin/config.php"):
+        assert client.get(path).status_code == 404
+
+    assert list(stats.snapshot()) == ["unmatched"]
+    assert stats.snapshot()["unmatched"]["responses"] == 3
@@ -0,0 +1,173 @@
+import asyncio
+import cProfile
+import marshal
+import pstats
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.config import profiling
+from app.config.profiling import ProfileStore, install_profiling
+from app.modules.admin.controllers.admin_controller import adminRouter
+
+TOKEN = "profile-secret"
+
+
+def slow_calculation(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/requests/{id}")
+    def sync_endpoint(id: int):
+        return {"total": slow_calculation(10000)}
+
+    @app.get("/async")
+    async def async_endpoint():
+        return {"total": slow_calculation(1000)}
+
+    app.include_router(adminRouter)
+    return app
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = ProfileStore(max_entries=3)
+    monkeypatch.setattr(profiling, "profile_store", store)
+    monkeypatch.setattr(
+        "app.modules.admin.controllers.admin_controller.profile_store", store
+    )
+    monkeypatch.setenv("ADMIN_TOKEN", "admin-secret")
+    return store
+
+
+@pytest.fixture
+def client(monkeypatch, store):
+    monkeypatch.setenv("PROFILING_TOKEN", TOKEN)
+    monkeypatch.setenv("PROFILING_SAMPLE_RATE", "0")
+    app = build_app()
+    assert install_profiling(app)
+    return TestClient(app)
+
+
+def test_not_installed_without_configuration(monkeypatch):
+    monkeypatch.delenv("PROFILING_TOKEN", raising=False)
+    monkeypatch.delenv("PROFILING_SAMPLE_RATE", raising=False)
+    app = build_app()
+    endpoint = app.router.routes[-1].dependant.call
+
+    assert install_profiling(app) is False
+    assert app.user_middleware == []
+    assert app.router.routes[-1].dependant.call is endpoint
+
+
+def test_request_with_token_is_profiled(client, store):
+    response = client.get("/requests/7", headers={"X-Profile": TOKEN})
+
+    assert response.status_code == 200
+    [record] = store.list()
+    assert record.route == "/requests/{id}"
+    assert record.status == 200
+    assert record.trigger == "header"
+    functions = {name for _, _, name in marshal.loads(record.stats)}
+    assert "slow_calculation" in functions
+
+
+def test_requests_without_valid_token_are_not_profiled(client, store):
+    client.get("/requests/7")
+    client.get("/requests/7", headers={"X-Profile": "wrong"})
+
+    assert store.list() == []
+
+
+def test_async_endpoint_is_profiled(client, store):
+    client.get("/async", headers={"X-Profile": TOKEN})
+
+    assert store.list()[0].route == "/async"
+
+
+@pytest.mark.asyncio
+async def test_overlapping_profiled_requests_do_not_fail(monkeypatch, store):
+    monkeypatch.setenv("PROFILING_TOKEN", TOKEN)
+    release = asyncio.Event()
+    app = FastAPI()
+
+    @app.get("/wait")
+    async def wait():
+        await release.wait()
+        return {"ok": True}
+
+    install_profiling(app)
+    headers = {"X-Profile": TOKEN}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+        first = asyncio.create_task(client.get("/wait", headers=headers))
+        await asyncio.sleep(0.05)
+        second = asyncio.create_task(client.get("/wait", headers=headers))
+        await asyncio.sleep(0.05)
+        release.set()
+        responses = await asyncio.gather(first, second)
+
+    assert [r.status_code for r in responses] == [200, 200]
+    # El segundo corre sin perfilar mientras el primero tiene el profiler
+    assert len(store.list()) == 1
+
+
+def test_profiler_error_does_not_fail_request(monkeypatch, client, store):
+    class BusyProfile(cProfile.Profile):
+        def enable(self, *args, **kwargs):
+            raise ValueError("Another profiling tool is already active")
+
+    monkeypatch.setattr(profiling.cProfile, "Profile", BusyProfile)
+
+    response = client.get("/requests/7", headers={"X-Profile": TOKEN})
+
+    assert response.status_code == 200
+    assert store.list() == []
+    assert not profiling._profiler_lock.locked()
+
+
+def test_sample_rate_profiles_requests(monkeypatch, store):
+    monkeypatch.delenv("PROFILING_TOKEN", raising=False)
+    monkeypatch.setenv("PROFILING_SAMPLE_RATE", "1")
+    app = build_app()
+    install_profiling(app)
+
+    TestClient(app).get("/requests/1")
+
+    assert store.list()[0].trigger == "sample"
+
+
+def test_store_keeps_latest_profiles(client, store):
+    for i in range(5):
+        client.get(f"/requests/{i}", headers={"X-Profile": TOKEN})
+
+    assert [r.path for r in store.list()] == [
+        "/requests/4",
+        "/requests/3",
+        "/requests/2",
+    ]
+
+
+def test_admin_endpoints_list_and_download(client, store, tmp_path):
+    client.get("/requests/7", headers={"X-Profile": TOKEN})
+    headers = {"X-Admin-Token": "admin-secret"}
+
+    listing = client.get("/admin/profiles", headers=headers).json()["data"]
+    profile_id = listing[0]["id"]
+    text = client.get(f"/admin/profiles/{profile_id}", headers=headers)
+    download = client.get(f"/admin/profiles/{profile_id}/download", headers=headers)
+
+    assert "slow_calculation" in text.text
+    path = tmp_path / "profile.pstats"
+    path.write_bytes(download.content)
+    assert pstats.Stats(str(path)).total_calls > 0
+
+
+def test_admin_endpoints_require_token(client):
+    assert client.get("/admin/profiles").status_code == 403
+    assert (
+        client.get("/admin/profiles", headers={"X-Admin-Token": "x"}).status_code == 403
+    )
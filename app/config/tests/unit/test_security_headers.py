@@ -0,0 +1,61 @@
+from fastapi import FastAPI, Response, WebSocket
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from app.config.security import SECURITY_HEADERS, SecurityHeadersMiddleware
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(SecurityHeadersMiddleware)
+
+    @app.get("/")
+    def index():
+        return "ok"
+
+    @app.get("/override")
+    def override(response: Response):
+        response.headers["X-Frame-Options"] = "SAMEORIGIN"
+        return "ok"
+
+    @app.get("/stream")
+    def stream():
+        def chunks():
+            for i in range(3):
+                yield f"chunk-{i}\n"
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.websocket("/ws")
+    async def ws(websocket: WebSocket):
+        await websocket.accept()
+        await websocket.send_text("hola")
+        await websocket.close()
+
+    return app
+
+
+def test_adds_security_headers():
+    response = TestClient(build_app()).get("/")
+
+    assert response.status_code == 200
+    for name, value in SECURITY_HEADERS.items():
+        assert response.headers[name] == value
+
+
+def test_security_headers_replace_route_values():
+    response = TestClient(build_app()).get("/override")
+
+    assert response.headers.get_list("X-Frame-Options") == ["DENY"]
+
+
+def test_streaming_response_is_not_buffered():
+    with TestClient(build_app()).stream("GET", "/stream") as response:
+        body = "".join(response.iter_text())
+
+    assert body == "chunk-0\nchunk-1\nchunk-2\n"
+    assert response.headers["X-Content-Type-Options"] == "nosniff"
+
+
+def test_websocket_passes_through():
+    with TestClient(build_app()).websocket_connect("/ws") as websocket:
+        assert websocket.receive_text() == "hola"
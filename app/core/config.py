@@ -1,4 +1,7 @@
+from functools import lru_cache
+from typing import Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from app.core.env import load_env
 
 
 class Settings(BaseSettings):
@@ -8,10 +11,26 @@ class Settings(BaseSettings):
     DATABASE_NAME: str
     DATABASE_USER: str
     DATABASE_PASSWORD: str
-    JWT_SECRET_KEY: str
+    DATABASE_ECHO: bool = True
+    JWT_SECRET_KEY: Optional[str] = None
     JWT_ALGORITHM: str = "HS256"
     JWT_AUDIENCE: str = "authenticated"
-    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+    JWT_CACHE_SIZE: int = 4096
+    JWT_CACHE_TTL: int = 300
+    JWT_JWKS_URL: Optional[str] = None
+    JWT_JWKS_REFRESH_INTERVAL: int = 300
+    MAIL_USER: Optional[str] = None
+    MAIL_PASSWORD: Optional[str] = None
+    MAIL_HOST: Optional[str] = None
+    MAIL_PORT: int = 587
+    model_config = SettingsConfigDict(extra="ignore")
 
 
-settings = Settings()
+@lru_cache
+def get_settings() -> Settings:
+    """Settings del proceso, leídos una sola vez"""
+    load_env()
+    return Settings()
+
+
+settings = get_settings()
@@ -0,0 +1,8 @@
+from functools import lru_cache
+from dotenv import load_dotenv
+
+
+@lru_cache(maxsize=1)
+def load_env() -> bool:
+    """Carga el archivo .env una sola vez por proceso"""
+    return load_dotenv()
@@ -0,0 +1,38 @@
+import os
+import pytest
+from benchmarks.bench_import_time import DEFERRED_MODULES, measure, parse_importtime
+
+# Presupuesto holgado para CI; el valor de referencia local ronda 1.1 s
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "2500"))
+
+
+@pytest.fixture(scope="module")
+def import_times():
+    return measure("main")
+
+
+def test_parse_importtime():
+    output = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   json.decoder\n"
+        "import time:       300 |        420 | json\n"
+        "unrelated line\n"
+    )
+
+    assert parse_importtime(output) == {
+        "json.decoder": (120, 120),
+        "json": (300, 420),
+    }
+
+
+def test_heavy_modules_are_not_imported_at_startup(import_times):
+    loaded = [module for module in DEFERRED_MODULES if module in import_times]
+    assert loaded == []
+
+
+def test_main_import_time_within_budget(import_times):
+    total_ms = import_times["main"][1] / 1000
+    if total_ms > IMPORT_TIME_BUDGET_MS:
+        # Un solo proceso lento no cuenta: se toma el mejor de dos
+        total_ms = min(total_ms, measure("main")["main"][1] / 1000)
+    assert total_ms <= IMPORT_TIME_BUDGET_MS
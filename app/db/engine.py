@@ -0,0 +1,62 @@
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, create_engine
+
+MEMORY_SQLITE_URL = "sqlite://"
+
+
+def _configure_sqlite(engine: Engine, in_memory: bool) -> None:
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        if not in_memory:
+            # Archivo compartido entre hilos: WAL y espera ante bloqueos
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.close()
+
+
+def _import_entities() -> None:
+    # Registra todas las tablas en SQLModel.metadata
+    from app.shared.entities import (  # noqa: F401
+        client_profile_entity,
+        credit_type_enity,
+        idempotency_key_entity,
+        notification_entity,
+        notifications_user_entity,
+        request_aggregate_entity,
+        request_status_entity,
+        requestEntity,
+    )
+
+
+def create_db_engine(
+    url: str, echo: bool = False, create_schema: bool = False, **kwargs
+) -> Engine:
+    """
+    Engine para `url`. En SQLite la conexión se comparte entre hilos (los
+    endpoints síncronos corren en el threadpool) y una base en memoria usa
+    una única conexión, para que todas las sesiones vean los mismos datos.
+    Con `create_schema` se crean las tablas desde los modelos (sin alembic).
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        in_memory = make_url(url).database in (None, "", ":memory:")
+        kwargs.setdefault("connect_args", {})["check_same_thread"] = False
+        if in_memory:
+            kwargs.setdefault("poolclass", StaticPool)
+        engine = create_engine(url, echo=echo, **kwargs)
+        _configure_sqlite(engine, in_memory)
+    else:
+        engine = create_engine(url, echo=echo, **kwargs)
+
+    if create_schema:
+        _import_entities()
+        SQLModel.metadata.create_all(engine)
+    return engine
+
+
+def create_memory_engine(echo: bool = False) -> Engine:
+    """SQLite en memoria con el esquema completo; para pruebas y benchmarks"""
+    return create_db_engine(MEMORY_SQLITE_URL, echo=echo, create_schema=True)
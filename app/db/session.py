@@ -1,11 +1,12 @@
 # ruff: noqa: F401
 from sqlalchemy.orm import sessionmaker
-from sqlmodel import create_engine, Session
+from sqlmodel import Session
+from app.db.engine import create_db_engine
 from app.core.config import settings
 from typing import Generator
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
-engine = create_engine(SQLALCHEMY_DATABASE_URL, echo=True)
+engine = create_db_engine(SQLALCHEMY_DATABASE_URL, echo=settings.DATABASE_ECHO)
 
 
 def get_session() -> Generator[Session, None, None]:
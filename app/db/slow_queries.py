@@ -0,0 +1,206 @@
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from app.core.env import load_env
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.metrics.http import current_route
+
+load_env()
+
+logger = logging.getLogger(__name__)
+
+MAX_PARAMETERS_LENGTH = 500
+EXPLAIN_PREFIX = "EXPLAIN (ANALYZE, BUFFERS) "
+
+
+def _format_parameters(parameters: Any) -> str:
+    text = repr(parameters)
+    if len(text) > MAX_PARAMETERS_LENGTH:
+        return text[:MAX_PARAMETERS_LENGTH] + "..."
+    return text
+
+
+def is_explainable(statement: str) -> bool:
+    """Solo SELECT de lectura: EXPLAIN ANALYZE ejecuta la sentencia"""
+    normalized = statement.lstrip().upper()
+    return normalized.startswith("SELECT") and "FOR UPDATE" not in normalized
+
+
+@dataclass
+class SlowQuery:
+    statement: str
+    route: str
+    parameters: str
+    max_ms: float
+    total_ms: float = 0.0
+    count: int = 0
+    last_seen: datetime = field(default_factory=datetime.now)
+    plan: Optional[str] = None
+    plan_captured_at: Optional[datetime] = None
+
+    def as_dict(self) -> dict:
+        return {
+            "statement": self.statement,
+            "route": self.route,
+            "parameters": self.parameters,
+            "count": self.count,
+            "max_ms": round(self.max_ms, 3),
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else None,
+            "last_seen": self.last_seen.isoformat(),
+            "plan": self.plan,
+            "plan_captured_at": (
+                self.plan_captured_at.isoformat() if self.plan_captured_at else None
+            ),
+        }
+
+
+class SlowQueryRecorder:
+    """
+    Registra las sentencias SQL que superan `threshold_ms`:
+    - Se agrupan por (sentencia parametrizada, ruta) y se conservan las
+      `max_entries` peores según su duración máxima.
+    - Con `explain_sample_rate` > 0, una muestra de los SELECT lentos se
+      analiza con EXPLAIN (ANALYZE, BUFFERS) en un hilo aparte, con su
+      propia conexión y dentro de una transacción que se revierte. Solo en
+      PostgreSQL y como máximo un plan por entrada cada `explain_interval`.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float = 200,
+        max_entries: int = 50,
+        explain_sample_rate: float = 0.0,
+        explain_interval: float = 300,
+    ):
+        self.threshold_ms = threshold_ms
+        self.max_entries = max_entries
+        self.explain_sample_rate = explain_sample_rate
+        self.explain_interval = explain_interval
+        self._entries: Dict[tuple, SlowQuery] = {}
+        self._lock = threading.Lock()
+        self._explain_pending = False
+        self._explained_at: Dict[tuple, float] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._engine: Optional[Engine] = None
+
+    def instrument(self, engine: Engine) -> None:
+        self._engine = engine
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(
+        self, conn, cursor, statement, parameters, context, many
+    ):
+        conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, many):
+        starts = conn.info.get("slow_query_start")
+        if not starts:
+            return
+        elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+        if elapsed_ms < self.threshold_ms or statement.startswith(EXPLAIN_PREFIX):
+            return
+        key = self.record(statement, parameters, elapsed_ms, current_route())
+        if key is not None and self._should_explain(key, statement):
+            self._submit_explain(key, statement, parameters)
+
+    def record(
+        self, statement: str, parameters: Any, elapsed_ms: float, route: str
+    ) -> Optional[tuple]:
+        """Agrega la ejecución; devuelve la clave si la entrada se conserva"""
+        key = (statement, route)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= self.max_entries:
+                    weakest = min(self._entries, key=lambda k: self._entries[k].max_ms)
+                    if self._entries[weakest].max_ms >= elapsed_ms:
+                        return None
+                    del self._entries[weakest]
+                    self._explained_at.pop(weakest, None)
+                entry = self._entries[key] = SlowQuery(
+                    statement=statement,
+                    route=route,
+                    parameters=_format_parameters(parameters),
+                    max_ms=elapsed_ms,
+                )
+            entry.count += 1
+            entry.total_ms += elapsed_ms
+            entry.last_seen = datetime.now()
+            if elapsed_ms >= entry.max_ms:
+                entry.max_ms = elapsed_ms
+                entry.parameters = _format_parameters(parameters)
+        logger.warning(
+            "Consulta lenta (%.1f ms) en %s: %s", elapsed_ms, route, statement
+        )
+        return key
+
+    def _should_explain(self, key: tuple, statement: str) -> bool:
+        if self.explain_sample_rate <= 0 or self._engine is None:
+            return False
+        if self._engine.dialect.name != "postgresql" or not is_explainable(statement):
+            return False
+        with self._lock:
+            if self._explain_pending:
+                return False
+            last = self._explained_at.get(key)
+            if last is not None and time.monotonic() - last < self.explain_interval:
+                return False
+            if random.random() >= self.explain_sample_rate:
+                return False
+            self._explain_pending = True
+            self._explained_at[key] = time.monotonic()
+        return True
+
+    def _submit_explain(self, key: tuple, statement: str, parameters: Any) -> None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="slow-query-explain"
+            )
+        self._executor.submit(self._explain, key, statement, parameters)
+
+    def _explain(self, key: tuple, statement: str, parameters: Any) -> None:
+        try:
+            with self._engine.connect() as conn:
+                with conn.begin() as transaction:
+                    rows = conn.exec_driver_sql(
+                        EXPLAIN_PREFIX + statement, parameters
+                    ).fetchall()
+                    transaction.rollback()
+            plan = "\n".join(row[0] for row in rows)
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.plan = plan
+                    entry.plan_captured_at = datetime.now()
+        except Exception as e:
+            logger.warning("No se pudo capturar el plan de la consulta: %s", e)
+        finally:
+            with self._lock:
+                self._explain_pending = False
+
+    def worst(self, limit: Optional[int] = None) -> List[SlowQuery]:
+        with self._lock:
+            entries = sorted(
+                self._entries.values(), key=lambda e: e.max_ms, reverse=True
+            )
+        return entries[:limit] if limit else entries
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._explained_at.clear()
+
+
+slow_query_recorder = SlowQueryRecorder(
+    threshold_ms=float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200")),
+    max_entries=int(os.getenv("SLOW_QUERY_MAX_ENTRIES", "50")),
+    explain_sample_rate=float(os.getenv("SLOW_QUERY_EXPLAIN_SAMPLE_RATE", "0")),
+)
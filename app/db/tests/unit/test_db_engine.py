@@ -0,0 +1,48 @@
+import threading
+from sqlalchemy import Column, MetaData, Table, inspect, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.schema import CreateTable
+from sqlmodel import Session
+from app.db.engine import create_db_engine, create_memory_engine
+from app.db.types import PortableJSON
+
+
+def _ddl(dialect) -> str:
+    table = Table("t", MetaData(), Column("details", PortableJSON))
+    return str(CreateTable(table).compile(dialect=dialect))
+
+
+def test_portable_json_is_jsonb_on_postgres_and_json_elsewhere():
+    assert "details JSONB" in _ddl(postgresql.dialect())
+    assert "details JSON" in _ddl(sqlite.dialect())
+    assert "JSONB" not in _ddl(sqlite.dialect())
+
+
+def test_memory_engine_creates_schema_and_shares_data_across_threads():
+    engine = create_memory_engine()
+    tables = set(inspect(engine).get_table_names())
+    assert {"requests", "client_profiles", "notifications_users"} <= tables
+
+    with Session(engine) as session:
+        session.exec(text("CREATE TABLE probe (value INTEGER)"))
+        session.exec(text("INSERT INTO probe VALUES (1)"))
+        session.commit()
+
+    seen = []
+
+    def read():
+        with Session(engine) as session:
+            seen.append(session.exec(text("SELECT value FROM probe")).scalar())
+
+    thread = threading.Thread(target=read)
+    thread.start()
+    thread.join()
+    assert seen == [1]
+
+
+def test_sqlite_engine_enforces_foreign_keys(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'db.sqlite'}")
+
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA foreign_keys").scalar() == 1
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
@@ -0,0 +1,94 @@
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine, text
+from app.db.slow_queries import SlowQueryRecorder, is_explainable
+from app.metrics.http import RequestMetrics, current_request
+
+
+def test_records_statements_above_threshold_with_route():
+    engine = create_engine("sqlite://")
+    recorder = SlowQueryRecorder(threshold_ms=0)
+    recorder.instrument(engine)
+    route = MagicMock(path="/requests/{id}")
+    token = current_request.set(RequestMetrics({"route": route}))
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT :value"), {"value": 42})
+            conn.execute(text("SELECT :value"), {"value": 43})
+    finally:
+        current_request.reset(token)
+
+    [entry] = recorder.worst()
+    assert entry.statement == "SELECT ?"
+    assert entry.route == "/requests/{id}"
+    assert entry.count == 2
+    assert "4" in entry.parameters
+
+
+def test_fast_statements_are_ignored():
+    engine = create_engine("sqlite://")
+    recorder = SlowQueryRecorder(threshold_ms=10_000)
+    recorder.instrument(engine)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    assert recorder.worst() == []
+
+
+def test_keeps_only_worst_offenders():
+    recorder = SlowQueryRecorder(max_entries=2)
+
+    recorder.record("SELECT a", (), 300, "/a")
+    recorder.record("SELECT b", (), 500, "/b")
+    recorder.record("SELECT c", (), 400, "/c")
+    recorder.record("SELECT d", (), 100, "/d")
+
+    assert [e.statement for e in recorder.worst()] == ["SELECT b", "SELECT c"]
+
+
+def test_explain_only_for_sampled_postgres_selects():
+    recorder = SlowQueryRecorder(explain_sample_rate=1.0)
+    recorder._engine = MagicMock()
+    recorder._engine.dialect.name = "postgresql"
+    key = recorder.record("SELECT 1", (), 300, "/a")
+
+    assert recorder._should_explain(key, "UPDATE requests SET x = 1") is False
+    assert recorder._should_explain(key, "SELECT 1") is True
+    # Un EXPLAIN en curso impide lanzar otro
+    assert recorder._should_explain(key, "SELECT 1") is False
+
+
+def test_explain_is_disabled_for_other_dialects():
+    recorder = SlowQueryRecorder(explain_sample_rate=1.0)
+    recorder._engine = create_engine("sqlite://")
+
+    assert recorder._should_explain(("SELECT 1", "/a"), "SELECT 1") is False
+
+
+def test_explain_stores_plan_and_rolls_back():
+    recorder = SlowQueryRecorder(explain_sample_rate=1.0)
+    key = recorder.record(
+        "SELECT * FROM requests WHERE id = %(id)s", {"id": 1}, 300, "/a"
+    )
+    conn = MagicMock()
+    conn.exec_driver_sql.return_value.fetchall.return_value = [
+        ("Seq Scan on requests",),
+        ("  Buffers: shared hit=4",),
+    ]
+    recorder._engine = MagicMock()
+    recorder._engine.connect.return_value.__enter__.return_value = conn
+    recorder._explain_pending = True
+
+    recorder._explain(key, key[0], {"id": 1})
+
+    sql = conn.exec_driver_sql.call_args[0][0]
+    assert sql.startswith("EXPLAIN (ANALYZE, BUFFERS) SELECT")
+    conn.begin.return_value.__enter__.return_value.rollback.assert_called_once()
+    assert recorder.worst()[0].plan == "Seq Scan on requests\n  Buffers: shared hit=4"
+    assert recorder._explain_pending is False
+
+
+def test_is_explainable():
+    assert is_explainable("  select * from requests")
+    assert not is_explainable("SELECT * FROM requests FOR UPDATE")
+    assert not is_explainable("DELETE FROM requests")
@@ -0,0 +1,6 @@
+from sqlalchemy import JSON
+from sqlalchemy.dialects.postgresql import JSONB
+
+# JSONB en PostgreSQL (índices y operadores propios) y JSON en el resto de
+# dialectos, para poder ejecutar los servicios contra SQLite
+PortableJSON = JSON().with_variant(JSONB(), "postgresql")
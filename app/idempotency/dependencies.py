@@ -0,0 +1,64 @@
+import os
+from functools import lru_cache
+from typing import Awaitable, Callable, Optional
+from uuid import UUID
+from fastapi import Depends, Header, Request
+from starlette.responses import Response
+from app.core.env import load_env
+from app.idempotency.store import IdempotencyStore
+from app.shared.guards.jwtGuard import jwt_guard
+
+load_env()
+
+
+@lru_cache(maxsize=1)
+def get_idempotency_store() -> IdempotencyStore:
+    from app.db.session import engine
+
+    return IdempotencyStore(
+        engine,
+        ttl=float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400")),
+        cache_ttl=float(os.getenv("IDEMPOTENCY_CACHE_TTL_SECONDS", "60")),
+        wait_timeout=float(os.getenv("IDEMPOTENCY_WAIT_TIMEOUT_SECONDS", "10")),
+    )
+
+
+class Idempotency:
+    """Ejecuta el endpoint una sola vez por Idempotency-Key"""
+
+    def __init__(
+        self,
+        request: Request,
+        user_id: UUID,
+        key: Optional[str],
+        store: IdempotencyStore,
+    ):
+        self.request = request
+        self.user_id = user_id
+        self.key = key
+        self.store = store
+
+    async def run(self, handler: Callable[[], Awaitable]) -> Response:
+        if self.key is None:
+            return await handler()
+        return await self.store.execute(
+            self.user_id,
+            self.key,
+            self.request.method,
+            self.request.url.path,
+            await self.request.body(),
+            handler,
+        )
+
+
+def get_idempotency(
+    request: Request,
+    user_id: UUID = Depends(jwt_guard),
+    idempotency_key: Optional[str] = Header(
+        None,
+        alias="Idempotency-Key",
+        description="Clave única del cliente para reintentar sin repetir el efecto.",
+    ),
+    store: IdempotencyStore = Depends(get_idempotency_store),
+) -> Idempotency:
+    return Idempotency(request, user_id, idempotency_key, store)
@@ -0,0 +1,340 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from uuid import UUID
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+from starlette.responses import Response
+from app.shared.entities.idempotency_key_entity import (
+    IDEMPOTENCY_COMPLETED,
+    IDEMPOTENCY_IN_PROGRESS,
+    IdempotencyKey,
+)
+
+logger = logging.getLogger(__name__)
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+CacheKey = Tuple[UUID, str]
+
+
+def fingerprint(method: str, path: str, body: bytes) -> str:
+    digest = hashlib.sha256(f"{method} {path}\n".encode())
+    digest.update(body)
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    fingerprint: str
+    status_code: int
+    body: bytes
+    media_type: Optional[str]
+
+    def to_response(self) -> Response:
+        return Response(
+            self.body,
+            status_code=self.status_code,
+            media_type=self.media_type,
+            headers={REPLAYED_HEADER: "true"},
+        )
+
+
+def _capture(result, fingerprint_: str) -> Tuple[Response, StoredResponse]:
+    response = result
+    if not isinstance(response, Response):
+        response = JSONResponse(jsonable_encoder(result))
+    stored = StoredResponse(
+        fingerprint_, response.status_code, bytes(response.body), response.media_type
+    )
+    return response, stored
+
+
+class IdempotencyStore:
+    """
+    Respuestas de los requests con Idempotency-Key, por (usuario, clave):
+    - La tabla idempotency_keys es la fuente de verdad entre procesos; la
+      fila se reclama (in_progress) antes de ejecutar y se completa con la
+      respuesta.
+    - Las respuestas completadas se guardan además en una caché del proceso
+      durante `cache_ttl` segundos.
+    - Los duplicados concurrentes del mismo proceso esperan a la primera
+      ejecución; los de otros procesos consultan la tabla hasta que se
+      complete o pase `wait_timeout` (409).
+    - Errores 5xx y excepciones liberan la clave para poder reintentar; los
+      4xx se guardan como cualquier otra respuesta.
+    - Las consultas a la tabla (sesión síncrona) corren en un hilo aparte
+      para no bloquear el event loop.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        ttl: float = 86400,
+        cache_ttl: float = 60,
+        cache_size: int = 1024,
+        wait_timeout: float = 10,
+        lock_timeout: float = 60,
+        poll_interval: float = 0.1,
+        purge_interval: float = 300,
+    ):
+        self.engine = engine
+        self.ttl = ttl
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self.wait_timeout = wait_timeout
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self.purge_interval = purge_interval
+        self._cache: "OrderedDict[CacheKey, Tuple[float, StoredResponse]]" = (
+            OrderedDict()
+        )
+        self._inflight: Dict[CacheKey, "asyncio.Future[Optional[StoredResponse]]"] = {}
+        self._purged_at = time.monotonic()
+
+    async def execute(
+        self,
+        user_id: UUID,
+        key: str,
+        method: str,
+        path: str,
+        body: bytes,
+        handler: Callable[[], Awaitable],
+    ) -> Response:
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Idempotency-Key debe tener entre 1 y {MAX_KEY_LENGTH} caracteres.",
+            )
+        cache_key = (user_id, key)
+        fingerprint_ = fingerprint(method, path, body)
+        deadline = time.monotonic() + self.wait_timeout
+
+        while True:
+            stored = self._cached(cache_key)
+            if stored is not None:
+                return self._replay(stored, fingerprint_)
+
+            pending = self._inflight.get(cache_key)
+            if pending is not None:
+                stored = await self._wait_inflight(pending, deadline)
+                if stored is not None:
+                    return self._replay(stored, fingerprint_)
+                continue  # la primera ejecución falló: se intenta reclamar
+
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[cache_key] = future
+            try:
+                stored = await self._claim_or_wait(
+                    user_id, key, method, path, fingerprint_, deadline
+                )
+            except BaseException:
+                self._resolve(cache_key, None)
+                raise
+            if stored is not None:
+                self._resolve(cache_key, stored)
+                return self._replay(stored, fingerprint_)
+            return await self._run(cache_key, fingerprint_, handler)
+
+    async def _run(self, cache_key: CacheKey, fingerprint_: str, handler) -> Response:
+        try:
+            response, stored = _capture(await handler(), fingerprint_)
+        except HTTPException as e:
+            if e.status_code >= 500:
+                await self._release(cache_key)
+                raise
+            body = JSONResponse({"detail": e.detail}, status_code=e.status_code)
+            await self._complete(cache_key, _capture(body, fingerprint_)[1])
+            raise
+        except BaseException:
+            await self._release(cache_key)
+            raise
+        if response.status_code >= 500:
+            await self._release(cache_key)
+        else:
+            await self._complete(cache_key, stored)
+        return response
+
+    def _replay(self, stored: StoredResponse, fingerprint_: str) -> Response:
+        if stored.fingerprint != fingerprint_:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key ya usada con otra ruta o cuerpo.",
+            )
+        return stored.to_response()
+
+    async def _wait_inflight(self, pending, deadline: float):
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(pending), max(0.0, deadline - time.monotonic())
+            )
+        except asyncio.TimeoutError:
+            raise self._conflict()
+
+    def _conflict(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Ya hay un request en curso con esta Idempotency-Key.",
+        )
+
+    # --- caché y ejecuciones en curso del proceso ---
+
+    def _cached(self, cache_key: CacheKey) -> Optional[StoredResponse]:
+        entry = self._cache.get(cache_key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._cache[cache_key]
+            return None
+        self._cache.move_to_end(cache_key)
+        return entry[1]
+
+    def _remember(self, cache_key: CacheKey, stored: StoredResponse) -> None:
+        self._cache[cache_key] = (time.monotonic() + self.cache_ttl, stored)
+        self._cache.move_to_end(cache_key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _resolve(self, cache_key: CacheKey, stored: Optional[StoredResponse]) -> None:
+        future = self._inflight.pop(cache_key, None)
+        if future is not None and not future.done():
+            future.set_result(stored)
+
+    async def _complete(self, cache_key: CacheKey, stored: StoredResponse) -> None:
+        # El efecto ya ocurrió: un fallo al guardar no debe convertirse en error
+        self._remember(cache_key, stored)
+        self._resolve(cache_key, stored)
+        try:
+            await asyncio.to_thread(self._save, cache_key, stored)
+        except Exception as e:
+            logger.warning("No se pudo guardar la respuesta idempotente: %s", e)
+
+    async def _release(self, cache_key: CacheKey) -> None:
+        try:
+            await asyncio.to_thread(self._delete_claim, cache_key)
+        except Exception as e:
+            logger.warning("No se pudo liberar la Idempotency-Key: %s", e)
+        finally:
+            self._resolve(cache_key, None)
+
+    # --- tabla idempotency_keys ---
+
+    @staticmethod
+    def _pk(cache_key: CacheKey) -> dict:
+        return {"user_id": cache_key[0], "key": cache_key[1]}
+
+    @staticmethod
+    def _stored(row: IdempotencyKey) -> StoredResponse:
+        return StoredResponse(
+            row.fingerprint,
+            row.response_status,
+            row.response_body or b"",
+            row.response_media_type,
+        )
+
+    async def _claim_or_wait(
+        self, user_id, key, method, path, fingerprint_, deadline
+    ) -> Optional[StoredResponse]:
+        """None si este proceso reclamó la clave; si no, la respuesta guardada"""
+        while True:
+            row = await asyncio.to_thread(
+                self._claim, user_id, key, method, path, fingerprint_
+            )
+            if row is None:
+                return None
+            if row.status == IDEMPOTENCY_COMPLETED:
+                stored = self._stored(row)
+                self._remember((user_id, key), stored)
+                return stored
+            if row.fingerprint != fingerprint_:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="Idempotency-Key ya usada con otra ruta o cuerpo.",
+                )
+            if time.monotonic() >= deadline:
+                raise self._conflict()
+            await asyncio.sleep(self.poll_interval)
+
+    def _claim(self, user_id, key, method, path, fingerprint_):
+        now = datetime.now()
+        self._maybe_purge(now)
+        with Session(self.engine, expire_on_commit=False) as session:
+            row = session.get(IdempotencyKey, {"user_id": user_id, "key": key})
+            abandoned = (
+                row is not None
+                and row.status == IDEMPOTENCY_IN_PROGRESS
+                and row.updated_at <= now - timedelta(seconds=self.lock_timeout)
+            )
+            if row is not None and (row.expires_at <= now or abandoned):
+                # Clave vencida o de un proceso que murió a mitad de camino
+                session.delete(row)
+                session.flush()
+                row = None
+            if row is not None:
+                return row
+            session.add(
+                IdempotencyKey(
+                    user_id=user_id,
+                    key=key,
+                    method=method,
+                    path=path,
+                    fingerprint=fingerprint_,
+                    created_at=now,
+                    updated_at=now,
+                    expires_at=now + timedelta(seconds=self.ttl),
+                )
+            )
+            try:
+                session.commit()
+            except IntegrityError:
+                # Otro proceso la reclamó entre la lectura y el insert
+                session.rollback()
+                return session.get(IdempotencyKey, {"user_id": user_id, "key": key})
+        return None
+
+    def _delete_claim(self, cache_key: CacheKey) -> None:
+        with Session(self.engine) as session:
+            row = session.get(IdempotencyKey, self._pk(cache_key))
+            if row is not None and row.status == IDEMPOTENCY_IN_PROGRESS:
+                session.delete(row)
+                session.commit()
+
+    def _save(self, cache_key: CacheKey, stored: StoredResponse) -> None:
+        with Session(self.engine) as session:
+            row = session.get(IdempotencyKey, self._pk(cache_key))
+            if row is None:
+                return
+            row.status = IDEMPOTENCY_COMPLETED
+            row.response_status = stored.status_code
+            row.response_body = stored.body
+            row.response_media_type = stored.media_type
+            row.updated_at = datetime.now()
+            session.add(row)
+            session.commit()
+
+    def _maybe_purge(self, now: datetime) -> None:
+        if time.monotonic() - self._purged_at < self.purge_interval:
+            return
+        self._purged_at = time.monotonic()
+        self.purge_expired(now)
+
+    def purge_expired(self, now: Optional[datetime] = None) -> int:
+        with Session(self.engine) as session:
+            result = session.exec(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.expires_at <= (now or datetime.now())
+                )
+            )
+            session.commit()
+            return result.rowcount
@@ -0,0 +1,244 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+from uuid import uuid4
+import pytest
+from fastapi import HTTPException
+from sqlmodel import Session
+from starlette.responses import JSONResponse
+from app.db.engine import create_memory_engine
+from app.idempotency.dependencies import Idempotency
+from app.idempotency.store import REPLAYED_HEADER, IdempotencyStore, fingerprint
+from app.shared.entities.idempotency_key_entity import (
+    IDEMPOTENCY_COMPLETED,
+    IdempotencyKey,
+)
+
+PATH = "/requests/"
+
+
+@pytest.fixture
+def engine():
+    engine = create_memory_engine()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def store(engine):
+    return IdempotencyStore(engine, wait_timeout=1, poll_interval=0.01)
+
+
+def counting_handler(status_code=201):
+    calls = []
+
+    async def handler():
+        calls.append(1)
+        return JSONResponse({"call": len(calls)}, status_code=status_code)
+
+    return handler, calls
+
+
+@pytest.mark.asyncio
+async def test_repeated_key_replays_stored_response(store):
+    user_id = uuid4()
+    handler, calls = counting_handler()
+
+    first = await store.execute(user_id, "k1", "POST", PATH, b"{}", handler)
+    second = await store.execute(user_id, "k1", "POST", PATH, b"{}", handler)
+
+    assert calls == [1]
+    assert (second.status_code, second.body) == (201, first.body)
+    assert second.headers[REPLAYED_HEADER] == "true"
+    assert REPLAYED_HEADER.lower() not in first.headers
+
+
+@pytest.mark.asyncio
+async def test_keys_are_scoped_per_user(store):
+    handler, calls = counting_handler()
+
+    await store.execute(uuid4(), "k1", "POST", PATH, b"{}", handler)
+    await store.execute(uuid4(), "k1", "POST", PATH, b"{}", handler)
+
+    assert calls == [1, 1]
+
+
+@pytest.mark.asyncio
+async def test_reusing_key_with_another_body_is_rejected(store):
+    user_id = uuid4()
+    handler, _ = counting_handler()
+    await store.execute(user_id, "k1", "POST", PATH, b'{"a": 1}', handler)
+
+    with pytest.raises(HTTPException) as exc:
+        await store.execute(user_id, "k1", "POST", PATH, b'{"a": 2}', handler)
+
+    assert exc.value.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_wait_for_the_first_execution(store):
+    user_id = uuid4()
+    release = asyncio.Event()
+    calls = []
+
+    async def handler():
+        calls.append(1)
+        await release.wait()
+        return JSONResponse({"ok": True})
+
+    tasks = [
+        asyncio.create_task(store.execute(user_id, "k1", "POST", PATH, b"", handler))
+        for _ in range(5)
+    ]
+    await asyncio.sleep(0.01)
+    release.set()
+    responses = await asyncio.gather(*tasks)
+
+    assert calls == [1]
+    assert {r.body for r in responses} == {b'{"ok":true}'}
+    assert sum(REPLAYED_HEADER.lower() in r.headers for r in responses) == 4
+
+
+@pytest.mark.asyncio
+async def test_failures_release_the_key_and_4xx_are_stored(store, engine):
+    user_id = uuid4()
+
+    async def boom():
+        raise RuntimeError("db caída")
+
+    with pytest.raises(RuntimeError):
+        await store.execute(user_id, "k1", "POST", PATH, b"", boom)
+    with Session(engine) as session:
+        assert session.get(IdempotencyKey, {"user_id": user_id, "key": "k1"}) is None
+
+    async def not_found():
+        raise HTTPException(status_code=404, detail="No existe")
+
+    with pytest.raises(HTTPException):
+        await store.execute(user_id, "k1", "POST", PATH, b"", not_found)
+    replay = await store.execute(user_id, "k1", "POST", PATH, b"", not_found)
+
+    assert replay.status_code == 404
+    assert replay.body == b'{"detail":"No existe"}'
+
+
+@pytest.mark.asyncio
+async def test_other_process_replays_from_the_table(engine):
+    user_id = uuid4()
+    handler, calls = counting_handler()
+
+    await IdempotencyStore(engine).execute(user_id, "k1", "POST", PATH, b"", handler)
+    replay = await IdempotencyStore(engine).execute(
+        user_id, "k1", "POST", PATH, b"", handler
+    )
+
+    assert calls == [1]
+    assert replay.headers[REPLAYED_HEADER] == "true"
+
+
+def _in_progress(engine, user_id, updated_at=None):
+    now = datetime.now()
+    with Session(engine) as session:
+        session.add(
+            IdempotencyKey(
+                user_id=user_id,
+                key="k1",
+                method="POST",
+                path=PATH,
+                fingerprint=fingerprint("POST", PATH, b""),
+                updated_at=updated_at or now,
+                expires_at=now + timedelta(hours=1),
+            )
+        )
+        session.commit()
+
+
+@pytest.mark.asyncio
+async def test_waits_for_execution_in_another_process(store, engine):
+    user_id = uuid4()
+    _in_progress(engine, user_id)
+    handler, calls = counting_handler()
+
+    async def finish_elsewhere():
+        await asyncio.sleep(0.05)
+        with Session(engine) as session:
+            row = session.get(IdempotencyKey, {"user_id": user_id, "key": "k1"})
+            row.status = IDEMPOTENCY_COMPLETED
+            row.response_status = 200
+            row.response_body = b'{"from":"other"}'
+            row.response_media_type = "application/json"
+            session.add(row)
+            session.commit()
+
+    finisher = asyncio.create_task(finish_elsewhere())
+    response = await store.execute(user_id, "k1", "POST", PATH, b"", handler)
+    await finisher
+
+    assert calls == []
+    assert response.body == b'{"from":"other"}'
+
+
+@pytest.mark.asyncio
+async def test_conflict_when_other_execution_does_not_finish(engine):
+    user_id = uuid4()
+    _in_progress(engine, user_id)
+    store = IdempotencyStore(engine, wait_timeout=0.05, poll_interval=0.01)
+    handler, _ = counting_handler()
+
+    with pytest.raises(HTTPException) as exc:
+        await store.execute(user_id, "k1", "POST", PATH, b"", handler)
+
+    assert exc.value.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_abandoned_claims_are_taken_over(engine):
+    user_id = uuid4()
+    _in_progress(engine, user_id, updated_at=datetime.now() - timedelta(hours=1))
+    handler, calls = counting_handler()
+
+    await IdempotencyStore(engine).execute(user_id, "k1", "POST", PATH, b"", handler)
+
+    assert calls == [1]
+
+
+@pytest.mark.asyncio
+async def test_table_queries_run_off_the_event_loop(store, monkeypatch):
+    threads = []
+
+    def recording(method):
+        def wrapper(*args):
+            threads.append(threading.get_ident())
+            return method(*args)
+
+        return wrapper
+
+    for name in ("_claim", "_save", "_delete_claim"):
+        monkeypatch.setattr(store, name, recording(getattr(store, name)))
+    handler, _ = counting_handler()
+    failing, _ = counting_handler(status_code=500)
+
+    await store.execute(uuid4(), "k1", "POST", PATH, b"", handler)
+    await store.execute(uuid4(), "k2", "POST", PATH, b"", failing)
+
+    assert len(threads) == 4
+    assert threading.get_ident() not in threads
+
+
+def test_purge_expired_removes_old_keys(store, engine):
+    _in_progress(engine, uuid4())
+
+    assert store.purge_expired(datetime.now() + timedelta(hours=2)) == 1
+
+
+@pytest.mark.asyncio
+async def test_without_header_the_handler_runs_directly():
+    store = MagicMock()
+    handler, calls = counting_handler()
+
+    await Idempotency(MagicMock(), uuid4(), None, store).run(handler)
+    await Idempotency(MagicMock(), uuid4(), None, store).run(handler)
+
+    assert calls == [1, 1]
+    store.execute.assert_not_called()
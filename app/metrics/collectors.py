@@ -0,0 +1,104 @@
+from app.metrics.registry import Registry
+
+
+def websocket_families():
+    from app.ws import websocket_manager
+
+    gauges = websocket_manager.connection_gauges()
+    queues = websocket_manager.queue_depth_stats()
+    delivery = websocket_manager.delivery_stats.as_dict()
+    return [
+        (
+            "ws_connections",
+            "gauge",
+            "Conexiones WebSocket de este worker por estado.",
+            [
+                ("ws_connections", {"state": state}, gauges[state])
+                for state in ("active", "idle")
+            ],
+        ),
+        (
+            "ws_connections_reaped",
+            "counter",
+            "Conexiones WebSocket cerradas por inactividad.",
+            [("ws_connections_reaped_total", {}, gauges["reaped"])],
+        ),
+        (
+            "ws_send_queue_depth",
+            "gauge",
+            "Mensajes pendientes en las colas de envío.",
+            [
+                ("ws_send_queue_depth", {"stat": "total"}, queues["total_depth"]),
+                ("ws_send_queue_depth", {"stat": "max"}, queues["max_depth"]),
+            ],
+        ),
+        (
+            "ws_messages",
+            "counter",
+            "Mensajes WebSocket por resultado.",
+            [
+                ("ws_messages_total", {"outcome": outcome}, value)
+                for outcome, value in delivery.items()
+            ],
+        ),
+    ]
+
+
+def template_families():
+    from app.modules.mails.services.template_engine import get_template_engine
+
+    if get_template_engine.cache_info().currsize == 0:
+        return []
+    engine = get_template_engine()
+    return [
+        (
+            "mail_template_cache",
+            "counter",
+            "Renderizados de correo servidos desde la caché.",
+            [
+                ("mail_template_cache_total", {"result": "hit"}, engine.hits),
+                ("mail_template_cache_total", {"result": "miss"}, engine.misses),
+            ],
+        )
+    ]
+
+
+def compression_families():
+    from app.config.compression import compression_stats
+
+    snapshot = compression_stats.snapshot()
+    return [
+        (
+            "http_compression_bytes",
+            "counter",
+            "Bytes antes y después de comprimir, por ruta.",
+            [
+                (
+                    "http_compression_bytes_total",
+                    {"route": route, "stage": stage},
+                    s[f"bytes_{stage}"],
+                )
+                for route, s in snapshot.items()
+                for stage in ("in", "out")
+            ],
+        ),
+        (
+            "http_compression_cpu_seconds",
+            "counter",
+            "CPU usada comprimiendo respuestas, por ruta.",
+            [
+                (
+                    "http_compression_cpu_seconds_total",
+                    {"route": route},
+                    s["cpu_ms"] / 1000,
+                )
+                for route, s in snapshot.items()
+            ],
+        ),
+    ]
+
+
+def register_default_collectors(registry: Registry) -> None:
+    registry.register_collector(websocket_families)
+    registry.register_collector(template_families)
+    registry.register_collector(compression_families)
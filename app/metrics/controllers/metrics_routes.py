@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from app.metrics.registry import registry
+from app.shared.guards.adminGuard import admin_guard
+
+router = APIRouter(tags=["Métricas"], dependencies=[Depends(admin_guard)])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    """Métricas de este worker en formato de texto de Prometheus"""
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,109 @@
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.metrics.registry import Registry, registry as default_registry
+
+UNMATCHED_ROUTE = "unmatched"
+NO_ROUTE = "none"
+
+
+@dataclass
+class RequestMetrics:
+    """Estado de métricas de un request; lo comparten los hilos del threadpool"""
+
+    scope: Scope
+    db_statements: int = 0
+    db_seconds: float = 0.0
+    _route: Optional[str] = field(default=None, repr=False)
+
+    @property
+    def route(self) -> str:
+        """Plantilla de ruta (/requests/{id}), nunca la ruta cruda"""
+        if self._route is None:
+            route = self.scope.get("route")
+            if route is None:
+                return UNMATCHED_ROUTE
+            self._route = getattr(route, "path", UNMATCHED_ROUTE)
+        return self._route
+
+
+current_request: ContextVar[Optional[RequestMetrics]] = ContextVar(
+    "metrics_request", default=None
+)
+
+
+def current_route() -> str:
+    request = current_request.get()
+    return request.route if request is not None else NO_ROUTE
+
+
+def status_class(status: Optional[int]) -> str:
+    return f"{status // 100}xx" if status else "unknown"
+
+
+class MetricsMiddleware:
+    """
+    Latencia por ruta, requests en curso y sentencias SQL por request.
+    Las etiquetas usan la plantilla de ruta y la clase de estado (2xx, 5xx)
+    para mantener acotada la cardinalidad.
+    """
+
+    def __init__(self, app: ASGIApp, registry: Registry = default_registry):
+        self.app = app
+        self.duration = registry.histogram(
+            "http_request_duration_seconds",
+            "Latencia de los requests HTTP por ruta.",
+            ("method", "route", "status"),
+        )
+        self.in_flight = registry.gauge(
+            "http_requests_in_flight",
+            "Requests HTTP en curso.",
+            ("method",),
+        )
+        self.db_statements = registry.histogram(
+            "http_request_db_statements",
+            "Sentencias SQL ejecutadas por request.",
+            ("route",),
+            buckets=(0, 1, 2, 5, 10, 20, 50, 100),
+        )
+        self.db_duration = registry.histogram(
+            "http_request_db_duration_seconds",
+            "Tiempo total en SQL por request.",
+            ("route",),
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope.get("method", "")
+        request = RequestMetrics(scope)
+        status = None
+
+        async def send_wrapper(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        token = current_request.set(request)
+        self.in_flight.inc(method=method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            status = status or 500
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.in_flight.dec(method=method)
+            current_request.reset(token)
+            route = request.route
+            self.duration.observe(
+                elapsed, method=method, route=route, status=status_class(status)
+            )
+            self.db_statements.observe(request.db_statements, route=route)
+            self.db_duration.observe(request.db_seconds, route=route)
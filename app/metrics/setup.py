@@ -0,0 +1,12 @@
+from fastapi import FastAPI
+from sqlalchemy.engine import Engine
+from app.metrics.collectors import register_default_collectors
+from app.metrics.http import MetricsMiddleware
+from app.metrics.registry import registry
+from app.metrics.sql import instrument_engine
+
+
+def setup_metrics(app: FastAPI, engine: Engine) -> None:
+    app.add_middleware(MetricsMiddleware, registry=registry)
+    instrument_engine(engine, registry)
+    register_default_collectors(registry)
@@ -0,0 +1,61 @@
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.metrics.http import current_request, current_route
+from app.metrics.registry import Registry, registry as default_registry
+
+OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "BEGIN", "COMMIT"}
+
+
+def statement_operation(statement: str) -> str:
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement else ""
+    return operation if operation in OPERATIONS else "OTHER"
+
+
+def instrument_engine(engine: Engine, registry: Registry = default_registry) -> None:
+    """
+    Cuenta y mide las sentencias SQL por ruta y operación, y expone el
+    estado del pool de conexiones.
+    """
+    duration = registry.histogram(
+        "db_statement_duration_seconds",
+        "Duración de las sentencias SQL por ruta y operación.",
+        ("route", "operation"),
+    )
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        starts = conn.info.get("metrics_query_start")
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        duration.observe(
+            elapsed, route=current_route(), operation=statement_operation(statement)
+        )
+        request = current_request.get()
+        if request is not None:
+            request.db_statements += 1
+            request.db_seconds += elapsed
+
+    registry.register_collector(lambda: pool_families(engine))
+
+
+def pool_families(engine: Engine):
+    pool = engine.pool
+    samples = {}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            samples[name] = method()
+    return [
+        (
+            "db_pool_connections",
+            "gauge",
+            "Estado del pool de conexiones de SQLAlchemy.",
+            [("db_pool_connections", {"state": k}, v) for k, v in samples.items()],
+        )
+    ]
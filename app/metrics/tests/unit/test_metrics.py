@@ -0,0 +1,142 @@
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from app.metrics.collectors import websocket_families
+from app.metrics.http import MetricsMiddleware
+from app.metrics.registry import Registry
+from app.metrics.sql import instrument_engine, statement_operation
+from app.modules.mails.services import mail_service
+from app.modules.mails.services.mail_service import MailService
+
+
+@pytest.fixture
+def registry():
+    return Registry()
+
+
+def test_render_counter_and_gauge(registry):
+    counter = registry.counter("jobs", "Trabajos procesados.", ("queue",))
+    gauge = registry.gauge("workers", "Workers activos.")
+    counter.inc(queue="mail")
+    counter.inc(2, queue="mail")
+    gauge.set(3)
+
+    output = registry.render()
+
+    assert "# TYPE jobs_total counter" in output
+    assert 'jobs_total{queue="mail"} 3' in output
+    assert "# TYPE workers gauge\nworkers 3" in output
+
+
+def test_histogram_buckets_are_cumulative(registry):
+    histogram = registry.histogram("latency", "Latencia.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+
+    output = registry.render()
+
+    assert 'latency_bucket{le="0.1"} 2' in output
+    assert 'latency_bucket{le="1"} 3' in output
+    assert 'latency_bucket{le="+Inf"} 4' in output
+    assert "latency_count 4" in output
+
+
+def test_label_values_are_escaped(registry):
+    registry.gauge("g", "Ayuda.", ("name",)).set(1, name='a"b\nc')
+
+    assert 'g{name="a\\"b\\nc"} 1' in registry.render()
+
+
+def test_registering_twice_returns_same_metric(registry):
+    first = registry.counter("c", "Ayuda.")
+
+    assert registry.counter("c", "Ayuda.") is first
+    with pytest.raises(ValueError):
+        registry.gauge("c", "Ayuda.")
+
+
+def build_app(registry: Registry, engine) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, registry=registry)
+    instrument_engine(engine, registry)
+
+    @app.get("/requests/{id}")
+    def get_request(id: int):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+        return {"id": id}
+
+    return app
+
+
+def test_http_metrics_use_route_templates(registry):
+    engine = create_engine("sqlite://")
+    client = TestClient(build_app(registry, engine))
+
+    client.get("/requests/1")
+    client.get("/requests/2")
+    client.get("/does-not-exist/123")
+
+    duration = registry._metrics["http_request_duration_seconds"]
+    assert duration.count(method="GET", route="/requests/{id}", status="2xx") == 2
+    assert duration.count(method="GET", route="unmatched", status="4xx") == 1
+    assert "/requests/1" not in registry.render()
+    assert registry._metrics["http_requests_in_flight"].value(method="GET") == 0
+
+
+def test_sql_statements_are_counted_per_route(registry):
+    engine = create_engine("sqlite://")
+    client = TestClient(build_app(registry, engine))
+
+    client.get("/requests/1")
+
+    statements = registry._metrics["http_request_db_statements"]
+    assert statements.sum(route="/requests/{id}") == 2
+    sql = registry._metrics["db_statement_duration_seconds"]
+    assert sql.count(route="/requests/{id}", operation="SELECT") == 2
+
+
+def test_sql_outside_request_uses_none_route(registry, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'metrics.db'}")
+    instrument_engine(engine, registry)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    sql = registry._metrics["db_statement_duration_seconds"]
+    assert sql.count(route="none", operation="SELECT") == 1
+    assert 'db_pool_connections{state="checkedout"} 0' in registry.render()
+
+
+def test_statement_operation():
+    assert statement_operation("  select * from x") == "SELECT"
+    assert statement_operation("WITH x AS (...) SELECT 1") == "OTHER"
+
+
+@pytest.mark.asyncio
+async def test_mail_latency_records_outcome(monkeypatch, registry):
+    histogram = registry.histogram("mail_send_duration_seconds", "Ayuda.", ("outcome",))
+    monkeypatch.setattr(mail_service, "MAIL_SEND_SECONDS", histogram)
+    fast_mail = MagicMock()
+    fast_mail.send_message = AsyncMock(side_effect=[None, RuntimeError("smtp")])
+    service = MailService(fast_mail)
+
+    await service.send_email(MagicMock())
+    with pytest.raises(RuntimeError):
+        await service.send_email(MagicMock())
+
+    assert histogram.count(outcome="ok") == 1
+    assert histogram.count(outcome="error") == 1
+
+
+def test_websocket_collector_reports_connections(registry):
+    registry.register_collector(websocket_families)
+
+    output = registry.render()
+
+    assert 'ws_connections{state="active"}' in output
+    assert "# TYPE ws_connections_reaped_total counter" in output
+    assert 'ws_messages_total{outcome="sent"}' in output
@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse, Response
+from app.config.profiling import ProfileRecord, profile_store
+from app.db.slow_queries import slow_query_recorder
+from app.shared.guards.adminGuard import admin_guard
+
+adminRouter = APIRouter(
+    prefix="/admin",
+    tags=["Administración"],
+    dependencies=[Depends(admin_guard)],
+)
+
+
+def _get_profile(profile_id: int) -> ProfileRecord:
+    record = profile_store.get(profile_id)
+    if record is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Perfil '{profile_id}' no encontrado.",
+        )
+    return record
+
+
+@adminRouter.get("/profiles")
+def list_profiles():
+    return {"data": [record.summary() for record in profile_store.list()]}
+
+
+@adminRouter.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+def get_profile(profile_id: int, limit: int = 40):
+    return _get_profile(profile_id).text(limit)
+
+
+@adminRouter.get("/profiles/{profile_id}/download")
+def download_profile(profile_id: int):
+    """Archivo pstats: `python -m pstats perfil.pstats` o snakeviz"""
+    record = _get_profile(profile_id)
+    return Response(
+        record.stats,
+        media_type="application/octet-stream",
+        headers={
+            "Content-Disposition": f'attachment; filename="profile-{record.id}.pstats"'
+        },
+    )
+
+
+@adminRouter.get("/slow-queries")
+def list_slow_queries(limit: int = 50):
+    """Peores consultas lentas de este worker, por duración máxima"""
+    return {"data": [entry.as_dict() for entry in slow_query_recorder.worst(limit)]}
+
+
+@adminRouter.delete("/slow-queries")
+def reset_slow_queries():
+    slow_query_recorder.reset()
+    return {"message": "Registro de consultas lentas reiniciado"}
@@ -0,0 +1,36 @@
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from app.db.session import get_session
+from app.modules.dashboard.dtos.dashboard_dto import RequestSummaryResponse
+from app.modules.dashboard.services.dashboard_service import DashboardService
+from app.shared.guards.jwtGuard import jwt_guard
+from app.shared.responses.json_response import ModelResponse
+
+dashboardRouter = APIRouter(
+    prefix="/dashboard",
+    tags=["Tablero"],
+    dependencies=[Depends(jwt_guard)],
+)
+
+
+@dashboardRouter.get("/requests", response_model=RequestSummaryResponse)
+def get_request_summary(
+    group_by: List[str] = Query(
+        ["status"],
+        description="Dimensiones: month, status, credit_type y/o risk_level.",
+    ),
+    from_month: Optional[date] = Query(
+        None, description="Mes inicial (se toma el mes de la fecha)."
+    ),
+    to_month: Optional[date] = Query(
+        None, description="Mes final, inclusive (se toma el mes de la fecha)."
+    ),
+    db: Session = Depends(get_session),
+):
+    """Conteos y montos de solicitudes desde los agregados precalculados"""
+    summary = DashboardService(db).get_request_summary(
+        group_by=group_by, from_month=from_month, to_month=to_month
+    )
+    return ModelResponse(RequestSummaryResponse(data=summary))
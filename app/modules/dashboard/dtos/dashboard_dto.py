@@ -0,0 +1,33 @@
+from datetime import date
+from typing import List, Optional
+from uuid import UUID
+from pydantic import BaseModel, Field as PydanticField
+
+
+class RequestSummaryTotals(BaseModel):
+    request_count: int = PydanticField(description="Cantidad de solicitudes.")
+    requested_amount: float = PydanticField(description="Suma de montos solicitados.")
+    approved_amount: float = PydanticField(description="Suma de montos aprobados.")
+
+
+class RequestSummaryGroup(RequestSummaryTotals):
+    month: Optional[date] = PydanticField(
+        default=None, description="Primer día del mes de creación."
+    )
+    status_id: Optional[UUID] = None
+    status_code: Optional[str] = None
+    credit_type_id: Optional[UUID] = None
+    credit_type_code: Optional[str] = None
+    risk_level: Optional[str] = PydanticField(
+        default=None, description="Nivel de riesgo o SIN_EVALUAR."
+    )
+
+
+class RequestSummary(BaseModel):
+    group_by: List[str]
+    totals: RequestSummaryTotals
+    groups: List[RequestSummaryGroup]
+
+
+class RequestSummaryResponse(BaseModel):
+    data: RequestSummary
@@ -0,0 +1,100 @@
+from datetime import date
+from typing import List, Optional, Sequence
+from fastapi import HTTPException, status
+from sqlmodel import Session, func, select
+from app.modules.dashboard.dtos.dashboard_dto import (
+    RequestSummary,
+    RequestSummaryGroup,
+    RequestSummaryTotals,
+)
+from app.modules.requests.services.request_aggregates import month_of
+from app.shared.entities.credit_type_enity import CreditType
+from app.shared.entities.request_aggregate_entity import RequestAggregate
+from app.shared.entities.request_status_entity import RequestStatus
+
+# Dimensión -> columnas que aporta a la consulta (nombre en el DTO, columna)
+GROUP_BY_COLUMNS = {
+    "month": (("month", RequestAggregate.month),),
+    "status": (
+        ("status_id", RequestAggregate.status_id),
+        ("status_code", RequestStatus.code),
+    ),
+    "credit_type": (
+        ("credit_type_id", RequestAggregate.credit_type_id),
+        ("credit_type_code", CreditType.code),
+    ),
+    "risk_level": (("risk_level", RequestAggregate.risk_level),),
+}
+
+
+class DashboardService:
+    """
+    Lee solo request_aggregates: el costo depende de la cantidad de meses,
+    estados, tipos de crédito y niveles de riesgo, no de la de solicitudes.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_request_summary(
+        self,
+        group_by: Sequence[str] = ("status",),
+        from_month: Optional[date] = None,
+        to_month: Optional[date] = None,
+    ) -> RequestSummary:
+        invalid = [name for name in group_by if name not in GROUP_BY_COLUMNS]
+        if invalid:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Agrupación por '{', '.join(invalid)}' no permitida.",
+            )
+        group_by = list(dict.fromkeys(group_by))
+        fields = [field for name in group_by for field in GROUP_BY_COLUMNS[name]]
+        columns = [column for _, column in fields]
+
+        query = select(
+            *columns,
+            func.sum(RequestAggregate.request_count),
+            func.sum(RequestAggregate.requested_amount),
+            func.sum(RequestAggregate.approved_amount),
+        ).select_from(RequestAggregate)
+        if "status" in group_by:
+            query = query.join(
+                RequestStatus, RequestStatus.id == RequestAggregate.status_id
+            )
+        if "credit_type" in group_by:
+            query = query.join(
+                CreditType, CreditType.id == RequestAggregate.credit_type_id
+            )
+        if from_month is not None:
+            query = query.where(RequestAggregate.month >= month_of(from_month))
+        if to_month is not None:
+            query = query.where(RequestAggregate.month <= month_of(to_month))
+        query = (
+            query.group_by(*columns)
+            .having(func.sum(RequestAggregate.request_count) > 0)
+            .order_by(*columns)
+        )
+
+        groups: List[RequestSummaryGroup] = []
+        for row in self.db.exec(query).all():
+            values = dict(zip((name for name, _ in fields), row))
+            count, requested, approved = row[len(fields) :]
+            groups.append(
+                RequestSummaryGroup(
+                    **values,
+                    request_count=count,
+                    requested_amount=requested,
+                    approved_amount=approved,
+                )
+            )
+
+        return RequestSummary(
+            group_by=group_by,
+            totals=RequestSummaryTotals(
+                request_count=sum(g.request_count for g in groups),
+                requested_amount=sum(g.requested_amount for g in groups),
+                approved_amount=sum(g.approved_amount for g in groups),
+            ),
+            groups=groups,
+        )
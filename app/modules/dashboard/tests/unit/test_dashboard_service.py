@@ -0,0 +1,84 @@
+from datetime import date
+import pytest
+from fastapi import HTTPException
+from sqlmodel import Session
+from app.db.engine import create_memory_engine
+from app.modules.dashboard.services.dashboard_service import DashboardService
+from app.shared.entities.credit_type_enity import CreditType
+from app.shared.entities.request_aggregate_entity import RequestAggregate
+from app.shared.entities.request_status_entity import RequestStatus
+
+
+@pytest.fixture
+def session():
+    engine = create_memory_engine()
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+@pytest.fixture
+def aggregates(session):
+    pending = RequestStatus(code="PENDING", name="Pendiente", description="-")
+    approved = RequestStatus(code="APPROVED", name="Aprobada", description="-")
+    investment = CreditType(code="INVESTMENT", name="Inversión", description="-")
+    session.add_all([pending, approved, investment])
+    session.commit()
+
+    def row(month, status, risk_level, count, requested, approved_amount=0.0):
+        return RequestAggregate(
+            month=month,
+            status_id=status.id,
+            credit_type_id=investment.id,
+            risk_level=risk_level,
+            request_count=count,
+            requested_amount=requested,
+            approved_amount=approved_amount,
+        )
+
+    session.add_all(
+        [
+            row(date(2026, 1, 1), pending, "BAJO", 2, 300.0),
+            row(date(2026, 1, 1), approved, "BAJO", 1, 100.0, 90.0),
+            row(date(2026, 2, 1), approved, "ALTO", 3, 600.0, 500.0),
+            # Fila vaciada por cambios incrementales: no debe aparecer
+            row(date(2026, 2, 1), pending, "ALTO", 0, 0.0),
+        ]
+    )
+    session.commit()
+    return pending, approved
+
+
+def test_summary_by_status_joins_codes_and_totals(session, aggregates):
+    pending, approved = aggregates
+
+    summary = DashboardService(session).get_request_summary(["status"])
+
+    by_code = {g.status_code: g for g in summary.groups}
+    assert set(by_code) == {"PENDING", "APPROVED"}
+    assert by_code["APPROVED"].status_id == approved.id
+    assert by_code["APPROVED"].request_count == 4
+    assert by_code["APPROVED"].approved_amount == 590.0
+    assert by_code["PENDING"].request_count == 2
+    assert summary.totals.request_count == 6
+    assert summary.totals.requested_amount == 1000.0
+
+
+def test_summary_by_month_and_risk_filters_month_range(session, aggregates):
+    summary = DashboardService(session).get_request_summary(
+        ["month", "risk_level"], from_month=date(2026, 2, 20)
+    )
+
+    assert summary.group_by == ["month", "risk_level"]
+    assert [(g.month, g.risk_level, g.request_count) for g in summary.groups] == [
+        (date(2026, 2, 1), "ALTO", 3)
+    ]
+    assert summary.groups[0].status_code is None
+
+
+def test_summary_rejects_unknown_dimensions(session):
+    with pytest.raises(HTTPException) as exc_info:
+        DashboardService(session).get_request_summary(["client_id"])
+
+    assert exc_info.value.status_code == 400
+    assert "client_id" in exc_info.value.detail
@@ -1,23 +1,30 @@
-from fastapi_mail import ConnectionConfig, FastMail
+from functools import lru_cache
+from app.core.config import get_settings
 from app.modules.mails.services.mail_service import MailService
-from dotenv import load_dotenv
-import os
 
-load_dotenv()
 
-conf = ConnectionConfig(
-    MAIL_USERNAME=os.getenv("MAIL_USER"),
-    MAIL_PASSWORD=os.getenv("MAIL_PASSWORD"),
-    MAIL_FROM=os.getenv("MAIL_USER"),
-    MAIL_PORT=int(os.getenv("MAIL_PORT")),
-    MAIL_SERVER=os.getenv("MAIL_HOST"),
-    MAIL_STARTTLS=True,
-    MAIL_SSL_TLS=False,
-    USE_CREDENTIALS=True,
-    VALIDATE_CERTS=True,
-)
-fast_mail = FastMail(conf)
+@lru_cache(maxsize=1)
+def get_fast_mail():
+    """
+    Cliente SMTP compartido, construido en el primer envío: importar
+    fastapi_mail y validar su configuración no debe pesar en el arranque.
+    """
+    from fastapi_mail import ConnectionConfig, FastMail
+
+    settings = get_settings()
+    conf = ConnectionConfig(
+        MAIL_USERNAME=settings.MAIL_USER,
+        MAIL_PASSWORD=settings.MAIL_PASSWORD,
+        MAIL_FROM=settings.MAIL_USER,
+        MAIL_PORT=settings.MAIL_PORT,
+        MAIL_SERVER=settings.MAIL_HOST,
+        MAIL_STARTTLS=True,
+        MAIL_SSL_TLS=False,
+        USE_CREDENTIALS=True,
+        VALIDATE_CERTS=True,
+    )
+    return FastMail(conf)
 
 
 def get_mail_service():
-    return MailService(fast_mail)
+    return MailService(get_fast_mail())
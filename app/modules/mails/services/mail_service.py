@@ -1,9 +1,40 @@
-from fastapi_mail import FastMail, MessageSchema
+import time
+from typing import TYPE_CHECKING, List
+from app.metrics.registry import registry
+from app.tracing.tracer import tracer
+
+if TYPE_CHECKING:
+    from fastapi_mail import FastMail, MessageSchema
+
+MAIL_SEND_SECONDS = registry.histogram(
+    "mail_send_duration_seconds",
+    "Latencia del envío de correos por resultado.",
+    ("outcome",),
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+
+def html_message(subject: str, recipients: List[str], body: str) -> "MessageSchema":
+    """Construye un correo HTML; fastapi_mail se importa recién al necesitarlo"""
+    from fastapi_mail import MessageSchema
+
+    return MessageSchema(
+        subject=subject, recipients=recipients, body=body, subtype="html"
+    )
 
 
 class MailService:
-    def __init__(self, mail: FastMail):
+    def __init__(self, mail: "FastMail"):
         self.mail = mail
 
-    async def send_email(self, message: MessageSchema):
-        await self.mail.send_message(message)
+    async def send_email(self, message: "MessageSchema"):
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            with tracer.span(
+                "MailService.send_email", **{"mail.subject": message.subject}
+            ):
+                await self.mail.send_message(message)
+            outcome = "ok"
+        finally:
+            MAIL_SEND_SECONDS.observe(time.perf_counter() - start, outcome=outcome)
@@ -0,0 +1,101 @@
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING, Hashable, Optional
+from app.tracing.tracer import tracer
+
+if TYPE_CHECKING:
+    from jinja2 import Template
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates"
+
+TEMPLATE_NAMES = ("request_sent", "request_approved", "request_rejected")
+
+DEFAULT_PALETTE = {
+    "brand_color": "#16a34a",
+    "brand_color_light": "#dcfce7",
+    "brand_color_dark": "#15803d",
+    "error_color": "#dc2626",
+    "warning_color": "#f59e0b",
+}
+
+
+class TemplateEngine:
+    """
+    Motor de plantillas de correo:
+    - Las plantillas Jinja2 se compilan una sola vez al construir el motor.
+    - Los estilos base y el footer se pre-renderizan y se inyectan como globales.
+    - Los HTML renderizados se guardan en una caché LRU acotada.
+    """
+
+    def __init__(
+        self,
+        templates_dir: Path = TEMPLATES_DIR,
+        palette: Optional[dict] = None,
+        cache_size: int = 256,
+    ):
+        # Jinja2 se importa al construir el motor (primer correo), no al arrancar
+        from jinja2 import Environment, FileSystemLoader, select_autoescape
+        from markupsafe import Markup
+
+        self.palette = {**DEFAULT_PALETTE, **(palette or {})}
+        self.env = Environment(
+            loader=FileSystemLoader(str(templates_dir)),
+            autoescape=select_autoescape(["html"]),
+            auto_reload=False,
+        )
+        self.env.globals.update(
+            base_styles=Markup(
+                self.env.get_template("_base_styles.css.j2").render(**self.palette)
+            ),
+            footer=Markup(self.env.get_template("_footer.html").render()),
+        )
+        self.templates: dict[str, "Template"] = {
+            name: self.env.get_template(f"{name}.html") for name in TEMPLATE_NAMES
+        }
+        self.cache_size = cache_size
+        self._cache: OrderedDict[Hashable, str] = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def render(
+        self, name: str, context: dict, cache_key: Optional[Hashable] = None
+    ) -> str:
+        """Renderiza una plantilla, reutilizando el resultado si hay cache_key"""
+        with tracer.span("TemplateEngine.render", **{"template.name": name}):
+            return self._render(name, context, cache_key)
+
+    def _render(self, name: str, context: dict, cache_key: Optional[Hashable]) -> str:
+        if cache_key is None or self.cache_size <= 0:
+            return self.templates[name].render(context)
+
+        key = (name, cache_key)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        html = self.templates[name].render(context)
+        with self._lock:
+            self._cache[key] = html
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return html
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+@lru_cache(maxsize=1)
+def get_template_engine() -> TemplateEngine:
+    """Instancia compartida del motor, construida una sola vez por proceso"""
+    return TemplateEngine()
@@ -0,0 +1,133 @@
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from uuid import UUID
+from app.modules.mails.services.template_engine import TemplateEngine
+from app.modules.mails.services.template_service import TemplateService
+
+TEST_REQUEST_ID = UUID("9ef4240e-da77-45e3-b4ec-ccb9d1828d3a")
+
+
+@pytest.fixture
+def engine():
+    """Provee un motor de plantillas aislado (caché propia)."""
+    return TemplateEngine(cache_size=8)
+
+
+@pytest.fixture
+def template_service(engine):
+    return TemplateService(engine=engine)
+
+
+@pytest.fixture
+def credit_request():
+    return SimpleNamespace(
+        id=TEST_REQUEST_ID,
+        requested_amount=15000000.0,
+        term_months=24,
+        annual_interest_rate=18.5,
+        created_at=datetime(2025, 5, 29, 10, 0),
+        updated_at=datetime(2025, 5, 29, 10, 5),
+        warning_flags=["Sin seguro agrícola", "Bajo aporte propio"],
+    )
+
+
+def test_request_sent_renders_details(template_service, credit_request):
+    html = template_service.request_sent(credit_request, "Juan")
+
+    assert "Hola Juan," in html
+    assert f"#{TEST_REQUEST_ID}" in html
+    assert "29 de mayo de 2025" in html
+    assert "$15,000,000 COP" in html
+    assert "18.5%" in html
+    assert "24 meses" in html
+
+
+def test_base_styles_and_footer_are_prerendered(template_service, credit_request):
+    html = template_service.request_sent(credit_request)
+
+    assert "border-left: 4px solid #16a34a;" in html
+    assert "{{" not in html
+    assert "Impulsando el futuro agrícola de Colombia" in html
+
+
+def test_request_approved_calculates_monthly_payment(template_service, credit_request):
+    html = template_service.request_approved(credit_request, approved_amount=12000000.0)
+
+    assert "¡Excelentes noticias, Estimado/a cliente!" in html
+    assert "$12,000,000 COP" in html
+    assert "A calcular" not in html
+
+
+def test_request_approved_without_amount(template_service, credit_request):
+    html = template_service.request_approved(credit_request)
+
+    assert "A calcular" in html
+
+
+def test_request_rejected_lists_warning_flags(template_service, credit_request):
+    html = template_service.request_rejected(
+        credit_request, rejection_reason="Capacidad de pago insuficiente"
+    )
+
+    assert "rejection-header" in html
+    assert "Capacidad de pago insuficiente" in html
+    assert "<li>Sin seguro agrícola</li>" in html
+    assert "<li>Bajo aporte propio</li>" in html
+
+
+def test_request_rejected_escapes_user_content(template_service, credit_request):
+    html = template_service.request_rejected(
+        credit_request, rejection_reason="<script>alert(1)</script>"
+    )
+
+    assert "<script>" not in html
+    assert "&lt;script&gt;" in html
+
+
+def test_request_rejected_without_warning_flags(template_service, credit_request):
+    credit_request.warning_flags = None
+
+    html = template_service.request_rejected(credit_request)
+
+    assert "No cumple con los criterios de evaluación actuales" in html
+
+
+def test_render_cache_hits_for_same_request_version(
+    template_service, engine, credit_request
+):
+    first = template_service.request_sent(credit_request)
+    second = template_service.request_sent(credit_request)
+
+    assert first is second
+    assert engine.hits == 1
+    assert engine.misses == 1
+
+
+def test_render_cache_misses_after_update(template_service, engine, credit_request):
+    template_service.request_sent(credit_request)
+    credit_request.updated_at = datetime(2025, 5, 30, 9, 0)
+    credit_request.requested_amount = 20000000.0
+
+    html = template_service.request_sent(credit_request)
+
+    assert "$20,000,000 COP" in html
+    assert engine.misses == 2
+
+
+def test_render_cache_is_bounded(engine, credit_request):
+    service = TemplateService(engine=engine)
+    for minute in range(20):
+        credit_request.updated_at = datetime(2025, 5, 29, 11, minute)
+        service.request_sent(credit_request)
+
+    assert len(engine._cache) == engine.cache_size
+
+
+def test_render_without_id_skips_cache(template_service, engine, credit_request):
+    credit_request.id = None
+
+    template_service.request_sent(credit_request)
+
+    assert engine.hits == 0
+    assert engine.misses == 0
@@ -1,4 +1,5 @@
 from dataclasses import asdict
+from datetime import datetime
 from typing import Optional
 from uuid import UUID
 from sqlmodel import select, Session
@@ -51,6 +52,44 @@ class NotificationService:
             for nu, n in notifications
         ]
 
+    def get_notifications_since(
+        self,
+        user_id: UUID,
+        since: datetime,
+        until: Optional[datetime] = None,
+        limit: int = 50,
+    ) -> list[NotificationUserInterface]:
+        statement = (
+            select(NotificationsUser, Notification)
+            .join(Notification, NotificationsUser.notification_id == Notification.id)
+            .where(NotificationsUser.user_id == user_id)
+            .where(NotificationsUser.created_at > since)
+        )
+        if until is not None:
+            statement = statement.where(NotificationsUser.created_at <= until)
+        # Las más antiguas primero: si se corta en `limit`, el reenvío puede
+        # retomarse desde la última entregada sin saltarse ninguna
+        statement = statement.order_by(NotificationsUser.created_at.asc()).limit(limit)
+        notifications = self.db.exec(statement).all()
+        return [
+            NotificationUserInterface(
+                id=nu.id,
+                notification_id=nu.notification_id,
+                user_id=nu.user_id,
+                created_at=nu.created_at,
+                updated_at=nu.updated_at,
+                read_at=nu.read_at,
+                notification=NotificationInterface(
+                    id=n.id,
+                    title=n.title,
+                    message=n.message,
+                    created_at=n.created_at,
+                    updated_at=n.updated_at,
+                ),
+            )
+            for nu, n in notifications
+        ]
+
     def create_notification_user(
         self, notification_user_data: NotificationUserInterface
     ) -> NotificationsUser:
@@ -1,7 +1,7 @@
 import pytest
 from unittest.mock import MagicMock, patch, ANY
 from uuid import UUID, uuid4
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from typing import Optional
 from datetime import timedelta
 from dataclasses import asdict
@@ -14,6 +14,10 @@ from app.modules.notifications.models.notification_model import (
     NotificationUserInterface,
 )
 from app.modules.clients.services.client_service import ClientProfileService
+from app.db.engine import create_memory_engine
+from app.shared.entities.client_profile_entity import ClientProfile
+from app.shared.entities.notification_entity import Notification
+from app.shared.entities.notifications_user_entity import NotificationsUser
 
 class MockClientProfile:
     def __init__(self, id: UUID, user_id: UUID):
@@ -226,3 +230,71 @@ def test_get_notification_by_id_not_found(notification_service, mock_db_session)
 
     assert result is None
     mock_db_session.exec.assert_called_once_with(ANY)
+
+
+def test_get_notifications_since_returns_oldest_first(notification_service, mock_db_session):
+    """
+    Testea que las notificaciones posteriores a una fecha se retornan en orden cronológico.
+    """
+    mock_notification = MockNotification(
+        id=TEST_NOTIFICATION_ID_1, title="Bienvenida", message="Bienvenido a la app", created_at=TWO_HOURS_AGO, updated_at=TWO_HOURS_AGO
+    )
+    newest = MockNotificationsUser(
+        id=TEST_NOTIFICATION_USER_ID_2, notification_id=TEST_NOTIFICATION_ID_1, user_id=TEST_USER_ID,
+        created_at=NOW, updated_at=NOW
+    )
+    oldest = MockNotificationsUser(
+        id=TEST_NOTIFICATION_USER_ID_1, notification_id=TEST_NOTIFICATION_ID_1, user_id=TEST_USER_ID,
+        created_at=ONE_HOUR_AGO, updated_at=ONE_HOUR_AGO
+    )
+    mock_db_session.exec.return_value.all.return_value = [
+        (oldest, mock_notification),
+        (newest, mock_notification),
+    ]
+
+    result = notification_service.get_notifications_since(TEST_USER_ID, TWO_HOURS_AGO, until=NOW, limit=2)
+
+    assert [n.id for n in result] == [TEST_NOTIFICATION_USER_ID_1, TEST_NOTIFICATION_USER_ID_2]
+    assert result[0].notification.title == "Bienvenida"
+    mock_db_session.exec.assert_called_once_with(ANY)
+
+
+def test_get_notifications_since_keeps_oldest_when_limited():
+    """
+    Con más notificaciones perdidas que el límite se retornan las más
+    antiguas, para que el reenvío pueda continuar desde la última.
+    """
+    engine = create_memory_engine()
+    with Session(engine) as db:
+        client = ClientProfile(
+            user_id=TEST_USER_ID,
+            email="cliente@example.com",
+            date_of_birth=date(1985, 3, 1),
+            annual_income=60_000_000,
+            years_of_agricultural_experience=12,
+            has_agricultural_insurance=True,
+            internal_credit_history_score=720,
+            current_debt_to_income_ratio=0.2,
+            farm_size_hectares=15,
+        )
+        notification = Notification(id=TEST_NOTIFICATION_ID_1, title="t", message="m")
+        db.add_all([client, notification])
+        start = datetime(2026, 1, 1, 10, 0)
+        for minute in range(1, 6):
+            created_at = start + timedelta(minutes=minute)
+            db.add(
+                NotificationsUser(
+                    notification_id=TEST_NOTIFICATION_ID_1,
+                    user_id=TEST_USER_ID,
+                    created_at=created_at,
+                    updated_at=created_at,
+                )
+            )
+        db.commit()
+
+        result = NotificationService(db).get_notifications_since(
+            TEST_USER_ID, start, until=start + timedelta(hours=1), limit=3
+        )
+
+    assert [n.created_at.minute for n in result] == [1, 2, 3]
+    engine.dispose()
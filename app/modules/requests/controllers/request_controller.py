@@ -1,23 +1,41 @@
 from typing import Optional
 from uuid import UUID
 from fastapi import Depends, APIRouter, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from app.db.session import get_session
+from sqlmodel import Session as SQLModelSession
+from app.coalescing.dependencies import (
+    SCOPE_AUTHENTICATED,
+    Coalescing,
+    get_coalescing,
+)
+from app.db.session import engine, get_session
+from app.idempotency.dependencies import Idempotency, get_idempotency
 from app.modules.mails.dependencies import get_mail_service
 from app.modules.mails.services.mail_service import MailService
 from app.modules.requests.dtos.crud_request_dto import (
+    PaginatedRequestListResponse,
     RequestApprove,
     RequestChangeStatus,
     RequestCreate,
+    RequestDataResponse,
+    RequestListResponse,
+    RequestMessageResponse,
     RequestReject,
     RequestUpdate,
 )
+from app.modules.requests.services.request_cache import (
+    cached_response,
+    client_request_key,
+    request_key,
+)
 from app.modules.requests.services.request_related_data import RequestRelatedData
 from app.modules.requests.services.request_service import RequestService
-from app.shared.dtos.pagination_dto import PaginatedRequestsResponse, PaginationMeta
+from app.shared.dtos.pagination_dto import PaginationMeta
 from app.shared.guards.jwtGuard import jwt_guard
+from app.shared.responses.json_response import ModelResponse
 from fastapi import HTTPException, status
-from app.ws.websocket_manager import send_notification
+from app.ws.websocket_manager import publish_event, send_notification
 
 requestRouter = APIRouter(
     prefix="/requests",
@@ -27,55 +45,71 @@ requestRouter = APIRouter(
 
 
 @requestRouter.get("/related-data")
-def get_related_data(db: Session = Depends(get_session)):
-    try:
-        credit_types, request_statuses = RequestRelatedData(db).get_related_data()
-        return {
-            "data": {"credit_types": credit_types, "request_statuses": request_statuses}
-        }
-    except HTTPException as e:
-        raise e
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e),
-        )
+async def get_related_data(
+    db: Session = Depends(get_session),
+    coalescing: Coalescing = Depends(get_coalescing),
+):
+    def handler():
+        try:
+            credit_types, request_statuses = RequestRelatedData(db).get_related_data()
+            return {
+                "data": {
+                    "credit_types": credit_types,
+                    "request_statuses": request_statuses,
+                }
+            }
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=str(e),
+            )
+
+    # jwt_guard solo autentica: la respuesta es la misma para todo analista
+    return await coalescing.run(handler, scope=SCOPE_AUTHENTICATED)
 
 
-@requestRouter.post("/")
+@requestRouter.post("/", response_model=RequestMessageResponse)
 async def create_request(
     request: RequestCreate,
     db: Session = Depends(get_session),
     mail_service: MailService = Depends(get_mail_service),
+    idempotency: Idempotency = Depends(get_idempotency),
 ):
+    async def handler():
+        try:
+            new_request, is_created = await RequestService(
+                db,
+                mail_service,
+                ws_send_notification=send_notification,
+                ws_publish_event=publish_event,
+            ).create_request(request)
+            if is_created:
+                message = "Solicitud creada exitosamente"
+            else:
+                message = "Solicitud actualizada exitosamente"
+            return ModelResponse(
+                RequestMessageResponse(message=message, data=new_request)
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error al crear solicitud: {e}",
+            )
 
-    try:
-        new_request, is_created = await RequestService(db, mail_service, ws_send_notification=send_notification).create_request(
-            request
-        )
-        if is_created:
-            return {"message": "Solicitud creada exitosamente", "data": new_request}
-        else:
-            return {
-                "message": "Solicitud actualizada exitosamente",
-                "data": new_request,
-            }
-    except ValueError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error al crear solicitud: {e}",
-        )
+    return await idempotency.run(handler)
 
 
-@requestRouter.get("/")
+@requestRouter.get("/", response_model=RequestListResponse)
 def get_requests(db: Session = Depends(get_session)):
     requests = RequestService(db).get_all_requests()
-    return {"data": requests}
+    return ModelResponse(RequestListResponse(data=requests))
 
 
-@requestRouter.get("/paginated-list")
+@requestRouter.get("/paginated-list", response_model=PaginatedRequestListResponse)
 async def get_paginated_list(
     client_id: Optional[UUID] = Query(
         None,
@@ -105,95 +139,170 @@ async def get_paginated_list(
     sort_order: Optional[str] = Query(
         "asc", description="Orden de los resultados (asc/desc)."
     ),
+    coalescing: Coalescing = Depends(get_coalescing),
 ):
-    service = RequestService(db)
-    try:
-        requests_list, total_items = await service.get_paginated_list(
-            client_id=client_id,
-            page=page,
-            per_page=per_page,
-            status_id=status_id,
-            credit_type_id=credit_type_id,
-            order_by=order_by,
-            sort_order=sort_order,
-        )
+    async def handler():
+        service = RequestService(db)
+        try:
+            requests_list, total_items = await service.get_paginated_list(
+                client_id=client_id,
+                page=page,
+                per_page=per_page,
+                status_id=status_id,
+                credit_type_id=credit_type_id,
+                order_by=order_by,
+                sort_order=sort_order,
+            )
 
-        total_pages = (total_items + per_page - 1) // per_page
-        current_page = page
-        has_previous_page = current_page > 1
-        has_next_page = current_page < total_pages
-
-        pagination_meta = PaginationMeta(
-            page=current_page,
-            per_page=per_page,
-            total_items=total_items,
-            total_pages=total_pages,
-            has_previous_page=has_previous_page,
-            has_next_page=has_next_page,
-        )
+            total_pages = (total_items + per_page - 1) // per_page
+            current_page = page
+            has_previous_page = current_page > 1
+            has_next_page = current_page < total_pages
 
-        return PaginatedRequestsResponse(data=requests_list, pagination=pagination_meta)
+            pagination_meta = PaginationMeta(
+                page=current_page,
+                per_page=per_page,
+                total_items=total_items,
+                total_pages=total_pages,
+                has_previous_page=has_previous_page,
+                has_next_page=has_next_page,
+            )
 
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error al obtener solicitudes: {e}",
-        )
+            return ModelResponse(
+                PaginatedRequestListResponse(
+                    data=requests_list, pagination=pagination_meta
+                )
+            )
+
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error al obtener solicitudes: {e}",
+            )
+
+    # jwt_guard solo autentica: la respuesta es la misma para todo analista
+    return await coalescing.run(handler, scope=SCOPE_AUTHENTICATED)
 
 
-@requestRouter.get("/{id}")
+@requestRouter.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+def export_requests(
+    client_id: Optional[UUID] = Query(
+        None, description="ID del cliente para filtrar las solicitudes."
+    ),
+    status_id: Optional[UUID] = Query(
+        None, description="Filtrar por ID de estado de la solicitud."
+    ),
+):
+    """Exporta las solicitudes como NDJSON, en streaming por lotes"""
+
+    def rows():
+        # Sesión propia: la del dependency se cierra antes de enviar el cuerpo
+        with SQLModelSession(engine) as db:
+            batches = RequestService(db).iter_export(
+                client_id=client_id, status_id=status_id
+            )
+            for batch in batches:
+                yield "".join(f"{row.model_dump_json()}\n" for row in batch)
+
+    return StreamingResponse(
+        rows(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="requests.ndjson"'},
+    )
+
+
+@requestRouter.get("/{id}", response_model=RequestDataResponse)
 def get_request_by_id(id: UUID, db: Session = Depends(get_session)):
-    request = RequestService(db).get_request_by_id(id)
-    return {"data": request}
+    def load() -> bytes:
+        request = RequestService(db).get_request_by_id(id)
+        return RequestDataResponse(data=request).model_dump_json().encode()
+
+    return ModelResponse(cached_response(request_key(id), load))
 
 
-@requestRouter.patch("/{id}")
+@requestRouter.patch("/{id}", response_model=RequestMessageResponse)
 def update_request(
     id: UUID, request_update: RequestUpdate, db: Session = Depends(get_session)
 ):
-    updated_request = RequestService(db).update_request(id, request_update)
-    return {"message": "Solicitud actualizada exitosamente", "data": updated_request}
+    updated_request = RequestService(db, ws_publish_event=publish_event).update_request(
+        id, request_update
+    )
+    return ModelResponse(
+        RequestMessageResponse(
+            message="Solicitud actualizada exitosamente", data=updated_request
+        )
+    )
 
 
-@requestRouter.patch("/{id}/approve")
+@requestRouter.patch("/{id}/approve", response_model=RequestMessageResponse)
 async def approve_request(
     body: RequestApprove,
     id: UUID,
     db: Session = Depends(get_session),
     user_id: UUID = Depends(jwt_guard),
     mail_service: MailService = Depends(get_mail_service),
+    idempotency: Idempotency = Depends(get_idempotency),
 ):
-    updated_request = await RequestService(db, mail_service, ws_send_notification=send_notification).approve_request(
-        id, user_id, body.approved_amount
-    )
-    return {"message": "Solicitud aprobada exitosamente", "data": updated_request}
+    async def handler():
+        updated_request = await RequestService(
+            db,
+            mail_service,
+            ws_send_notification=send_notification,
+            ws_publish_event=publish_event,
+        ).approve_request(id, user_id, body.approved_amount)
+        return ModelResponse(
+            RequestMessageResponse(
+                message="Solicitud aprobada exitosamente", data=updated_request
+            )
+        )
+
+    return await idempotency.run(handler)
 
 
-@requestRouter.patch("/{id}/reject")
+@requestRouter.patch("/{id}/reject", response_model=RequestMessageResponse)
 async def reject_request(
     body: RequestReject,
     id: UUID,
     db: Session = Depends(get_session),
     user_id: UUID = Depends(jwt_guard),
     mail_service: MailService = Depends(get_mail_service),
+    idempotency: Idempotency = Depends(get_idempotency),
 ):
-    updated_request = await RequestService(db, mail_service, ws_send_notification=send_notification).reject_request(
-        id, user_id, body.rejection_reason
-    )
-    return {"message": "Solicitud rechazada exitosamente", "data": updated_request}
+    async def handler():
+        updated_request = await RequestService(
+            db,
+            mail_service,
+            ws_send_notification=send_notification,
+            ws_publish_event=publish_event,
+        ).reject_request(id, user_id, body.rejection_reason)
+        return ModelResponse(
+            RequestMessageResponse(
+                message="Solicitud rechazada exitosamente", data=updated_request
+            )
+        )
 
+    return await idempotency.run(handler)
 
-@requestRouter.patch("/{id}/change-status")
+
+@requestRouter.patch("/{id}/change-status", response_model=RequestMessageResponse)
 def change_status(
     body: RequestChangeStatus,
     id: UUID,
     db: Session = Depends(get_session),
 ):
-    updated_request = RequestService(db).change_status(id, body.status_id)
-    return {
-        "message": "Estado de la solicitud cambiado exitosamente",
-        "data": updated_request,
-    }
+    updated_request = RequestService(db, ws_publish_event=publish_event).change_status(
+        id, body.status_id
+    )
+    return ModelResponse(
+        RequestMessageResponse(
+            message="Estado de la solicitud cambiado exitosamente",
+            data=updated_request,
+        )
+    )
 
 
 @requestRouter.delete("/{id}")
@@ -202,7 +311,10 @@ def delete_request(id: UUID, db: Session = Depends(get_session)):
     return {"message": "Solicitud eliminada exitosamente"}
 
 
-@requestRouter.get("/client/{client_id}")
+@requestRouter.get("/client/{client_id}", response_model=RequestDataResponse)
 def get_request_by_client_id(client_id: UUID, db: Session = Depends(get_session)):
-    request = RequestService(db).get_request_by_client_id(client_id)
-    return {"data": request}
+    def load() -> bytes:
+        request = RequestService(db).get_request_by_client_id(client_id)
+        return RequestDataResponse(data=request).model_dump_json().encode()
+
+    return ModelResponse(cached_response(client_request_key(client_id), load))
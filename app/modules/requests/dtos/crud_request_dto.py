@@ -1,9 +1,10 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
 from app.shared.entities.credit_type_enity import CreditType
 from app.shared.entities.request_status_entity import RequestStatus
+from app.shared.dtos.pagination_dto import PaginatedRequestsResponse
 
 from pydantic import BaseModel, ConfigDict, Field as PydanticField
 
@@ -219,4 +220,20 @@ class RequestReject(BaseModel):
 
 
 class RequestChangeStatus(BaseModel):
-    status_id: UUID = PydanticField(..., description="ID del estado de la solicitud.")
\ No newline at end of file
+    status_id: UUID = PydanticField(..., description="ID del estado de la solicitud.")
+
+class RequestDataResponse(BaseModel):
+    data: Optional[RequestResponse] = None
+
+
+class RequestListResponse(BaseModel):
+    data: List[RequestResponse]
+
+
+class RequestMessageResponse(BaseModel):
+    message: str
+    data: RequestResponse
+
+
+class PaginatedRequestListResponse(PaginatedRequestsResponse):
+    data: List[RequestResponse]
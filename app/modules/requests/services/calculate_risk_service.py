@@ -13,6 +13,23 @@ class RiskLevel(str, Enum):
     CRITICAL = "CRITICO"
 
 
+# Límite superior (inclusive) del porcentaje de riesgo de cada nivel
+RISK_LEVEL_THRESHOLDS = (
+    (15, RiskLevel.VERY_LOW),
+    (25, RiskLevel.LOW),
+    (40, RiskLevel.MEDIUM),
+    (60, RiskLevel.HIGH),
+    (80, RiskLevel.VERY_HIGH),
+)
+
+
+def risk_level_for(risk_percentage: float) -> RiskLevel:
+    for upper_bound, level in RISK_LEVEL_THRESHOLDS:
+        if risk_percentage <= upper_bound:
+            return level
+    return RiskLevel.CRITICAL
+
+
 class CreditRequest(BaseModel):
     date_of_birth: date
     annual_income: float = Field(gt=0, json_schema_extra={"description": "Ingreso anual en COP"})
@@ -439,18 +456,7 @@ class CreditRiskCalculator:
 
         risk_percentage = max(0, min(100, 100 - total_positive_score))
 
-        if risk_percentage <= 15:
-            risk_level = RiskLevel.VERY_LOW
-        elif risk_percentage <= 25:
-            risk_level = RiskLevel.LOW
-        elif risk_percentage <= 40:
-            risk_level = RiskLevel.MEDIUM
-        elif risk_percentage <= 60:
-            risk_level = RiskLevel.HIGH
-        elif risk_percentage <= 80:
-            risk_level = RiskLevel.VERY_HIGH
-        else:
-            risk_level = RiskLevel.CRITICAL
+        risk_level = risk_level_for(risk_percentage)
 
         approval_recommendation = risk_level in [
             RiskLevel.VERY_LOW,
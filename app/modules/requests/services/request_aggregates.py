@@ -0,0 +1,323 @@
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+from uuid import UUID
+from app.core.env import load_env
+from sqlalchemy import (
+    Date,
+    case,
+    cast,
+    delete,
+    func,
+    insert,
+    select,
+    text,
+    type_coerce,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session
+from app.metrics.registry import registry
+from app.modules.requests.services.calculate_risk_service import (
+    RISK_LEVEL_THRESHOLDS,
+    RiskLevel,
+    risk_level_for,
+)
+from app.shared.entities.requestEntity import Request
+from app.shared.entities.request_aggregate_entity import (
+    UNRATED_RISK_LEVEL,
+    RequestAggregate,
+)
+
+load_env()
+
+logger = logging.getLogger(__name__)
+
+UPSERT_DIALECTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+# Clave de pg_try_advisory_xact_lock: una sola reconciliación a la vez
+RECONCILE_LOCK_ID = 0x52414747
+AMOUNT_TOLERANCE = 0.005
+EMPTY_AGGREGATE = (0, 0.0, 0.0)
+
+AggregateKey = Tuple[date, UUID, UUID, str]
+
+reconcile_drift = registry.counter(
+    "request_aggregates_drift",
+    "Filas de request_aggregates corregidas por la reconciliación",
+)
+reconcile_seconds = registry.histogram(
+    "request_aggregates_reconcile_seconds",
+    "Duración de la reconciliación de request_aggregates",
+)
+
+
+class RequestSnapshot(NamedTuple):
+    """Aporte de una solicitud a su fila de request_aggregates"""
+
+    month: date
+    status_id: UUID
+    credit_type_id: UUID
+    risk_level: str
+    requested_amount: float
+    approved_amount: float
+
+    @property
+    def key(self) -> AggregateKey:
+        return (self.month, self.status_id, self.credit_type_id, self.risk_level)
+
+
+def month_of(value: datetime) -> date:
+    return date(value.year, value.month, 1)
+
+
+def risk_level_of(risk_score: Optional[float]) -> str:
+    if risk_score is None:
+        return UNRATED_RISK_LEVEL
+    return risk_level_for(risk_score).value
+
+
+def snapshot(request: Request) -> Optional[RequestSnapshot]:
+    """
+    Copia los valores agregables de la solicitud; se toma antes de modificarla
+    porque sqlmodel_update cambia el objeto en el lugar.
+    """
+    if not isinstance(request.created_at, datetime) or request.status_id is None:
+        return None
+    return RequestSnapshot(
+        month=month_of(request.created_at),
+        status_id=request.status_id,
+        credit_type_id=request.credit_type_id,
+        risk_level=risk_level_of(request.risk_score),
+        requested_amount=request.requested_amount or 0.0,
+        approved_amount=request.approved_amount or 0.0,
+    )
+
+
+def _deltas(
+    before: Optional[RequestSnapshot], after: Optional[RequestSnapshot]
+) -> Dict[AggregateKey, list]:
+    deltas: Dict[AggregateKey, list] = defaultdict(lambda: [0, 0.0, 0.0])
+    for item, sign in ((before, -1), (after, 1)):
+        if item is None:
+            continue
+        delta = deltas[item.key]
+        delta[0] += sign
+        delta[1] += sign * item.requested_amount
+        delta[2] += sign * item.approved_amount
+    return {key: delta for key, delta in deltas.items() if any(delta)}
+
+
+def apply_change(
+    session: Session,
+    before: Optional[RequestSnapshot],
+    after: Optional[RequestSnapshot],
+) -> None:
+    """
+    Suma a request_aggregates la diferencia entre dos estados de una
+    solicitud. Se ejecuta antes del commit, en la misma transacción que el
+    cambio, con un upsert que incrementa la fila en el motor para no perder
+    actualizaciones concurrentes.
+    """
+    deltas = _deltas(before, after)
+    if not deltas:
+        return
+    upsert = UPSERT_DIALECTS.get(session.get_bind().dialect.name)
+    if upsert is None:
+        # Sin upsert conocido: la reconciliación corrige los agregados
+        return
+
+    table = RequestAggregate.__table__
+    now = datetime.now()
+    for (month, status_id, credit_type_id, risk_level), delta in deltas.items():
+        statement = upsert(table).values(
+            month=month,
+            status_id=status_id,
+            credit_type_id=credit_type_id,
+            risk_level=risk_level,
+            request_count=delta[0],
+            requested_amount=delta[1],
+            approved_amount=delta[2],
+            updated_at=now,
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[c.name for c in table.primary_key.columns],
+            set_={
+                "request_count": table.c.request_count
+                + statement.excluded.request_count,
+                "requested_amount": table.c.requested_amount
+                + statement.excluded.requested_amount,
+                "approved_amount": table.c.approved_amount
+                + statement.excluded.approved_amount,
+                "updated_at": statement.excluded.updated_at,
+            },
+        )
+        session.execute(statement)
+
+
+def _month_expression(dialect: str):
+    if dialect == "postgresql":
+        return cast(func.date_trunc("month", Request.created_at), Date)
+    return type_coerce(func.strftime("%Y-%m-01", Request.created_at), Date)
+
+
+def _risk_level_expression():
+    return case(
+        (Request.risk_score.is_(None), UNRATED_RISK_LEVEL),
+        *(
+            (Request.risk_score <= upper_bound, level.value)
+            for upper_bound, level in RISK_LEVEL_THRESHOLDS
+        ),
+        else_=RiskLevel.CRITICAL.value,
+    )
+
+
+def compute_aggregates(session: Session) -> Dict[AggregateKey, tuple]:
+    """GROUP BY completo sobre requests; solo lo usa la reconciliación"""
+    month = _month_expression(session.get_bind().dialect.name)
+    risk_level = _risk_level_expression()
+    rows = session.execute(
+        select(
+            month,
+            Request.status_id,
+            Request.credit_type_id,
+            risk_level,
+            func.count(),
+            func.coalesce(func.sum(Request.requested_amount), 0.0),
+            func.coalesce(func.sum(Request.approved_amount), 0.0),
+        ).group_by(month, Request.status_id, Request.credit_type_id, risk_level)
+    ).all()
+    return {tuple(row[:4]): tuple(row[4:]) for row in rows}
+
+
+def _same(current: Optional[tuple], expected: tuple) -> bool:
+    if current is None:
+        return False
+    return current[0] == expected[0] and all(
+        math.isclose(a, b, abs_tol=AMOUNT_TOLERANCE)
+        for a, b in zip(current[1:], expected[1:])
+    )
+
+
+def reconcile(session: Session) -> int:
+    """
+    Recalcula request_aggregates desde requests y corrige las filas que
+    difieren. En PostgreSQL bloquea la tabla en modo SHARE ROW EXCLUSIVE
+    antes de leer: los cambios en curso terminan antes del recálculo y los
+    siguientes esperan a que termine, así ningún incremento se pierde ni se
+    cuenta dos veces. Devuelve el número de filas corregidas.
+    """
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        locked = session.execute(
+            select(func.pg_try_advisory_xact_lock(RECONCILE_LOCK_ID))
+        ).scalar()
+        if not locked:
+            session.rollback()
+            return 0
+        session.execute(
+            text("LOCK TABLE request_aggregates IN SHARE ROW EXCLUSIVE MODE")
+        )
+
+    table = RequestAggregate.__table__
+    expected = compute_aggregates(session)
+    current = {
+        (row.month, row.status_id, row.credit_type_id, row.risk_level): (
+            row.request_count,
+            row.requested_amount,
+            row.approved_amount,
+        )
+        for row in session.execute(select(table))
+    }
+    # Filas vaciadas por los incrementos: se borran sin contar como desvío
+    stale = [key for key in current if key not in expected]
+    changed = [key for key, v in expected.items() if not _same(current.get(key), v)]
+    drift = len(changed) + sum(
+        1 for key in stale if not _same(current[key], EMPTY_AGGREGATE)
+    )
+    if stale or changed:
+        for key in stale + changed:
+            session.execute(
+                delete(table).where(
+                    table.c.month == key[0],
+                    table.c.status_id == key[1],
+                    table.c.credit_type_id == key[2],
+                    table.c.risk_level == key[3],
+                )
+            )
+        if changed:
+            now = datetime.now()
+            session.execute(
+                insert(table),
+                [
+                    {
+                        "month": key[0],
+                        "status_id": key[1],
+                        "credit_type_id": key[2],
+                        "risk_level": key[3],
+                        "request_count": expected[key][0],
+                        "requested_amount": expected[key][1],
+                        "approved_amount": expected[key][2],
+                        "updated_at": now,
+                    }
+                    for key in changed
+                ],
+            )
+    if drift:
+        logger.warning("Reconciliación de request_aggregates: %d filas", drift)
+    session.commit()
+    return drift
+
+
+class AggregateReconciler:
+    """
+    Ejecuta `reconcile` cada `interval` segundos en un hilo aparte, con una
+    sesión nueva por ejecución. Con varios workers, en PostgreSQL solo uno
+    reconcilia a la vez (advisory lock).
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], interval: float):
+        self.session_factory = session_factory
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.to_thread(self.tick)
+            except Exception as e:
+                logger.exception("Error al reconciliar request_aggregates: %s", e)
+
+    def tick(self) -> int:
+        start = time.perf_counter()
+        with self.session_factory() as session:
+            drift = reconcile(session)
+        reconcile_seconds.observe(time.perf_counter() - start)
+        if drift:
+            reconcile_drift.inc(drift)
+        return drift
+
+
+def create_reconciler(engine) -> Optional[AggregateReconciler]:
+    """Lee AGGREGATES_RECONCILE_INTERVAL_SECONDS; 0 desactiva el job"""
+    interval = float(os.getenv("AGGREGATES_RECONCILE_INTERVAL_SECONDS", "900"))
+    if interval <= 0:
+        return None
+    return AggregateReconciler(lambda: Session(engine), interval)
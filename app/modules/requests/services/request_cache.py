@@ -0,0 +1,23 @@
+from typing import Callable, Optional
+from uuid import UUID
+from app.cache.response_cache import response_cache
+
+
+def request_key(request_id: UUID) -> str:
+    return f"request:{request_id}"
+
+
+def client_request_key(client_id: UUID) -> str:
+    return f"request-client:{client_id}"
+
+
+def cached_response(key: str, loader: Callable[[], bytes]) -> bytes:
+    return response_cache.get_or_load(key, loader)
+
+
+def invalidate_request(request_id: UUID, client_id: Optional[UUID]) -> None:
+    """Tras el commit de cualquier escritura sobre la solicitud"""
+    keys = [request_key(request_id)]
+    if client_id is not None:
+        keys.append(client_request_key(client_id))
+    response_cache.invalidate(*keys)
@@ -1,8 +1,7 @@
 from datetime import datetime
-from typing import Callable, List, Optional, Tuple
+from typing import Callable, Iterator, List, Optional, Tuple
 from uuid import UUID
 from fastapi import HTTPException, status
-from fastapi_mail import MessageSchema
 from sqlalchemy.orm import selectinload
 from sqlmodel import Session, asc, desc, func, select
 from app.modules.clients.services.client_service import (
@@ -10,7 +9,7 @@ from app.modules.clients.services.client_service import (
     ClientProfileService,
 )
 
-from app.modules.mails.services.mail_service import MailService
+from app.modules.mails.services.mail_service import MailService, html_message
 from app.modules.mails.services.template_service import TemplateService
 from app.modules.notifications.models.notification_model import (
     NotificationUserInterface,
@@ -24,12 +23,21 @@ from app.modules.requests.services.calculate_risk_service import (
     CreditRequest,
     CreditRiskCalculator,
 )
+from app.modules.requests.services.request_aggregates import apply_change, snapshot
+from app.modules.requests.services.request_cache import invalidate_request
 from app.modules.requests.services.request_related_data import RequestRelatedData
 from app.shared.entities.client_profile_entity import ClientProfile
 from app.shared.entities.credit_type_enity import CreditType
 from app.modules.requests.dtos.crud_request_dto import RequestResponse, RequestUpdate
 from app.shared.entities.requestEntity import Request
 from app.shared.entities.request_status_entity import RequestStatus
+from app.tracing.tracer import traced
+from app.ws.topics import REQUEST_CREATED, REQUEST_STATUS_CHANGED, REQUEST_UPDATED
+
+# Notificaciones predefinidas (tabla notifications) que se asignan al cliente
+REQUEST_SENT_NOTIFICATION_ID = UUID("a3f1e6d2-4b8c-4d5e-9b0f-123456789abc")
+REQUEST_APPROVED_NOTIFICATION_ID = UUID("b2d9f7c3-5c9d-4e6f-8a1b-23456789abcd")
+REQUEST_REJECTED_NOTIFICATION_ID = UUID("c7a8d9e4-6d0e-5f7a-9c2d-3456789abcde")
 
 
 class InvalidReferenceIdError(Exception):
@@ -50,6 +58,7 @@ class RequestService:
         db: Session,
         mail_service: Optional[MailService] = None,
         ws_send_notification: Optional[Callable] = None,
+        ws_publish_event: Optional[Callable] = None,
     ):
         self.db = db
         self.request_related_data = RequestRelatedData(db)
@@ -58,11 +67,32 @@ class RequestService:
         self.mail_service = mail_service
         self.template_service = TemplateService()
         self.ws_send_notification = ws_send_notification
+        self.ws_publish_event = ws_publish_event
+
+    def _publish_request_event(self, topic: str, db_request: Request):
+        if not self.ws_publish_event:
+            return
+        self.ws_publish_event(
+            topic,
+            {
+                "request_id": str(db_request.id),
+                "client_id": str(db_request.client_id),
+                "credit_type_id": str(db_request.credit_type_id),
+                "status_id": str(db_request.status_id),
+                "requested_amount": db_request.requested_amount,
+                "approved_amount": db_request.approved_amount,
+                "risk_score": db_request.risk_score,
+                "updated_at": (
+                    db_request.updated_at.isoformat() if db_request.updated_at else None
+                ),
+            },
+        )
 
     def _validate_reference_ids(self, credit_type_id: UUID, status_id: UUID):
         self.request_related_data.get_credit_type(credit_type_id)
         self.request_related_data.get_request_status(status_id)
 
+    @traced("RequestService.create_request")
     async def create_request(
         self, request_create: RequestInterface
     ) -> Tuple[RequestResponse, bool]:
@@ -95,13 +125,18 @@ class RequestService:
         db_request = Request(**request_create.dict())
 
         self.db.add(db_request)
+        # created_at llega en None desde el DTO; el flush aplica el default
+        self.db.flush()
+        apply_change(self.db, None, snapshot(db_request))
         self.db.commit()
         self.db.refresh(db_request)
-        self.update_request(db_request.id, request_create)
+        invalidate_request(db_request.id, db_request.client_id)
+        self.update_request(db_request.id, request_create, publish=False)
+        self._publish_request_event(REQUEST_CREATED, db_request)
         notificationUser = self.notification_service.create_notification_user(
             NotificationUserInterface(
                 user_id=request_create.client_id,
-                notification_id="a3f1e6d2-4b8c-4d5e-9b0f-123456789abc",
+                notification_id=REQUEST_SENT_NOTIFICATION_ID,
             )
         )
 
@@ -139,11 +174,10 @@ class RequestService:
             )
         if self.mail_service:
             await self.mail_service.send_email(
-                MessageSchema(
+                html_message(
                     subject="Solicitud de Crédito",
                     recipients=[client_profile.email],
                     body=self.template_service.request_sent(db_request),
-                    subtype="html",
                 )
             )
 
@@ -175,6 +209,7 @@ class RequestService:
         result = calculator.calculate_risk_score(credit_request)
         return result.risk_score, result.detailed_analysis, result.warning_flags
 
+    @traced("RequestService.get_paginated_list")
     async def get_paginated_list(
         self,
         page: int = 1,
@@ -255,6 +290,7 @@ class RequestService:
         response_data = [RequestResponse.model_validate(req) for req in requests]
         return response_data, total_items
 
+    @traced("RequestService.get_request_by_id")
     def get_request_by_id(self, request_id: UUID) -> Optional[RequestResponse]:
         statement = select(Request).where(Request.id == request_id)
 
@@ -267,6 +303,7 @@ class RequestService:
 
         return RequestResponse.model_validate(db_request)
 
+    @traced("RequestService.get_all_requests")
     def get_all_requests(
         self, client_id: Optional[UUID] = None, offset: int = 0, limit: int = 100
     ) -> List[RequestResponse]:
@@ -281,8 +318,33 @@ class RequestService:
 
         return [RequestResponse.model_validate(req) for req in requests]
 
+    def iter_export(
+        self,
+        client_id: Optional[UUID] = None,
+        status_id: Optional[UUID] = None,
+        batch_size: int = 500,
+    ) -> Iterator[List[RequestResponse]]:
+        """
+        Recorre todas las solicitudes en lotes de `batch_size`, sin cargar el
+        resultado completo en memoria (yield_per).
+        """
+        statement = (
+            select(Request)
+            .options(selectinload(Request.credit_type), selectinload(Request.status))
+            .order_by(asc(Request.created_at), asc(Request.id))
+            .execution_options(yield_per=batch_size)
+        )
+        if client_id:
+            statement = statement.where(Request.client_id == client_id)
+        if status_id:
+            statement = statement.where(Request.status_id == status_id)
+
+        for partition in self.db.exec(statement).partitions():
+            yield [RequestResponse.model_validate(req) for req in partition]
+
+    @traced("RequestService.update_request")
     def update_request(
-        self, request_id: UUID, request_update: RequestUpdate
+        self, request_id: UUID, request_update: RequestUpdate, publish: bool = True
     ) -> RequestResponse:
         db_request = self.db.get(Request, request_id)
         if not db_request:
@@ -311,6 +373,8 @@ class RequestService:
                     f"Status ID '{update_data['status_id']}' no encontrado."
                 )
 
+        previous_status_id = db_request.status_id
+        before = snapshot(db_request)
         db_request.sqlmodel_update(update_data)
         db_request.updated_at = datetime.now()
 
@@ -334,11 +398,24 @@ class RequestService:
         db_request.warning_flags = warning_flags
 
         self.db.add(db_request)
+        apply_change(self.db, before, snapshot(db_request))
         self.db.commit()
         self.db.refresh(db_request)
+        invalidate_request(db_request.id, db_request.client_id)
+
+        if publish:
+            self._publish_request_event(
+                (
+                    REQUEST_STATUS_CHANGED
+                    if db_request.status_id != previous_status_id
+                    else REQUEST_UPDATED
+                ),
+                db_request,
+            )
 
         return RequestResponse.model_validate(db_request)
 
+    @traced("RequestService.get_request_by_client_id")
     def get_request_by_client_id(self, client_id: UUID) -> Optional[RequestResponse]:
 
         db_request = self.db.exec(
@@ -348,6 +425,7 @@ class RequestService:
             return None
         return RequestResponse.model_validate(db_request)
 
+    @traced("RequestService.approve_request")
     async def approve_request(
         self, request_id: UUID, user_id: UUID, approved_amount: Optional[float] = None
     ) -> RequestResponse:
@@ -367,19 +445,23 @@ class RequestService:
         if approved_amount:
             update_data["approved_amount"] = approved_amount
 
+        before = snapshot(db_request)
         db_request.sqlmodel_update(update_data)
         db_request.updated_at = datetime.now()
         db_request.approved_at = datetime.now()
         db_request.analyst_id = user_id
 
         self.db.add(db_request)
+        apply_change(self.db, before, snapshot(db_request))
         self.db.commit()
         self.db.refresh(db_request)
+        invalidate_request(db_request.id, db_request.client_id)
+        self._publish_request_event(REQUEST_STATUS_CHANGED, db_request)
 
         notificationUser = self.notification_service.create_notification_user(
             NotificationUserInterface(
                 user_id=db_request.client_id,
-                notification_id="b2d9f7c3-5c9d-4e6f-8a1b-23456789abcd",
+                notification_id=REQUEST_APPROVED_NOTIFICATION_ID,
             )
         )
         notificationId = notificationUser.id
@@ -417,18 +499,18 @@ class RequestService:
 
         if self.mail_service:
             await self.mail_service.send_email(
-                MessageSchema(
+                html_message(
                     subject="Solicitud Aprobada",
                     recipients=[db_request.client_profile.email],
                     body=self.template_service.request_approved(
                         db_request, approved_amount=approved_amount
                     ),
-                    subtype="html",
                 )
             )
 
         return RequestResponse.model_validate(db_request)
 
+    @traced("RequestService.reject_request")
     async def reject_request(
         self, request_id: UUID, user_id: UUID, rejection_reason: Optional[str] = None
     ) -> RequestResponse:
@@ -450,18 +532,22 @@ class RequestService:
 
         update_data["approved_amount"] = 0
         update_data["approved_at"] = None
+        before = snapshot(db_request)
         db_request.sqlmodel_update(update_data)
         db_request.updated_at = datetime.now()
         db_request.analyst_id = user_id
 
         self.db.add(db_request)
+        apply_change(self.db, before, snapshot(db_request))
         self.db.commit()
         self.db.refresh(db_request)
+        invalidate_request(db_request.id, db_request.client_id)
+        self._publish_request_event(REQUEST_STATUS_CHANGED, db_request)
 
         notificationUser = self.notification_service.create_notification_user(
             NotificationUserInterface(
                 user_id=db_request.client_id,
-                notification_id="c7a8d9e4-6d0e-5f7a-9c2d-3456789abcde",
+                notification_id=REQUEST_REJECTED_NOTIFICATION_ID,
             )
         )
 
@@ -499,7 +585,7 @@ class RequestService:
 
         if self.mail_service:
             await self.mail_service.send_email(
-                MessageSchema(
+                html_message(
                     subject="Solicitud Rechazada",
                     recipients=[db_request.client_profile.email],
                     body=self.template_service.request_rejected(
@@ -507,12 +593,12 @@ class RequestService:
                         "Estimado/a cliente",
                         rejection_reason=rejection_reason,
                     ),
-                    subtype="html",
                 )
             )
 
         return RequestResponse.model_validate(db_request)
 
+    @traced("RequestService.change_status")
     def change_status(self, request_id: UUID, status_id: UUID) -> RequestResponse:
         db_request = self.db.get(Request, request_id)
         if not db_request:
@@ -527,11 +613,15 @@ class RequestService:
             "approved_at": None,
             "rejection_reason": None,
         }
+        before = snapshot(db_request)
         db_request.sqlmodel_update(update_data)
         db_request.updated_at = datetime.now()
 
         self.db.add(db_request)
+        apply_change(self.db, before, snapshot(db_request))
         self.db.commit()
         self.db.refresh(db_request)
+        invalidate_request(db_request.id, db_request.client_id)
+        self._publish_request_event(REQUEST_STATUS_CHANGED, db_request)
 
         return RequestResponse.model_validate(db_request)
@@ -0,0 +1,242 @@
+"""
+RequestService contra SQLite en memoria: consultas reales en lugar de un
+Session simulado.
+"""
+
+from datetime import date
+from uuid import uuid4
+import pytest
+from fastapi import HTTPException
+from sqlmodel import Session, select
+from app.db.engine import create_memory_engine
+from app.modules.requests.dtos.crud_request_dto import RequestCreate, RequestUpdate
+from app.modules.requests.services.request_aggregates import (
+    compute_aggregates,
+    reconcile,
+)
+from app.modules.requests.services.request_cache import cached_response, request_key
+from app.modules.requests.services.request_service import (
+    REQUEST_APPROVED_NOTIFICATION_ID,
+    REQUEST_REJECTED_NOTIFICATION_ID,
+    REQUEST_SENT_NOTIFICATION_ID,
+    RequestService,
+)
+from app.shared.entities.client_profile_entity import ClientProfile
+from app.shared.entities.credit_type_enity import CreditType
+from app.shared.entities.notification_entity import Notification
+from app.shared.entities.notifications_user_entity import NotificationsUser
+from app.shared.entities.requestEntity import Request
+from app.shared.entities.request_aggregate_entity import RequestAggregate
+from app.shared.entities.request_status_entity import RequestStatus
+
+
+@pytest.fixture
+def session():
+    engine = create_memory_engine()
+    with Session(engine) as session:
+        for code in ("PENDING", "APPROVED", "REJECTED"):
+            session.add(RequestStatus(code=code, name=code, description=code))
+        session.add(CreditType(code="INVESTMENT", name="Inversión", description="-"))
+        for notification_id in (
+            REQUEST_SENT_NOTIFICATION_ID,
+            REQUEST_APPROVED_NOTIFICATION_ID,
+            REQUEST_REJECTED_NOTIFICATION_ID,
+        ):
+            session.add(Notification(id=notification_id, title="t", message="m"))
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+def _status(session: Session, code: str) -> RequestStatus:
+    return session.exec(select(RequestStatus).where(RequestStatus.code == code)).one()
+
+
+def _client(session: Session, score: int = 720) -> ClientProfile:
+    client = ClientProfile(
+        user_id=uuid4(),
+        email=f"{uuid4().hex}@example.com",
+        date_of_birth=date(1985, 3, 1),
+        annual_income=60_000_000,
+        years_of_agricultural_experience=12,
+        has_agricultural_insurance=True,
+        internal_credit_history_score=score,
+        current_debt_to_income_ratio=0.2,
+        farm_size_hectares=15,
+    )
+    session.add(client)
+    session.commit()
+    return client
+
+
+def _payload(session: Session, client: ClientProfile, amount: float) -> RequestCreate:
+    return RequestCreate(
+        client_id=client.user_id,
+        requested_amount=amount,
+        term_months=24,
+        annual_interest_rate=18.5,
+        credit_type_id=session.exec(select(CreditType)).one().id,
+        status_id=_status(session, "PENDING").id,
+        number_of_dependents=2,
+        other_income_sources=0,
+        previous_defaults=0,
+    )
+
+
+@pytest.mark.asyncio
+async def test_create_request_persists_risk_assessment_and_notification(session):
+    client = _client(session)
+    service = RequestService(session)
+
+    response, created = await service.create_request(
+        _payload(session, client, 20_000_000)
+    )
+
+    assert created is True
+    stored = session.get(Request, response.id)
+    session.refresh(stored)
+    assert stored.risk_score is not None
+    assert isinstance(stored.risk_assessment_details, dict)
+    assert isinstance(stored.warning_flags, list)
+    notifications = session.exec(
+        select(NotificationsUser).where(NotificationsUser.user_id == client.user_id)
+    ).all()
+    assert [n.notification_id for n in notifications] == [REQUEST_SENT_NOTIFICATION_ID]
+
+
+@pytest.mark.asyncio
+async def test_second_create_for_same_client_updates_existing_request(session):
+    client = _client(session)
+    service = RequestService(session)
+
+    first, _ = await service.create_request(_payload(session, client, 10_000_000))
+    second, created = await service.create_request(
+        _payload(session, client, 15_000_000)
+    )
+
+    assert created is False
+    assert second.id == first.id
+    assert len(session.exec(select(Request)).all()) == 1
+    assert session.get(Request, first.id).requested_amount == 15_000_000
+
+
+@pytest.mark.asyncio
+async def test_paginated_list_filters_orders_and_counts(session):
+    service = RequestService(session)
+    ids = []
+    for amount in (3_000_000, 1_000_000, 2_000_000):
+        response, _ = await service.create_request(
+            _payload(session, _client(session), amount)
+        )
+        ids.append(response.id)
+    await service.reject_request(ids[0], uuid4(), "Garantía insuficiente")
+    pending = _status(session, "PENDING").id
+
+    page, total = await service.get_paginated_list(
+        per_page=1, status_id=pending, order_by="requested_amount", sort_order="desc"
+    )
+
+    assert total == 2
+    assert [r.requested_amount for r in page] == [2_000_000]
+    with pytest.raises(HTTPException) as exc:
+        await service.get_paginated_list(order_by="email")
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_approve_sets_status_analyst_and_notifies(session):
+    client = _client(session)
+    service = RequestService(session)
+    response, _ = await service.create_request(_payload(session, client, 8_000_000))
+    analyst_id = uuid4()
+
+    approved = await service.approve_request(response.id, analyst_id, 7_000_000)
+
+    assert approved.status_id == _status(session, "APPROVED").id
+    assert approved.approved_amount == 7_000_000
+    stored = session.get(Request, response.id)
+    assert stored.analyst_id == analyst_id
+    assert stored.approved_at is not None
+    codes = {
+        n.notification_id
+        for n in session.exec(
+            select(NotificationsUser).where(NotificationsUser.user_id == client.user_id)
+        )
+    }
+    assert codes == {REQUEST_SENT_NOTIFICATION_ID, REQUEST_APPROVED_NOTIFICATION_ID}
+
+
+@pytest.mark.asyncio
+async def test_update_rejects_unknown_references_and_missing_requests(session):
+    service = RequestService(session)
+    response, _ = await service.create_request(
+        _payload(session, _client(session), 5_000_000)
+    )
+
+    with pytest.raises(Exception, match="no encontrado"):
+        service.update_request(response.id, RequestUpdate(status_id=uuid4()))
+    with pytest.raises(HTTPException) as exc:
+        service.update_request(uuid4(), RequestUpdate(term_months=12))
+    assert exc.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_iter_export_streams_every_request_in_batches(session):
+    service = RequestService(session)
+    for amount in range(1, 6):
+        await service.create_request(
+            _payload(session, _client(session), amount * 1_000_000)
+        )
+
+    batches = list(service.iter_export(batch_size=2))
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert batches[0][0].status.code == "PENDING"
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_cached_request_detail(session):
+    client = _client(session)
+    service = RequestService(session)
+    response, _ = await service.create_request(_payload(session, client, 4_000_000))
+
+    def load():
+        return service.get_request_by_id(response.id).model_dump_json().encode()
+
+    key = request_key(response.id)
+    before = cached_response(key, load)
+    await service.approve_request(response.id, uuid4(), 3_000_000)
+
+    after = cached_response(key, load)
+    assert after != before
+    assert b'"approved_amount":3000000.0' in after
+    assert cached_response(key, lambda: b"stale") == after
+
+
+@pytest.mark.asyncio
+async def test_aggregates_follow_every_write_without_reconciliation(session):
+    service = RequestService(session)
+    ids = []
+    for amount in (2_000_000, 5_000_000, 9_000_000):
+        response, _ = await service.create_request(
+            _payload(session, _client(session), amount)
+        )
+        ids.append(response.id)
+    await service.approve_request(ids[0], uuid4(), 1_500_000)
+    await service.reject_request(ids[1], uuid4(), "Garantía insuficiente")
+    service.change_status(ids[0], _status(session, "PENDING").id)
+    service.update_request(ids[2], RequestUpdate(requested_amount=8_000_000))
+
+    incremental = {
+        (r.month, r.status_id, r.credit_type_id, r.risk_level): (
+            r.request_count,
+            r.requested_amount,
+            r.approved_amount,
+        )
+        for r in session.exec(select(RequestAggregate))
+        if r.request_count
+    }
+
+    assert incremental == compute_aggregates(session)
+    assert sum(count for count, _, _ in incremental.values()) == 3
+    assert reconcile(session) == 0
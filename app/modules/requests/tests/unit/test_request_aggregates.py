@@ -0,0 +1,220 @@
+from datetime import date, datetime
+from unittest.mock import MagicMock
+from uuid import uuid4
+import pytest
+from sqlalchemy import select
+from sqlmodel import Session
+from app.db.engine import create_memory_engine
+from app.modules.requests.services.calculate_risk_service import (
+    RiskLevel,
+    risk_level_for,
+)
+from app.modules.requests.services.request_aggregates import (
+    AggregateReconciler,
+    apply_change,
+    compute_aggregates,
+    reconcile,
+    reconcile_drift,
+    snapshot,
+)
+from app.shared.entities.client_profile_entity import ClientProfile
+from app.shared.entities.credit_type_enity import CreditType
+from app.shared.entities.requestEntity import Request
+from app.shared.entities.request_aggregate_entity import RequestAggregate
+from app.shared.entities.request_status_entity import RequestStatus
+
+CLIENT_ID = uuid4()
+
+
+@pytest.fixture
+def session():
+    engine = create_memory_engine()
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def _references(session):
+    pending = RequestStatus(code="PENDING", name="Pendiente", description="-")
+    approved = RequestStatus(code="APPROVED", name="Aprobada", description="-")
+    credit_type = CreditType(code="INVESTMENT", name="Inversión", description="-")
+    client = ClientProfile(
+        user_id=CLIENT_ID,
+        email="cliente@example.com",
+        date_of_birth=date(1985, 3, 1),
+        annual_income=60_000_000,
+        years_of_agricultural_experience=12,
+        has_agricultural_insurance=True,
+        internal_credit_history_score=720,
+        current_debt_to_income_ratio=0.2,
+        farm_size_hectares=15,
+    )
+    session.add_all([pending, approved, credit_type, client])
+    session.commit()
+    return pending, approved, credit_type
+
+
+def _request(status, credit_type, **overrides):
+    values = dict(
+        client_id=CLIENT_ID,
+        requested_amount=1000.0,
+        term_months=12,
+        annual_interest_rate=18.0,
+        credit_type_id=credit_type.id,
+        status_id=status.id,
+        created_at=datetime(2026, 3, 14, 9, 30),
+    )
+    values.update(overrides)
+    return Request(**values)
+
+
+def _rows(session):
+    return {
+        (r.month, r.status_id, r.credit_type_id, r.risk_level): (
+            r.request_count,
+            r.requested_amount,
+            r.approved_amount,
+        )
+        for r in session.execute(select(RequestAggregate.__table__))
+    }
+
+
+@pytest.mark.parametrize(
+    "percentage,level",
+    [
+        (0, RiskLevel.VERY_LOW),
+        (15, RiskLevel.VERY_LOW),
+        (15.1, RiskLevel.LOW),
+        (40, RiskLevel.MEDIUM),
+        (60, RiskLevel.HIGH),
+        (80, RiskLevel.VERY_HIGH),
+        (80.5, RiskLevel.CRITICAL),
+    ],
+)
+def test_risk_level_for_thresholds(percentage, level):
+    assert risk_level_for(percentage) == level
+
+
+def test_snapshot_copies_aggregate_values(session):
+    request = Request(
+        client_id=uuid4(),
+        requested_amount=500.0,
+        term_months=6,
+        annual_interest_rate=12.0,
+        credit_type_id=uuid4(),
+        status_id=uuid4(),
+        created_at=datetime(2026, 2, 28, 23, 59),
+        risk_score=33.0,
+    )
+
+    before = snapshot(request)
+    request.requested_amount = 900.0
+
+    assert before.month == date(2026, 2, 1)
+    assert before.risk_level == "MEDIO"
+    assert before.requested_amount == 500.0
+    assert before.approved_amount == 0.0
+    request.risk_score = None
+    assert snapshot(request).risk_level == "SIN_EVALUAR"
+
+
+def test_snapshot_ignores_incomplete_requests():
+    assert snapshot(MagicMock()) is None
+
+
+def test_apply_change_moves_request_between_rows(session):
+    pending, approved, credit_type = _references(session)
+    request = _request(pending, credit_type, risk_score=10.0)
+    session.add(request)
+    apply_change(session, None, snapshot(request))
+    session.commit()
+
+    before = snapshot(request)
+    request.status_id = approved.id
+    request.approved_amount = 800.0
+    apply_change(session, before, snapshot(request))
+    session.commit()
+
+    month = date(2026, 3, 1)
+    assert _rows(session) == {
+        (month, pending.id, credit_type.id, "MUY_BAJO"): (0, 0.0, 0.0),
+        (month, approved.id, credit_type.id, "MUY_BAJO"): (1, 1000.0, 800.0),
+    }
+
+
+def test_apply_change_skips_unchanged_and_unknown_dialects(session):
+    db = MagicMock()
+    item = snapshot(_request(MagicMock(id=uuid4()), MagicMock(id=uuid4())))
+
+    apply_change(db, item, item)
+    db.execute.assert_not_called()
+
+    db.get_bind.return_value.dialect.name = "mssql"
+    apply_change(db, None, item)
+    db.execute.assert_not_called()
+
+
+def test_compute_aggregates_groups_by_month_and_risk(session):
+    pending, _, credit_type = _references(session)
+    session.add_all(
+        [
+            _request(pending, credit_type, risk_score=20.0),
+            _request(pending, credit_type, risk_score=22.0, requested_amount=500.0),
+            _request(pending, credit_type, created_at=datetime(2026, 4, 1)),
+        ]
+    )
+    session.commit()
+
+    assert compute_aggregates(session) == {
+        (date(2026, 3, 1), pending.id, credit_type.id, "BAJO"): (2, 1500.0, 0.0),
+        (date(2026, 4, 1), pending.id, credit_type.id, "SIN_EVALUAR"): (
+            1,
+            1000.0,
+            0.0,
+        ),
+    }
+
+
+def test_reconcile_corrects_drift(session):
+    pending, approved, credit_type = _references(session)
+    session.add(_request(pending, credit_type))
+    month = date(2026, 3, 1)
+    # Fila desactualizada y fila sin solicitudes
+    session.add(
+        RequestAggregate(
+            month=month,
+            status_id=pending.id,
+            credit_type_id=credit_type.id,
+            risk_level="SIN_EVALUAR",
+            request_count=3,
+            requested_amount=10.0,
+        )
+    )
+    session.add(
+        RequestAggregate(
+            month=month,
+            status_id=approved.id,
+            credit_type_id=credit_type.id,
+            risk_level="ALTO",
+            request_count=1,
+            requested_amount=10.0,
+        )
+    )
+    session.commit()
+
+    assert reconcile(session) == 2
+    assert _rows(session) == {
+        (month, pending.id, credit_type.id, "SIN_EVALUAR"): (1, 1000.0, 0.0)
+    }
+    assert reconcile(session) == 0
+
+
+def test_reconciler_tick_counts_drift(session):
+    pending, _, credit_type = _references(session)
+    session.add(_request(pending, credit_type))
+    session.commit()
+    reconciler = AggregateReconciler(lambda: Session(session.get_bind()), 60)
+    initial = reconcile_drift.value()
+
+    assert reconciler.tick() == 1
+    assert reconcile_drift.value() == initial + 1
@@ -0,0 +1,78 @@
+import json
+from datetime import datetime
+from uuid import uuid4
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from app.modules.requests.dtos.crud_request_dto import (
+    PaginatedRequestListResponse,
+    RequestListResponse,
+    RequestResponse,
+)
+from app.shared.dtos.pagination_dto import PaginationMeta
+from app.shared.entities.client_profile_entity import ClientProfile  # noqa: F401
+from app.shared.entities.credit_type_enity import CreditType
+from app.shared.entities.notification_entity import Notification  # noqa: F401
+from app.shared.entities.notifications_user_entity import (  # noqa: F401
+    NotificationsUser,
+)
+from app.shared.entities.requestEntity import Request  # noqa: F401
+from app.shared.entities.request_status_entity import RequestStatus
+from app.shared.responses.json_response import FastJSONResponse, ModelResponse
+
+
+def build_response() -> RequestResponse:
+    credit_type = CreditType(name="Agrícola", code="AGRO", description="Crédito")
+    status = RequestStatus(name="Pendiente", code="PENDING", description="Estado")
+    return RequestResponse(
+        id=uuid4(),
+        client_id=uuid4(),
+        credit_type_id=credit_type.id,
+        status_id=status.id,
+        credit_type=credit_type,
+        status=status,
+        requested_amount=1000000.0,
+        term_months=12,
+        annual_interest_rate=12.5,
+        risk_score=420.0,
+        risk_assessment_details={"score_details": {"income": 50, "debt": 20}},
+        warning_flags=["Sin seguro agrícola"],
+        created_at=datetime(2025, 5, 29, 10, 0),
+        updated_at=datetime(2025, 5, 29, 10, 5, 30, 123456),
+    )
+
+
+def test_model_response_matches_jsonable_encoder_output():
+    rows = [build_response(), build_response()]
+
+    before = JSONResponse(jsonable_encoder({"data": rows})).body
+    after = ModelResponse(RequestListResponse(data=rows)).body
+
+    assert json.loads(after) == json.loads(before)
+
+
+def test_fast_json_response_matches_json_response():
+    content = jsonable_encoder({"data": [build_response()], "message": "ñandú"})
+
+    assert json.loads(FastJSONResponse(content).body) == json.loads(
+        JSONResponse(content).body
+    )
+
+
+def test_paginated_response_serializes_rows():
+    rows = [build_response()]
+    meta = PaginationMeta(
+        page=1,
+        per_page=10,
+        total_items=1,
+        total_pages=1,
+        has_previous_page=False,
+        has_next_page=False,
+    )
+
+    response = ModelResponse(PaginatedRequestListResponse(data=rows, pagination=meta))
+    body = json.loads(response.body)
+
+    assert response.media_type == "application/json"
+    assert body["data"][0]["id"] == str(rows[0].id)
+    assert body["data"][0]["updated_at"] == "2025-05-29T10:05:30.123456"
+    assert body["pagination"]["total_items"] == 1
@@ -398,4 +398,46 @@ async def test_get_paginated_list_with_invalid_sort_order(request_service):
         await request_service.get_paginated_list(sort_order="sideways")
 
     assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
-    assert "Ordenamiento por orden 'sideways' no permitido." in exc_info.value.detail
\ No newline at end of file
+    assert "Ordenamiento por orden 'sideways' no permitido." in exc_info.value.detail
+
+def test_change_status_publishes_status_changed_event(request_service, mock_db_session):
+    request_id = uuid4()
+    new_status_id = UUID("e5f6a7b8-c9d0-4903-ef12-5678901234ef")
+    db_request = MagicMock(
+        id=request_id,
+        client_id=UUID("e952b630-3226-4364-b367-db273281c5f4"),
+        credit_type_id=UUID("a1b2c3d4-e5f6-4789-abcd-1234567890ab"),
+        status_id=new_status_id,
+        requested_amount=10000.0,
+        approved_amount=0,
+        risk_score=0.25,
+        updated_at=datetime(2025, 5, 29, 10, 0),
+    )
+    mock_db_session.get.side_effect = None
+    mock_db_session.get.return_value = db_request
+    request_service.ws_publish_event = MagicMock()
+
+    with patch('app.modules.requests.services.request_service.RequestResponse'):
+        request_service.change_status(request_id, new_status_id)
+
+    request_service.ws_publish_event.assert_called_once()
+    topic, event = request_service.ws_publish_event.call_args.args
+    assert topic == "requests.status_changed"
+    assert event["request_id"] == str(request_id)
+    assert event["status_id"] == str(new_status_id)
+    assert event["updated_at"] is not None
+
+
+def test_iter_export_yields_batches(mock_db_session):
+    first = [MagicMock(), MagicMock()]
+    second = [MagicMock()]
+    mock_db_session.exec.return_value.partitions.return_value = iter([first, second])
+    service = RequestService(mock_db_session)
+
+    with patch(
+        "app.modules.requests.services.request_service.RequestResponse.model_validate",
+        side_effect=lambda req: req,
+    ):
+        batches = list(service.iter_export(batch_size=2))
+
+    assert batches == [first, second]
@@ -0,0 +1,75 @@
+import gc
+from unittest.mock import MagicMock, patch
+import pytest
+from fastapi import FastAPI
+from pydantic import BaseModel
+from app.server.warmup import DEFAULT_STEPS, after_fork, warm_up
+from app.tracing.exporters import BatchSpanProcessor, InMemorySpanExporter
+from app.tracing.tracer import tracer
+
+
+class Item(BaseModel):
+    name: str
+
+
+@pytest.fixture
+def app():
+    app = FastAPI()
+
+    @app.post("/items")
+    def create_item(item: Item) -> Item:
+        return item
+
+    return app
+
+
+@pytest.fixture
+def unfreeze():
+    yield
+    gc.unfreeze()
+
+
+def test_warm_up_builds_openapi_and_freezes_heap(app, unfreeze):
+    steps = [step for step in DEFAULT_STEPS if step[0] == "openapi"]
+
+    timings = warm_up(app, steps=steps)
+
+    assert app.openapi_schema is not None
+    assert "Item" in app.openapi_schema["components"]["schemas"]
+    assert timings["openapi"] >= 0
+    assert timings["frozen_objects"] == gc.get_freeze_count() > 0
+
+
+def test_warm_up_continues_after_a_failing_step(app):
+    ok = MagicMock()
+    steps = [("broken", MagicMock(side_effect=RuntimeError("x"))), ("ok", ok)]
+
+    timings = warm_up(app, steps=steps, freeze=False)
+
+    assert timings["broken"] is None
+    assert timings["ok"] is not None
+    ok.assert_called_once_with(app)
+    assert "frozen_objects" not in timings
+
+
+def test_default_steps_do_not_need_a_database(app, unfreeze):
+    # "jwt" lee los settings, que exigen las variables DATABASE_*
+    steps = [step for step in DEFAULT_STEPS if step[0] != "jwt"]
+
+    timings = warm_up(app, steps=steps)
+
+    assert all(value is not None for value in timings.values())
+
+
+def test_after_fork_drops_inherited_connections_and_restarts_exporter():
+    engine = MagicMock()
+    processor = BatchSpanProcessor(InMemorySpanExporter())
+    old_thread = processor._thread
+
+    with patch.object(tracer, "processor", processor):
+        after_fork(engine)
+
+    engine.dispose.assert_called_once_with(close=False)
+    assert processor._thread is not old_thread
+    assert processor._thread.is_alive()
+    processor.shutdown()
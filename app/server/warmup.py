@@ -0,0 +1,88 @@
+import gc
+import logging
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from fastapi import FastAPI
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+
+def _build_openapi(app: FastAPI) -> None:
+    # Genera (y deja en caché) el JSON schema de todos los modelos pydantic
+    app.openapi()
+
+
+def _configure_mappers() -> None:
+    from sqlalchemy.orm import configure_mappers
+
+    configure_mappers()
+
+
+def _build_template_engine() -> None:
+    from app.modules.mails.services.template_engine import get_template_engine
+
+    get_template_engine()
+
+
+def _build_jwt_service() -> None:
+    from app.shared.services.jwtService import get_jwt_service
+
+    get_jwt_service()
+
+
+def _import_mail_transport() -> None:
+    # Solo el import: el cliente SMTP se construye en cada worker al enviar
+    import fastapi_mail  # noqa: F401
+
+
+WarmUpStep = Tuple[str, Callable[[FastAPI], None]]
+
+DEFAULT_STEPS: List[WarmUpStep] = [
+    ("mappers", lambda app: _configure_mappers()),
+    ("openapi", _build_openapi),
+    ("templates", lambda app: _build_template_engine()),
+    ("jwt", lambda app: _build_jwt_service()),
+    ("mail", lambda app: _import_mail_transport()),
+]
+
+
+def warm_up(
+    app: FastAPI, steps: Optional[List[WarmUpStep]] = None, freeze: bool = True
+) -> Dict[str, Optional[float]]:
+    """
+    Construye en el master todo lo que los workers de otro modo harían por
+    separado, y luego congela el heap con gc.freeze(): los objetos quedan
+    fuera de las recolecciones y sus páginas se comparten copy-on-write
+    entre los workers. No abre conexiones a la base de datos.
+
+    Devuelve la duración en ms de cada paso (None si falló).
+    """
+    timings: Dict[str, Optional[float]] = {}
+    for name, step in steps if steps is not None else DEFAULT_STEPS:
+        start = time.perf_counter()
+        try:
+            step(app)
+            timings[name] = round((time.perf_counter() - start) * 1000, 3)
+        except Exception as e:
+            timings[name] = None
+            logger.warning("Paso de precalentamiento '%s' falló: %s", name, e)
+    if freeze:
+        gc.collect()
+        gc.freeze()
+        timings["frozen_objects"] = gc.get_freeze_count()
+    logger.info("Precalentamiento completado: %s", timings)
+    return timings
+
+
+def after_fork(engine: Optional[Engine] = None) -> None:
+    """
+    Se ejecuta en cada worker recién creado: descarta las conexiones
+    heredadas del master (sin cerrarlas, siguen siendo del master) y
+    reinicia los hilos que no sobreviven a fork.
+    """
+    if engine is not None:
+        engine.dispose(close=False)
+    from app.tracing.setup import restart_tracing_after_fork
+
+    restart_tracing_after_fork()
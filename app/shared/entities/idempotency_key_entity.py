@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from sqlmodel import Field, SQLModel
+
+IDEMPOTENCY_IN_PROGRESS = "in_progress"
+IDEMPOTENCY_COMPLETED = "completed"
+
+
+class IdempotencyKey(SQLModel, table=True):
+    __tablename__ = "idempotency_keys"
+    user_id: UUID = Field(
+        primary_key=True, description="Usuario que envió el encabezado."
+    )
+    key: str = Field(
+        primary_key=True, max_length=255, description="Valor de Idempotency-Key."
+    )
+    method: str = Field(nullable=False, max_length=10)
+    path: str = Field(nullable=False, max_length=500)
+    fingerprint: str = Field(
+        nullable=False,
+        max_length=64,
+        description="SHA-256 del método, la ruta y el cuerpo del request.",
+    )
+    status: str = Field(
+        default=IDEMPOTENCY_IN_PROGRESS,
+        nullable=False,
+        max_length=20,
+        description="in_progress mientras se ejecuta, completed con la respuesta.",
+    )
+    response_status: Optional[int] = Field(default=None)
+    response_body: Optional[bytes] = Field(default=None)
+    response_media_type: Optional[str] = Field(default=None, max_length=100)
+    created_at: datetime = Field(default_factory=datetime.now, nullable=False)
+    updated_at: datetime = Field(default_factory=datetime.now, nullable=False)
+    expires_at: datetime = Field(nullable=False, index=True)
@@ -1,8 +1,8 @@
 from datetime import datetime
 from typing import Optional
 from uuid import UUID, uuid4
-from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import Column, Field, Relationship, SQLModel
+from app.db.types import PortableJSON
 from app.shared.entities.client_profile_entity import ClientProfile
 from app.shared.entities.request_status_entity import RequestStatus
 from app.shared.entities.credit_type_enity import CreditType
@@ -73,9 +73,11 @@ class Request(RequestBase, table=True):
         description="Puntuación de riesgo del cliente (0-1000).",
     )
     risk_assessment_details: Optional[dict] = Field(
-        default=None, sa_column=Column(JSONB)
+        default=None, sa_column=Column(PortableJSON)
+    )
+    warning_flags: Optional[list[str]] = Field(
+        default=None, sa_column=Column(PortableJSON)
     )
-    warning_flags: Optional[list[str]] = Field(default=None, sa_column=Column(JSONB))
     credit_type: Optional[CreditType] = Relationship(back_populates="requests")
     client_profile: Optional[ClientProfile] = Relationship(back_populates="requests")
     purpose_description: Optional[str] = Field(default=None, max_length=1000)
@@ -0,0 +1,27 @@
+from datetime import date, datetime
+from uuid import UUID
+from sqlmodel import Field, SQLModel
+
+UNRATED_RISK_LEVEL = "SIN_EVALUAR"
+
+
+class RequestAggregate(SQLModel, table=True):
+    """
+    Conteos y montos de las solicitudes por mes de creación, estado, tipo de
+    crédito y nivel de riesgo. RequestService los mantiene en la misma
+    transacción que cada cambio; la reconciliación periódica los recalcula.
+    """
+
+    __tablename__ = "request_aggregates"
+    month: date = Field(primary_key=True, description="Primer día del mes de creación.")
+    status_id: UUID = Field(primary_key=True, foreign_key="request_statuses.id")
+    credit_type_id: UUID = Field(primary_key=True, foreign_key="credit_types.id")
+    risk_level: str = Field(
+        primary_key=True,
+        max_length=20,
+        description="Nivel de RiskLevel o SIN_EVALUAR si no hay puntaje.",
+    )
+    request_count: int = Field(default=0, nullable=False)
+    requested_amount: float = Field(default=0.0, nullable=False)
+    approved_amount: float = Field(default=0.0, nullable=False)
+    updated_at: datetime = Field(default_factory=datetime.now, nullable=False)
@@ -0,0 +1,29 @@
+import hmac
+import os
+from typing import Optional
+from app.core.env import load_env
+from fastapi import Depends, HTTPException, status
+from fastapi.security import APIKeyHeader, HTTPAuthorizationCredentials, HTTPBearer
+
+load_env()
+
+admin_token_header = APIKeyHeader(name="X-Admin-Token", auto_error=False)
+admin_bearer = HTTPBearer(auto_error=False)
+
+
+def admin_guard(
+    token: Optional[str] = Depends(admin_token_header),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(admin_bearer),
+) -> None:
+    """
+    Endpoints de operación: requieren ADMIN_TOKEN en X-Admin-Token o como
+    Bearer (p. ej. el scrape de Prometheus).
+    """
+    expected = os.getenv("ADMIN_TOKEN")
+    if token is None and credentials is not None:
+        token = credentials.credentials
+    if not expected or not token or not hmac.compare_digest(token, expected):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Acceso de administrador no autorizado",
+        )
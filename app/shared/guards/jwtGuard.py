@@ -1,16 +1,24 @@
 from uuid import UUID
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError
-from fastapi import Depends, HTTPException, status
-from app.shared.services.jwtService import JwtService
+from fastapi import Depends, HTTPException, Request, status
+from app.admission.controller import enforce_rate_limit
+from app.shared.services.jwtService import get_jwt_service
 
 security = HTTPBearer()
 
 
-def jwt_guard(credentials: HTTPAuthorizationCredentials = Depends(security)) -> UUID:
+def jwt_guard(
+    request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> UUID:
     token = credentials.credentials
+    # Memo por request: el guard puede resolverse más de una vez por ruta
+    memo = getattr(request.state, "jwt_user", None)
+    if memo is not None and memo[0] == token:
+        return memo[1]
+
     try:
-        payload = JwtService().verify_token(token)
+        payload = get_jwt_service().verify_token(token)
 
         user_id_str: str = payload.get("sub")
 
@@ -21,8 +29,15 @@ def jwt_guard(credentials: HTTPAuthorizationCredentials = Depends(security)) ->
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        return UUID(user_id_str)
+        user_id = UUID(user_id_str)
+        request.state.jwt_user = (token, user_id)
 
+    except HTTPException as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.detail,
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -41,3 +56,7 @@ def jwt_guard(credentials: HTTPAuthorizationCredentials = Depends(security)) ->
             detail=f"Error inesperado de autenticación: {e}",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+    # Fuera del try: un 429 no debe reescribirse como error de autenticación
+    enforce_rate_limit(request, user_id)
+    return user_id
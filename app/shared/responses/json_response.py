@@ -0,0 +1,39 @@
+from typing import Any
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson es opcional
+    orjson = None
+
+
+def _default(obj: Any):
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Tipo no serializable: {type(obj).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse que codifica con orjson (C) cuando está instalado"""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ModelResponse(Response):
+    """
+    Respuesta para modelos pydantic ya construidos: se serializa una sola vez
+    con el serializador de pydantic-core, sin revalidar ni pasar por
+    jsonable_encoder.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode("utf-8")
+        return super().render(content)
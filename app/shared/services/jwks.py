@@ -0,0 +1,170 @@
+import json
+import logging
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Optional, Tuple
+from jose import jwk
+from jose.backends.base import Key
+from jose.exceptions import JWKError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ALGORITHMS = {"RSA": "RS256", "EC": "ES256"}
+EC_ALGORITHMS = {"P-256": "ES256", "P-384": "ES384", "P-521": "ES512"}
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class JwksSource(ABC):
+    """Origen del JWKS. `fetch` devuelve el documento y su max-age, si lo hay"""
+
+    @abstractmethod
+    def fetch(self) -> Tuple[dict, Optional[float]]: ...
+
+
+class FileJwksSource(JwksSource):
+    def __init__(self, path: str):
+        self.path = path
+
+    def fetch(self) -> Tuple[dict, Optional[float]]:
+        with open(self.path, encoding="utf-8") as f:
+            return json.load(f), None
+
+
+class HttpJwksSource(JwksSource):
+    def __init__(self, url: str, timeout: float = 5.0):
+        self.url = url
+        self.timeout = timeout
+
+    def fetch(self) -> Tuple[dict, Optional[float]]:
+        import httpx  # solo con JWKS remoto; evita importarlo en el arranque
+
+        response = httpx.get(self.url, timeout=self.timeout)
+        response.raise_for_status()
+        match = _MAX_AGE.search(response.headers.get("cache-control", ""))
+        return response.json(), float(match.group(1)) if match else None
+
+
+def create_jwks_source(location: str) -> JwksSource:
+    if location.startswith(("http://", "https://")):
+        return HttpJwksSource(location)
+    return FileJwksSource(location.removeprefix("file://"))
+
+
+def _key_algorithm(data: dict) -> Optional[str]:
+    if data.get("alg"):
+        return data["alg"]
+    if data.get("kty") == "EC":
+        return EC_ALGORITHMS.get(data.get("crv"))
+    return DEFAULT_ALGORITHMS.get(data.get("kty"))
+
+
+class JwksKeyCache:
+    """
+    Llaves públicas del proveedor de identidad indexadas por `kid`:
+    - Las llaves se construyen una sola vez al descargar el JWKS; verificar
+      un token solo consulta el diccionario en memoria.
+    - Un hilo en segundo plano renueva el JWKS antes de que venza
+      (max-age del origen o `refresh_interval`).
+    - Un `kid` desconocido (rotación) provoca una sola descarga aunque
+      lleguen muchos requests a la vez, y como máximo una cada
+      `min_refetch_interval` segundos para no amplificar tokens falsos.
+    """
+
+    def __init__(
+        self,
+        source: JwksSource,
+        refresh_interval: float = 300,
+        min_refetch_interval: float = 30,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.source = source
+        self.refresh_interval = refresh_interval
+        self.min_refetch_interval = min_refetch_interval
+        self.clock = clock
+        self.fetches = 0
+        self._keys: Dict[str, Tuple[str, Key]] = {}
+        self._expires_at = 0.0
+        self._last_fetch: Optional[float] = None
+        self._fetch_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def get_key(self, kid: Optional[str]) -> Optional[Tuple[str, Key]]:
+        """Devuelve (algoritmo, llave) del kid; descarga el JWKS si no se conoce"""
+        entry = self._keys.get(kid)
+        if entry is not None:
+            return entry
+        self._refetch(kid)
+        return self._keys.get(kid)
+
+    def _refetch(self, kid: Optional[str]) -> None:
+        with self._fetch_lock:
+            if kid in self._keys:
+                return
+            if (
+                self._last_fetch is not None
+                and self.clock() - self._last_fetch < self.min_refetch_interval
+            ):
+                return
+            self.refresh()
+
+    def refresh(self) -> None:
+        """Descarga el JWKS y reemplaza el conjunto de llaves"""
+        self._last_fetch = self.clock()
+        try:
+            document, max_age = self.source.fetch()
+        except Exception as e:
+            logger.warning("No se pudo descargar el JWKS: %s", e)
+            # Se conservan las llaves vigentes y se reintenta más tarde
+            self._expires_at = self._last_fetch + self.min_refetch_interval
+            return
+        self.fetches += 1
+
+        keys: Dict[str, Tuple[str, Key]] = {}
+        for data in document.get("keys", []):
+            if data.get("use", "sig") != "sig":
+                continue
+            algorithm = _key_algorithm(data)
+            if algorithm is None:
+                continue
+            try:
+                keys[data.get("kid")] = (algorithm, jwk.construct(data, algorithm))
+            except JWKError as e:
+                logger.warning("Llave %s ignorada: %s", data.get("kid"), e)
+        self._keys = keys
+        ttl = max_age if max_age else self.refresh_interval
+        self._expires_at = self._last_fetch + ttl
+
+    def next_refresh_in(self) -> float:
+        """Segundos hasta la próxima renovación: al 80% de la vigencia"""
+        remaining = self._expires_at - self.clock()
+        lifetime = self._expires_at - (self._last_fetch or 0)
+        return max(1.0, remaining - 0.2 * lifetime)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self.refresh()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="jwks-refresh", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.next_refresh_in()):
+            with self._fetch_lock:
+                self.refresh()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    @property
+    def kids(self) -> set:
+        return set(self._keys)
@@ -1,30 +1,88 @@
-from dotenv import load_dotenv
+from functools import lru_cache
+from typing import List, Optional, Union
 from fastapi import HTTPException
 from jose import jwt, JWTError
-import os
-
-load_dotenv()
+from app.shared.services.jwks import JwksKeyCache, create_jwks_source
+from app.shared.services.token_cache import TokenCache
 
 
 class JwtService:
-    def __init__(self):
-        self.secret_key = os.getenv("JWT_SECRET_KEY")
-        self.algorithm = os.getenv("JWT_ALGORITHM")
-        self.audience = os.getenv("JWT_AUDIENCE")
+    """
+    Verifica tokens con secreto compartido (HS*) o, si se configura
+    `key_cache`, con las llaves públicas del JWKS del proveedor (RS*/ES*)
+    seleccionadas por el `kid` del encabezado.
+    """
+
+    def __init__(
+        self,
+        secret_key: Optional[str] = None,
+        algorithm: Union[str, List[str]] = "HS256",
+        audience: Optional[str] = None,
+        cache: Optional[TokenCache] = None,
+        key_cache: Optional[JwksKeyCache] = None,
+    ):
+        self.secret_key = secret_key
+        self.algorithms = (
+            [a.strip() for a in algorithm.split(",")]
+            if isinstance(algorithm, str)
+            else list(algorithm)
+        )
+        self.audience = audience
+        self.cache = cache if cache is not None else TokenCache()
+        self.key_cache = key_cache
+
+    def _resolve_key(self, token: str):
+        if self.key_cache is None:
+            return self.secret_key, self.algorithms
+
+        header = jwt.get_unverified_header(token)
+        entry = self.key_cache.get_key(header.get("kid"))
+        if entry is None:
+            raise JWTError("Llave de firma desconocida")
+        algorithm, key = entry
+        if algorithm not in self.algorithms or header.get("alg") != algorithm:
+            raise JWTError("Algoritmo de firma no permitido")
+        return key, [algorithm]
 
     def verify_token(self, token: str):
+        cached = self.cache.get(token)
+        if cached is not None:
+            return cached
         try:
+            key, algorithms = self._resolve_key(token)
             payload = jwt.decode(
                 token,
-                self.secret_key,
-                algorithms=[self.algorithm],
+                key,
+                algorithms=algorithms,
                 audience=self.audience,
             )
-
-            return payload
         except JWTError:
             raise HTTPException(status_code=401, detail="Token inválido o expirado")
         except Exception:
             raise HTTPException(
                 status_code=500, detail="Error interno al verificar token"
             )
+
+        self.cache.put(token, payload)
+        return payload
+
+
+@lru_cache
+def get_jwt_service() -> JwtService:
+    """Instancia única por proceso, construida desde Settings"""
+    from app.core.config import get_settings
+
+    settings = get_settings()
+    key_cache = None
+    if settings.JWT_JWKS_URL:
+        key_cache = JwksKeyCache(
+            create_jwks_source(settings.JWT_JWKS_URL),
+            refresh_interval=settings.JWT_JWKS_REFRESH_INTERVAL,
+        )
+    return JwtService(
+        settings.JWT_SECRET_KEY,
+        algorithm=settings.JWT_ALGORITHM,
+        audience=settings.JWT_AUDIENCE,
+        cache=TokenCache(max_size=settings.JWT_CACHE_SIZE, ttl=settings.JWT_CACHE_TTL),
+        key_cache=key_cache,
+    )
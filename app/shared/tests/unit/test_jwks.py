@@ -0,0 +1,200 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+from uuid import uuid4
+import pytest
+import rsa
+from ecdsa import NIST256p, SigningKey
+from fastapi import HTTPException
+from jose import jwk, jwt
+from app.shared.services.jwks import FileJwksSource, HttpJwksSource, JwksKeyCache
+from app.shared.services.jwtService import JwtService
+
+AUDIENCE = "authenticated"
+
+
+def rsa_keypair(kid: str):
+    public, private = rsa.newkeys(1024)
+    public_jwk = jwk.construct(public.save_pkcs1().decode(), "RS256").to_dict()
+    return private.save_pkcs1().decode(), {**public_jwk, "kid": kid, "use": "sig"}
+
+
+def ec_keypair(kid: str):
+    private = SigningKey.generate(curve=NIST256p)
+    public_pem = private.get_verifying_key().to_pem().decode()
+    public_jwk = jwk.construct(public_pem, "ES256").to_dict()
+    return private.to_pem().decode(), {**public_jwk, "kid": kid}
+
+
+@pytest.fixture(scope="module")
+def rsa_key():
+    return rsa_keypair("rsa-1")
+
+
+def sign(private_pem: str, kid: str, algorithm: str = "RS256", sub=None) -> str:
+    claims = {
+        "sub": sub or str(uuid4()),
+        "aud": AUDIENCE,
+        "exp": int(time.time()) + 3600,
+    }
+    return jwt.encode(claims, private_pem, algorithm=algorithm, headers={"kid": kid})
+
+
+class StaticSource:
+    def __init__(self, *keys):
+        self.document = {"keys": list(keys)}
+        self.fetch = MagicMock(side_effect=lambda: (self.document, None))
+
+
+def service_for(cache: JwksKeyCache) -> JwtService:
+    return JwtService(algorithm="RS256,ES256", audience=AUDIENCE, key_cache=cache)
+
+
+def test_verify_rs256_token_with_file_source(tmp_path, rsa_key):
+    private, public = rsa_key
+    path = tmp_path / "jwks.json"
+    path.write_text(json.dumps({"keys": [public]}))
+    cache = JwksKeyCache(FileJwksSource(str(path)))
+    cache.refresh()
+    sub = str(uuid4())
+
+    payload = service_for(cache).verify_token(sign(private, "rsa-1", sub=sub))
+
+    assert payload["sub"] == sub
+
+
+def test_verify_es256_token():
+    private, public = ec_keypair("ec-1")
+    cache = JwksKeyCache(StaticSource(public))
+    cache.refresh()
+
+    payload = service_for(cache).verify_token(sign(private, "ec-1", "ES256"))
+
+    assert payload["aud"] == AUDIENCE
+
+
+def test_known_kid_does_not_fetch(rsa_key):
+    private, public = rsa_key
+    source = StaticSource(public)
+    cache = JwksKeyCache(source)
+    cache.refresh()
+    service = service_for(cache)
+
+    for _ in range(3):
+        service.verify_token(sign(private, "rsa-1"))
+
+    assert source.fetch.call_count == 1
+
+
+def test_unknown_kid_triggers_single_refetch(rsa_key):
+    private, public = rsa_key
+    source = StaticSource()
+    cache = JwksKeyCache(source, min_refetch_interval=0)
+    cache.refresh()
+    source.document = {"keys": [public]}
+    barrier = threading.Barrier(8)
+
+    def lookup():
+        barrier.wait()
+        cache.get_key("rsa-1")
+
+    threads = [threading.Thread(target=lookup) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert source.fetch.call_count == 2
+    assert cache.kids == {"rsa-1"}
+
+
+def test_unknown_kid_refetch_is_rate_limited():
+    now = [100.0]
+    source = StaticSource()
+    cache = JwksKeyCache(source, min_refetch_interval=30, clock=lambda: now[0])
+    cache.refresh()
+
+    assert cache.get_key("missing") is None
+    now[0] = 150.0
+    assert cache.get_key("missing") is None
+    assert cache.get_key("missing") is None
+
+    assert source.fetch.call_count == 2
+
+
+def test_unknown_kid_is_rejected_with_401(rsa_key):
+    private, _ = rsa_key
+    cache = JwksKeyCache(StaticSource())
+    cache.refresh()
+
+    with pytest.raises(HTTPException) as exc:
+        service_for(cache).verify_token(sign(private, "other"))
+
+    assert exc.value.status_code == 401
+
+
+def test_hs256_token_is_rejected_in_jwks_mode(rsa_key):
+    _, public = rsa_key
+    cache = JwksKeyCache(StaticSource(public))
+    cache.refresh()
+    token = jwt.encode(
+        {"sub": "x", "aud": AUDIENCE}, "secret", headers={"kid": "rsa-1"}
+    )
+
+    with pytest.raises(HTTPException) as exc:
+        service_for(cache).verify_token(token)
+
+    assert exc.value.status_code == 401
+
+
+def test_failed_refresh_keeps_current_keys(rsa_key):
+    _, public = rsa_key
+    source = StaticSource(public)
+    cache = JwksKeyCache(source)
+    cache.refresh()
+    source.fetch.side_effect = OSError("boom")
+
+    cache.refresh()
+
+    assert cache.kids == {"rsa-1"}
+
+
+def test_next_refresh_happens_before_expiry():
+    now = [0.0]
+    source = StaticSource()
+    source.fetch.side_effect = lambda: (source.document, 100.0)
+    cache = JwksKeyCache(source, clock=lambda: now[0])
+
+    cache.refresh()
+
+    assert cache.next_refresh_in() == pytest.approx(80.0)
+
+
+def test_http_source_reads_max_age(rsa_key):
+    _, public = rsa_key
+    body = json.dumps({"keys": [public]}).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Cache-Control", "public, max-age=600")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/.well-known/jwks.json"
+        document, max_age = HttpJwksSource(url).fetch()
+    finally:
+        server.shutdown()
+
+    assert document["keys"][0]["kid"] == "rsa-1"
+    assert max_age == 600.0
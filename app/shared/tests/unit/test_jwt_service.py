@@ -0,0 +1,110 @@
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwt
+from app.shared.guards.jwtGuard import jwt_guard
+from app.shared.services.jwtService import JwtService
+from app.shared.services.token_cache import TokenCache
+
+SECRET = "test-secret"
+AUDIENCE = "authenticated"
+
+
+def make_token(sub: str, exp_in: int = 3600) -> str:
+    return jwt.encode(
+        {"sub": sub, "aud": AUDIENCE, "exp": int(time.time()) + exp_in},
+        SECRET,
+        algorithm="HS256",
+    )
+
+
+def make_request():
+    return SimpleNamespace(state=SimpleNamespace())
+
+
+def credentials(token: str) -> HTTPAuthorizationCredentials:
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+@pytest.fixture
+def service():
+    return JwtService(SECRET, algorithm="HS256", audience=AUDIENCE)
+
+
+def test_verify_token_caches_payload(service):
+    token = make_token(str(uuid4()))
+
+    with patch("app.shared.services.jwtService.jwt.decode", wraps=jwt.decode) as d:
+        first = service.verify_token(token)
+        second = service.verify_token(token)
+
+    assert first == second
+    assert d.call_count == 1
+    assert service.cache.hits == 1
+
+
+def test_verify_token_invalid_raises_401_and_is_not_cached(service):
+    with pytest.raises(HTTPException) as exc:
+        service.verify_token("not-a-token")
+
+    assert exc.value.status_code == 401
+    assert len(service.cache) == 0
+
+
+def test_cache_honors_token_exp():
+    now = [1000.0]
+    cache = TokenCache(ttl=300, clock=lambda: now[0])
+
+    cache.put("token", {"sub": "x", "exp": 1010})
+    assert cache.get("token") is not None
+
+    now[0] = 1010.0
+    assert cache.get("token") is None
+    assert len(cache) == 0
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TokenCache(max_size=2)
+    cache.put("a", {"sub": "a"})
+    cache.put("b", {"sub": "b"})
+    cache.get("a")
+
+    cache.put("c", {"sub": "c"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_cache_skips_already_expired_tokens():
+    cache = TokenCache(clock=lambda: 2000.0)
+
+    cache.put("token", {"sub": "x", "exp": 1999})
+
+    assert len(cache) == 0
+
+
+def test_jwt_guard_memoizes_per_request(service):
+    user_id = uuid4()
+    token = make_token(str(user_id))
+    request = make_request()
+    service.verify_token = MagicMock(wraps=service.verify_token)
+
+    with patch("app.shared.guards.jwtGuard.get_jwt_service", return_value=service):
+        assert jwt_guard(request, credentials(token)) == user_id
+        assert jwt_guard(request, credentials(token)) == user_id
+
+    service.verify_token.assert_called_once_with(token)
+
+
+def test_jwt_guard_invalid_token_returns_401(service):
+    with patch("app.shared.guards.jwtGuard.get_jwt_service", return_value=service):
+        with pytest.raises(HTTPException) as exc:
+            jwt_guard(make_request(), credentials("not-a-token"))
+
+    assert exc.value.status_code == 401
+    assert exc.value.headers == {"WWW-Authenticate": "Bearer"}
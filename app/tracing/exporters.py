@@ -0,0 +1,159 @@
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from abc import ABC, abstractmethod
+from typing import List, Optional, Sequence
+from app.tracing.tracer import Span
+
+logger = logging.getLogger(__name__)
+
+
+class SpanExporter(ABC):
+    @abstractmethod
+    def export(self, spans: Sequence[Span]) -> None: ...
+
+    def shutdown(self) -> None:
+        pass
+
+
+class ConsoleSpanExporter(SpanExporter):
+    """Una línea JSON por span en stdout; para desarrollo"""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+
+    def export(self, spans: Sequence[Span]) -> None:
+        for span in spans:
+            self.stream.write(json.dumps(span.as_dict(), default=str) + "\n")
+        self.stream.flush()
+
+
+class FileSpanExporter(SpanExporter):
+    """Agrega los spans como JSON lines a un archivo local"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[Span]) -> None:
+        lines = "".join(json.dumps(s.as_dict(), default=str) + "\n" for s in spans)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+
+class InMemorySpanExporter(SpanExporter):
+    def __init__(self):
+        self.spans: List[Span] = []
+
+    def export(self, spans: Sequence[Span]) -> None:
+        self.spans.extend(spans)
+
+
+def create_exporter(name: str) -> Optional[SpanExporter]:
+    if name == "console":
+        return ConsoleSpanExporter()
+    if name == "file":
+        return FileSpanExporter(os.getenv("TRACING_FILE", "traces.jsonl"))
+    if name in ("", "none"):
+        return None
+    raise ValueError(f"Exportador de trazas desconocido: {name}")
+
+
+class SimpleSpanProcessor:
+    """Exporta cada span al terminar, en el mismo hilo (pruebas)"""
+
+    def __init__(self, exporter: SpanExporter):
+        self.exporter = exporter
+
+    def on_end(self, span: Span) -> None:
+        self.exporter.export([span])
+
+    def shutdown(self) -> None:
+        self.exporter.shutdown()
+
+
+class BatchSpanProcessor:
+    """
+    Encola los spans y los exporta en lotes desde un hilo aparte, para que
+    el request no espere al exportador. Si la cola se llena, los spans se
+    descartan y se cuentan en `dropped`.
+    """
+
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        max_queue: int = 2048,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+    ):
+        self.exporter = exporter
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.max_queue = max_queue
+        self._start()
+
+    def _start(self) -> None:
+        self._queue: "queue.Queue[Optional[Span]]" = queue.Queue(self.max_queue)
+        self._thread = threading.Thread(
+            target=self._run, name="span-exporter", daemon=True
+        )
+        self._thread.start()
+
+    def after_fork(self) -> None:
+        """
+        Los hilos no sobreviven a fork: un worker creado desde un master con
+        la app precargada necesita su propio hilo exportador.
+        """
+        self._start()
+
+    def on_end(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            batch: List[Span] = []
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+                if item is None:
+                    self._drain(batch)
+                    return
+                batch.append(item)
+                while len(batch) < self.batch_size:
+                    item = self._queue.get_nowait()
+                    if item is None:
+                        self._drain(batch)
+                        return
+                    batch.append(item)
+            except queue.Empty:
+                pass
+            self._export(batch)
+
+    def _drain(self, batch: List[Span]) -> None:
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                batch.append(item)
+        self._export(batch)
+
+    def _export(self, batch: List[Span]) -> None:
+        if not batch:
+            return
+        try:
+            self.exporter.export(batch)
+        except Exception as e:
+            logger.warning("No se pudieron exportar %d spans: %s", len(batch), e)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self.exporter.shutdown()
@@ -0,0 +1,48 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.tracing.tracer import Tracer, tracer as default_tracer
+
+TRACEPARENT_HEADER = "traceparent"
+
+
+class TracingMiddleware:
+    """
+    Span raíz por request HTTP. Continúa la traza del encabezado
+    `traceparent` entrante y devuelve el del span en la respuesta, de modo
+    que el cliente pueda correlacionar su traza con la del servidor.
+    """
+
+    def __init__(self, app: ASGIApp, tracer: Tracer = default_tracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not self.tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope.get("method", "")
+        traceparent = Headers(scope=scope).get(TRACEPARENT_HEADER)
+        with self.tracer.start_trace(
+            f"HTTP {method}", traceparent, **{"http.method": method}
+        ) as span:
+            if span is None:
+                await self.app(scope, receive, send)
+                return
+
+            async def send_wrapper(message: Message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.status = "error"
+                    headers = MutableHeaders(scope=message)
+                    headers[TRACEPARENT_HEADER] = span.traceparent
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route is not None:
+                    span.name = f"{method} {route}"
+                    span.set_attribute("http.route", route)
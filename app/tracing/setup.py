@@ -0,0 +1,31 @@
+from fastapi import FastAPI
+from sqlalchemy.engine import Engine
+from app.tracing.middleware import TracingMiddleware
+from app.tracing.sql import instrument_engine
+from app.tracing.tracer import configure_tracer, tracer
+
+
+def setup_tracing(app: FastAPI, engine: Engine) -> bool:
+    """
+    Configura el tracer desde TRACING_*; con TRACING_SAMPLE_RATE en 0 (por
+    defecto) no se instala nada.
+    """
+    tracer = configure_tracer()
+    if not tracer.enabled:
+        return False
+    app.add_middleware(TracingMiddleware, tracer=tracer)
+    instrument_engine(engine, tracer)
+    return True
+
+
+def shutdown_tracing() -> None:
+    """Exporta los spans pendientes antes de terminar el proceso"""
+    processor = tracer.processor
+    if processor is not None and hasattr(processor, "shutdown"):
+        processor.shutdown()
+
+
+def restart_tracing_after_fork() -> None:
+    processor = tracer.processor
+    if processor is not None and hasattr(processor, "after_fork"):
+        processor.after_fork()
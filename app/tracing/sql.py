@@ -0,0 +1,41 @@
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.metrics.sql import statement_operation
+from app.tracing.tracer import Tracer, tracer as default_tracer
+
+MAX_STATEMENT_LENGTH = 1000
+
+
+def instrument_engine(engine: Engine, tracer: Tracer = default_tracer) -> None:
+    """Un span por sentencia SQL, hijo del span activo (si lo hay)"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        span = tracer.start_span(
+            f"SQL {statement_operation(statement)}",
+            **{
+                "db.system": engine.dialect.name,
+                "db.statement": statement[:MAX_STATEMENT_LENGTH],
+            },
+        )
+        conn.info.setdefault("tracing_spans", []).append(span)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        spans = conn.info.get("tracing_spans")
+        if not spans:
+            return
+        span = spans.pop()
+        if span is not None:
+            tracer.end(span)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        conn = context.connection
+        spans = conn.info.get("tracing_spans") if conn is not None else None
+        if not spans:
+            return
+        span = spans.pop()
+        if span is not None:
+            span.record_error(context.original_exception)
+            tracer.end(span)
@@ -0,0 +1,232 @@
+import json
+import threading
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from app.modules.mails.services.mail_service import MailService
+from app.tracing import tracer as tracer_module
+from app.tracing.exporters import (
+    BatchSpanProcessor,
+    FileSpanExporter,
+    InMemorySpanExporter,
+    SimpleSpanProcessor,
+    create_exporter,
+)
+from app.tracing.middleware import TracingMiddleware
+from app.tracing.sql import instrument_engine
+from app.tracing.tracer import parse_traceparent, traced, tracer
+from app.ws import websocket_manager
+
+INCOMING = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+
+@pytest.fixture
+def exporter():
+    """Activa el tracer global con muestreo total y lo restaura al final"""
+    exporter = InMemorySpanExporter()
+    previous = (tracer.processor, tracer.sample_rate)
+    tracer.processor, tracer.sample_rate = SimpleSpanProcessor(exporter), 1.0
+    yield exporter
+    tracer.processor, tracer.sample_rate = previous
+
+
+def _names(exporter):
+    return [span.name for span in exporter.spans]
+
+
+def test_parse_traceparent():
+    assert parse_traceparent(INCOMING) == (
+        "4bf92f3577b34da6a3ce929d0e0e4736",
+        "00f067aa0ba902b7",
+        True,
+    )
+    assert parse_traceparent(INCOMING[:-2] + "00")[2] is False
+    assert parse_traceparent("00-" + "0" * 32 + "-00f067aa0ba902b7-01") is None
+    assert parse_traceparent("garbage") is None
+    assert parse_traceparent(None) is None
+
+
+def test_spans_are_not_created_outside_a_trace(exporter):
+    with tracer.span("orphan") as span:
+        assert span is None
+    assert exporter.spans == []
+
+
+def test_disabled_tracer_does_not_sample():
+    assert tracer_module.Tracer().should_sample() is False
+    assert tracer_module.Tracer(MagicMock(), 0.0).should_sample(True) is False
+
+
+def test_child_spans_share_trace_and_link_parent(exporter):
+    with tracer.start_trace("root", INCOMING) as root:
+        with tracer.span("child", key="value") as child:
+            pass
+
+    assert root.trace_id == "4bf92f3577b34da6a3ce929d0e0e4736"
+    assert root.parent_id == "00f067aa0ba902b7"
+    assert child.trace_id == root.trace_id
+    assert child.parent_id == root.span_id
+    assert child.attributes == {"key": "value"}
+    assert _names(exporter) == ["child", "root"]
+
+
+def test_unsampled_parent_is_respected(exporter):
+    with tracer.start_trace("root", INCOMING[:-2] + "00") as root:
+        assert root is None
+    assert exporter.spans == []
+
+
+def test_errors_are_recorded_and_reraised(exporter):
+    with pytest.raises(ValueError):
+        with tracer.start_trace("root"):
+            raise ValueError("boom")
+
+    assert exporter.spans[0].status == "error"
+    assert exporter.spans[0].error == "ValueError: boom"
+
+
+@pytest.mark.asyncio
+async def test_traced_decorator_supports_sync_and_async(exporter):
+    @traced("sync_op")
+    def sync_op():
+        return 1
+
+    @traced()
+    async def async_op():
+        return sync_op() + 1
+
+    assert await async_op() == 2
+    with tracer.start_trace("root"):
+        assert await async_op() == 2
+
+    assert _names(exporter) == ["sync_op", f"{async_op.__qualname__}", "root"]
+
+
+def test_middleware_continues_incoming_trace_and_names_by_route(exporter):
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    def get_item(item_id: int):
+        with tracer.span("work"):
+            return {"id": item_id}
+
+    app.add_middleware(TracingMiddleware, tracer=tracer)
+    response = TestClient(app).get("/items/7", headers={"traceparent": INCOMING})
+
+    root = exporter.spans[-1]
+    assert response.status_code == 200
+    assert root.name == "GET /items/{item_id}"
+    assert root.trace_id == "4bf92f3577b34da6a3ce929d0e0e4736"
+    assert root.attributes["http.status_code"] == 200
+    assert response.headers["traceparent"] == root.traceparent
+    assert exporter.spans[0].parent_id == root.span_id
+
+
+def test_middleware_is_a_no_op_when_disabled():
+    app = FastAPI()
+    app.get("/")(lambda: "ok")
+    app.add_middleware(TracingMiddleware, tracer=tracer_module.Tracer())
+
+    response = TestClient(app).get("/")
+
+    assert "traceparent" not in response.headers
+
+
+def test_sql_statements_become_child_spans(exporter):
+    engine = create_engine("sqlite://")
+    instrument_engine(engine, tracer)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        with tracer.start_trace("root") as root:
+            conn.execute(text("SELECT 2"))
+
+    sql = [s for s in exporter.spans if s.name.startswith("SQL")]
+    assert len(sql) == 1
+    assert sql[0].name == "SQL SELECT"
+    assert sql[0].parent_id == root.span_id
+    assert sql[0].attributes["db.statement"] == "SELECT 2"
+
+
+@pytest.mark.asyncio
+async def test_mail_send_is_traced(exporter):
+    service = MailService(MagicMock(send_message=AsyncMock()))
+
+    with tracer.start_trace("root"):
+        await service.send_email(MagicMock(subject="Hola"))
+
+    assert exporter.spans[0].name == "MailService.send_email"
+    assert exporter.spans[0].attributes["mail.subject"] == "Hola"
+
+
+@pytest.mark.asyncio
+async def test_broadcast_envelope_propagates_trace(exporter, monkeypatch):
+    published = []
+    backend = MagicMock(publish=AsyncMock(side_effect=published.append))
+    monkeypatch.setattr(websocket_manager, "broadcast_backend", backend)
+    deliver = AsyncMock()
+    monkeypatch.setattr(websocket_manager, "deliver_local", deliver)
+
+    with tracer.start_trace("root") as root:
+        await websocket_manager.send_notification("u1", {"text": "hola"})
+    await websocket_manager._on_broadcast(published[0])
+
+    send_span = next(s for s in exporter.spans if s.name == "ws.send_notification")
+    deliver_span = next(s for s in exporter.spans if s.name == "ws.deliver")
+    assert published[0]["traceparent"] == send_span.traceparent
+    assert deliver_span.trace_id == root.trace_id
+    assert deliver_span.parent_id == send_span.span_id
+    deliver.assert_awaited_once_with("u1", {"text": "hola"})
+
+
+def test_batch_processor_exports_in_background_and_flushes_on_shutdown():
+    exported = threading.Event()
+    exporter = InMemorySpanExporter()
+    exporter.export = MagicMock(side_effect=lambda spans: exported.set())
+    processor = BatchSpanProcessor(exporter, flush_interval=0.01)
+    span = tracer_module.Span("s", "a" * 32, "b" * 16)
+
+    processor.on_end(span)
+
+    assert exported.wait(2)
+    processor.shutdown()
+    exporter.export.assert_called_once_with([span])
+
+
+def test_batch_processor_drops_when_queue_is_full():
+    exporting, release = threading.Event(), threading.Event()
+    exporter = MagicMock()
+    exporter.export.side_effect = lambda spans: (exporting.set(), release.wait(2))
+    processor = BatchSpanProcessor(exporter, max_queue=1, flush_interval=0.01)
+    span = tracer_module.Span("s", "a" * 32, "b" * 16)
+
+    processor.on_end(span)
+    assert exporting.wait(2)  # el hilo está ocupado exportando
+    processor.on_end(span)
+    processor.on_end(span)
+
+    assert processor.dropped == 1
+    release.set()
+    processor.shutdown()
+
+
+def test_file_exporter_writes_json_lines(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    span = tracer_module.Span("s", "a" * 32, "b" * 16, end_ns=2_000_000)
+    span.start_ns = 0
+
+    FileSpanExporter(str(path)).export([span, span])
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0])["duration_ms"] == 2.0
+
+
+def test_create_exporter(monkeypatch, tmp_path):
+    monkeypatch.setenv("TRACING_FILE", str(tmp_path / "t.jsonl"))
+    assert create_exporter("none") is None
+    assert isinstance(create_exporter("file"), FileSpanExporter)
+    with pytest.raises(ValueError):
+        create_exporter("zipkin")
@@ -0,0 +1,219 @@
+import asyncio
+import functools
+import os
+import random
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, Optional
+from app.core.env import load_env
+
+load_env()
+
+TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+FLAG_SAMPLED = 0x01
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: Optional[int] = None
+    attributes: Dict[str, object] = field(default_factory=dict)
+    status: str = "ok"
+    error: Optional[str] = None
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    def record_error(self, exc: BaseException) -> None:
+        self.status = "error"
+        self.error = f"{type(exc).__name__}: {exc}"
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1_000_000
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{FLAG_SAMPLED:02x}"
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+def _random_id(bytes_: int) -> str:
+    return f"{random.getrandbits(bytes_ * 8):0{bytes_ * 2}x}"
+
+
+def parse_traceparent(value: Optional[str]):
+    """(trace_id, parent_id, sampled) de un encabezado W3C traceparent"""
+    if not value:
+        return None
+    match = TRACEPARENT_RE.match(value.strip().lower())
+    if match is None:
+        return None
+    trace_id, parent_id, flags = match.groups()
+    if trace_id == "0" * 32 or parent_id == "0" * 16:
+        return None
+    return trace_id, parent_id, bool(int(flags, 16) & FLAG_SAMPLED)
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def current_traceparent() -> Optional[str]:
+    span = _current_span.get()
+    return span.traceparent if span is not None else None
+
+
+class Tracer:
+    """
+    Trazas livianas compatibles con W3C trace-context:
+    - La decisión de muestreo se toma en la raíz (o se hereda de
+      traceparent) y solo las trazas muestreadas crean spans.
+    - Fuera de una traza muestreada, `span()` y `traced` cuestan una lectura
+      de contextvar.
+    - Los spans terminados se entregan al `processor`.
+    """
+
+    def __init__(self, processor=None, sample_rate: float = 0.0):
+        self.processor = processor
+        self.sample_rate = sample_rate
+
+    @property
+    def enabled(self) -> bool:
+        return self.processor is not None and self.sample_rate > 0
+
+    def should_sample(self, parent_sampled: Optional[bool] = None) -> bool:
+        if not self.enabled:
+            return False
+        if parent_sampled is not None:
+            return parent_sampled
+        return random.random() < self.sample_rate
+
+    @contextmanager
+    def start_trace(
+        self, name: str, traceparent: Optional[str] = None, **attributes
+    ) -> Iterator[Optional[Span]]:
+        """Span raíz: continúa la traza entrante o inicia una nueva"""
+        parent = parse_traceparent(traceparent)
+        if not self.should_sample(parent[2] if parent else None):
+            yield None
+            return
+        trace_id, parent_id = (
+            (parent[0], parent[1]) if parent else (_random_id(16), None)
+        )
+        span = Span(name, trace_id, _random_id(8), parent_id, attributes=attributes)
+        with self._activate(span):
+            yield span
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Optional[Span]]:
+        """Span hijo del actual; no hace nada fuera de una traza muestreada"""
+        parent = _current_span.get()
+        if parent is None:
+            yield None
+            return
+        span = Span(
+            name, parent.trace_id, _random_id(8), parent.span_id, attributes=attributes
+        )
+        with self._activate(span):
+            yield span
+
+    @contextmanager
+    def _activate(self, span: Span):
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end(span)
+
+    def start_span(self, name: str, **attributes) -> Optional[Span]:
+        """Span hijo sin activarlo; para callbacks (eventos SQL) que lo cierran con end"""
+        parent = _current_span.get()
+        if parent is None:
+            return None
+        return Span(
+            name, parent.trace_id, _random_id(8), parent.span_id, attributes=attributes
+        )
+
+    def end(self, span: Span) -> None:
+        span.end_ns = time.time_ns()
+        if self.processor is not None:
+            self.processor.on_end(span)
+
+
+def traced(name: Optional[str] = None):
+    """Decorador: ejecuta la función dentro de un span hijo"""
+
+    def decorator(func: Callable):
+        span_name = name or func.__qualname__
+
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if _current_span.get() is None:
+                    return await func(*args, **kwargs)
+                with tracer.span(span_name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return func(*args, **kwargs)
+            with tracer.span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _create_processor():
+    from app.tracing.exporters import BatchSpanProcessor, create_exporter
+
+    exporter = create_exporter(os.getenv("TRACING_EXPORTER", "console"))
+    return BatchSpanProcessor(exporter) if exporter is not None else None
+
+
+def configure_tracer(processor=None, sample_rate: Optional[float] = None) -> Tracer:
+    """Configura el tracer global; sin argumentos lee TRACING_* del entorno"""
+    if sample_rate is None:
+        sample_rate = float(os.getenv("TRACING_SAMPLE_RATE", "0"))
+    if processor is None and sample_rate > 0:
+        processor = _create_processor()
+    tracer.processor = processor
+    tracer.sample_rate = sample_rate
+    return tracer
+
+
+tracer = Tracer()
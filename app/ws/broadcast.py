@@ -0,0 +1,202 @@
+import asyncio
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from threading import Lock
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+BroadcastHandler = Callable[[dict], Awaitable[None]]
+
+# Límite de payload de NOTIFY en PostgreSQL (8000 bytes por defecto).
+PG_NOTIFY_MAX_PAYLOAD = 7999
+
+
+class BroadcastBackend(ABC):
+    """
+    Canal de difusión entre workers:
+    - Cada worker se suscribe una única vez con start().
+    - publish() entrega el mensaje a todos los workers suscritos,
+      incluido el que publica.
+    """
+
+    @abstractmethod
+    async def start(self, handler: BroadcastHandler) -> None: ...
+
+    @abstractmethod
+    async def stop(self) -> None: ...
+
+    @abstractmethod
+    async def publish(self, message: dict) -> None: ...
+
+
+class InMemoryBroadcast(BroadcastBackend):
+    """Backend para ejecuciones de un solo proceso: entrega directa al handler"""
+
+    def __init__(self):
+        self._handler: Optional[BroadcastHandler] = None
+
+    async def start(self, handler: BroadcastHandler) -> None:
+        self._handler = handler
+
+    async def stop(self) -> None:
+        self._handler = None
+
+    async def publish(self, message: dict) -> None:
+        if self._handler is not None:
+            await self._handler(message)
+
+
+class PostgresBroadcast(BroadcastBackend):
+    """
+    Backend basado en LISTEN/NOTIFY de PostgreSQL:
+    - Una conexión dedicada por worker escucha el canal y se integra al
+      event loop con add_reader, sin hilos ni polling.
+    - Las publicaciones usan pg_notify en una conexión aparte, ejecutada
+      fuera del event loop.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        channel: str = "ws_notifications",
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+    ):
+        self.dsn = dsn
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._handler: Optional[BroadcastHandler] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._listen_conn = None
+        self._publish_conn = None
+        self._publish_lock = Lock()
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._stopped = False
+
+    def _connect(self):
+        import psycopg2
+        from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+        conn = psycopg2.connect(self.dsn)
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        return conn
+
+    async def start(self, handler: BroadcastHandler) -> None:
+        self._handler = handler
+        self._loop = asyncio.get_running_loop()
+        self._stopped = False
+        await self._listen()
+
+    async def _listen(self) -> None:
+        conn = await asyncio.to_thread(self._connect)
+        with conn.cursor() as cursor:
+            cursor.execute(f'LISTEN "{self.channel}"')
+        self._listen_conn = conn
+        self._loop.add_reader(conn.fileno(), self._on_readable)
+
+    def _on_readable(self) -> None:
+        conn = self._listen_conn
+        try:
+            conn.poll()
+        except Exception as e:
+            logger.warning("Conexión LISTEN perdida: %s", e)
+            self._drop_listener()
+            self._schedule_reconnect()
+            return
+
+        while conn.notifies:
+            notify = conn.notifies.pop(0)
+            try:
+                message = json.loads(notify.payload)
+            except ValueError:
+                logger.warning("Payload de NOTIFY inválido descartado")
+                continue
+            self._loop.create_task(self._handler(message))
+
+    def _drop_listener(self) -> None:
+        if self._listen_conn is None:
+            return
+        try:
+            self._loop.remove_reader(self._listen_conn.fileno())
+        except Exception:
+            pass
+        try:
+            self._listen_conn.close()
+        except Exception:
+            pass
+        self._listen_conn = None
+
+    def _schedule_reconnect(self) -> None:
+        if self._stopped or (self._reconnect_task and not self._reconnect_task.done()):
+            return
+        self._reconnect_task = self._loop.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        delay = self.reconnect_delay
+        while not self._stopped:
+            await asyncio.sleep(delay)
+            try:
+                await self._listen()
+                logger.info("Conexión LISTEN restablecida en '%s'", self.channel)
+                return
+            except Exception as e:
+                logger.warning("Reintento de LISTEN fallido: %s", e)
+                delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def stop(self) -> None:
+        self._stopped = True
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+        self._drop_listener()
+        with self._publish_lock:
+            if self._publish_conn is not None:
+                self._publish_conn.close()
+                self._publish_conn = None
+
+    def _notify(self, payload: str) -> None:
+        with self._publish_lock:
+            for attempt in range(2):
+                if self._publish_conn is None or self._publish_conn.closed:
+                    self._publish_conn = self._connect()
+                try:
+                    with self._publish_conn.cursor() as cursor:
+                        cursor.execute(
+                            "SELECT pg_notify(%s, %s)", (self.channel, payload)
+                        )
+                    return
+                except Exception:
+                    self._publish_conn = None
+                    if attempt:
+                        raise
+
+    async def publish(self, message: dict) -> None:
+        payload = json.dumps(message, default=str)
+        if len(payload.encode()) > PG_NOTIFY_MAX_PAYLOAD:
+            logger.warning(
+                "Mensaje excede el límite de NOTIFY; se entrega solo en este worker"
+            )
+            await self._handler(message)
+            return
+        await asyncio.to_thread(self._notify, payload)
+
+
+def _postgres_dsn(database_url: str) -> str:
+    """Convierte una URL de SQLAlchemy (postgresql+driver://) a un DSN de libpq"""
+    scheme, _, rest = database_url.partition("://")
+    return f"{scheme.split('+')[0]}://{rest}"
+
+
+def create_broadcast_backend(name: Optional[str] = None) -> BroadcastBackend:
+    name = (name or os.getenv("WS_BROADCAST_BACKEND", "postgres")).lower()
+    if name == "memory":
+        return InMemoryBroadcast()
+    if name == "postgres":
+        return PostgresBroadcast(
+            dsn=_postgres_dsn(os.getenv("DATABASE_URL", "")),
+            channel=os.getenv("WS_BROADCAST_CHANNEL", "ws_notifications"),
+        )
+    raise ValueError(f"Backend de difusión '{name}' no soportado.")
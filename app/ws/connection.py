@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import time
+from dataclasses import asdict, dataclass
+from enum import Enum
+from typing import Awaitable, Callable, Optional
+from fastapi import WebSocket
+
+logger = logging.getLogger(__name__)
+
+# Código de cierre "Try Again Later" para clientes que no consumen a tiempo.
+WS_CLOSE_OVERFLOW = 1013
+# Código de cierre "Going Away" para conexiones sin latido.
+WS_CLOSE_GOING_AWAY = 1001
+# Código de cierre "Policy Violation" para tokens inválidos.
+WS_CLOSE_POLICY_VIOLATION = 1008
+CLOSE_TIMEOUT = 1.0
+
+
+class OverflowPolicy(str, Enum):
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    DISCONNECT = "disconnect"
+
+
+@dataclass
+class DeliveryStats:
+    enqueued: int = 0
+    sent: int = 0
+    dropped: int = 0
+    overflow_disconnects: int = 0
+    send_errors: int = 0
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+class ManagedConnection:
+    """
+    Socket con cola de envío acotada:
+    - Los productores encolan sin esperar la red (enqueue es síncrono).
+    - Una tarea escritora dedicada drena la cola hacia el socket.
+    - Si la cola se llena se aplica la política de desbordamiento.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        user_id: str,
+        max_queue: int = 100,
+        policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        stats: Optional[DeliveryStats] = None,
+        on_close: Optional[Callable[["ManagedConnection"], Awaitable[None]]] = None,
+    ):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.policy = policy
+        self.stats = stats or DeliveryStats()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.closed = False
+        self.last_seen = time.monotonic()
+        # Claims del JWT verificado; None mientras la conexión es anónima
+        self.claims: Optional[dict] = None
+        self._on_close = on_close
+        self._writer: Optional[asyncio.Task] = None
+
+    @property
+    def depth(self) -> int:
+        return self.queue.qsize()
+
+    def start(self) -> None:
+        self._writer = asyncio.create_task(self._drain())
+
+    def enqueue(self, message: dict) -> bool:
+        """Encola un mensaje sin bloquear; retorna False si fue descartado"""
+        if self.closed:
+            return False
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            if self.policy == OverflowPolicy.DROP_NEWEST:
+                self.stats.dropped += 1
+                return False
+            if self.policy == OverflowPolicy.DISCONNECT:
+                self.stats.overflow_disconnects += 1
+                self.stats.dropped += self.queue.qsize() + 1
+                asyncio.get_running_loop().create_task(
+                    self.close(code=WS_CLOSE_OVERFLOW)
+                )
+                return False
+            self.queue.get_nowait()
+            self.queue.task_done()
+            self.stats.dropped += 1
+            self.queue.put_nowait(message)
+        self.stats.enqueued += 1
+        return True
+
+    async def _drain(self) -> None:
+        while True:
+            message = await self.queue.get()
+            try:
+                await self.websocket.send_json(message)
+                self.stats.sent += 1
+            except Exception as e:
+                self.stats.send_errors += 1
+                logger.info("Socket de %s cerrado al enviar: %s", self.user_id, e)
+                self.queue.task_done()
+                await self.close()
+                return
+            self.queue.task_done()
+
+    async def wait_sent(self) -> None:
+        """Espera a que la cola actual se haya entregado"""
+        await self.queue.join()
+
+    async def close(self, code: int = 1000) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        current = asyncio.current_task()
+        if self._writer is not None and self._writer is not current:
+            self._writer.cancel()
+        while not self.queue.empty():
+            self.queue.get_nowait()
+            self.queue.task_done()
+        if code != 1000:
+            try:
+                await asyncio.wait_for(
+                    self.websocket.close(code=code), timeout=CLOSE_TIMEOUT
+                )
+            except Exception:
+                pass
+        if self._on_close is not None:
+            await self._on_close(self)
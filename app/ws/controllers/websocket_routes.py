@@ -1,13 +1,87 @@
-from fastapi import APIRouter, WebSocket
-from app.ws.websocket_manager import connect, disconnect
+import asyncio
+from typing import List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Query, WebSocket
+from sqlmodel import Session
+from app.db.session import engine
+from app.modules.notifications.services.notification_service import (
+    NotificationService,
+)
+from app.ws.connection import WS_CLOSE_POLICY_VIOLATION
+from app.ws.replay import seq_to_datetime, to_seq
+from app.ws.websocket_manager import (
+    REPLAY_BUFFER_SIZE,
+    authenticate,
+    connect,
+    disconnect,
+    handle_client_message,
+    touch,
+)
 
 router = APIRouter()
 
+
+def _load_history_sync(user_id: str, since: int, until: int) -> List[dict]:
+    with Session(engine) as db:
+        notifications = NotificationService(db).get_notifications_since(
+            UUID(user_id),
+            seq_to_datetime(since),
+            until=seq_to_datetime(until),
+            # Uno de más para detectar que el reenvío quedó incompleto
+            limit=REPLAY_BUFFER_SIZE + 1,
+        )
+    messages = []
+    for nu in notifications:
+        created_at = nu.created_at.isoformat() if nu.created_at else None
+        messages.append(
+            {
+                "type": "new_notification",
+                "notification_id": str(nu.id),
+                "title": nu.notification.title,
+                "message": nu.notification.message,
+                "read_at": nu.read_at.isoformat() if nu.read_at else None,
+                "created_at": created_at,
+                "user_id": str(nu.user_id),
+                "seq": to_seq(created_at),
+                "replayed": True,
+            }
+        )
+    return messages
+
+
+async def load_history(user_id: str, since: int, until: int) -> List[dict]:
+    """Mensajes anteriores al buffer en memoria, desde notifications_users"""
+    try:
+        return await asyncio.to_thread(_load_history_sync, user_id, since, until)
+    except ValueError:
+        return []
+
+
 @router.websocket("/ws/{user_id}")
-async def websocket_endpoint(websocket: WebSocket, user_id: str):
-    await connect(websocket, user_id)
+async def websocket_endpoint(
+    websocket: WebSocket,
+    user_id: str,
+    since: Optional[int] = Query(
+        None, description="Última secuencia recibida; se reenvían las posteriores."
+    ),
+    token: Optional[str] = Query(
+        None,
+        description="JWT; requerido para suscribirse a tópicos y para reenviar historia.",
+    ),
+):
+    claims = authenticate(token)
+    if token and claims is None:
+        await websocket.close(code=WS_CLOSE_POLICY_VIOLATION)
+        return
+    connection = await connect(
+        websocket, user_id, since=since, load_history=load_history, claims=claims
+    )
     try:
         while True:
-            await websocket.receive_text()
+            message = await websocket.receive_text()
+            touch(connection)
+            handle_client_message(connection, message)
     except Exception:
-        await disconnect(websocket, user_id)
\ No newline at end of file
+        pass
+    finally:
+        await disconnect(websocket, user_id)
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Iterator, Optional
+from app.ws.connection import ManagedConnection
+
+logger = logging.getLogger(__name__)
+
+PING_MESSAGE = {"type": "ping"}
+
+
+class ActivityTracker:
+    """
+    Conexiones ordenadas por última actividad del cliente (la más antigua
+    primero). Recorrer desde el inicio hasta la primera conexión reciente
+    permite encontrar las inactivas en O(inactivas).
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self._connections: OrderedDict[ManagedConnection, None] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._connections)
+
+    def __contains__(self, connection: ManagedConnection) -> bool:
+        return connection in self._connections
+
+    def touch(self, connection: ManagedConnection) -> None:
+        connection.last_seen = self.clock()
+        self._connections[connection] = None
+        self._connections.move_to_end(connection)
+
+    def remove(self, connection: ManagedConnection) -> None:
+        self._connections.pop(connection, None)
+
+    def idle_since(self, cutoff: float) -> Iterator[ManagedConnection]:
+        """Conexiones sin actividad desde antes de cutoff"""
+        for connection in self._connections:
+            if connection.last_seen >= cutoff:
+                return
+            yield connection
+
+
+class Heartbeat:
+    """
+    Latido JSON del lado servidor, solo para las conexiones del tracker
+    (las que adoptaron el protocolo enviando "ping" o "pong"):
+    - Cada `interval` segundos envía ping a las que no tienen actividad
+      reciente; cualquier mensaje del cliente cuenta como actividad.
+    - Las que pasan `timeout` sin actividad se cierran y se cuentan como
+      cosechadas.
+    Los clientes que solo escuchan no entran al tracker: su conexión la
+    vigilan los ping/pong del protocolo WebSocket de uvicorn
+    (ws_ping_interval/ws_ping_timeout), que cierran el socket y hacen fallar
+    el receive del endpoint.
+    """
+
+    def __init__(
+        self,
+        tracker: ActivityTracker,
+        interval: float = 20.0,
+        timeout: float = 60.0,
+        reap: Optional[Callable[[ManagedConnection], Awaitable[None]]] = None,
+    ):
+        self.tracker = tracker
+        self.interval = interval
+        self.timeout = timeout
+        self._reap = reap
+        self.reaped = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.tick()
+            except Exception as e:
+                logger.exception("Error en el latido de WebSocket: %s", e)
+
+    async def tick(self) -> None:
+        now = self.tracker.clock()
+        await self.reap_stale(now)
+        for connection in self.tracker.idle_since(now - self.interval):
+            connection.enqueue(PING_MESSAGE)
+
+    async def reap_stale(self, now: float) -> int:
+        stale = list(self.tracker.idle_since(now - self.timeout))
+        for connection in stale:
+            self.tracker.remove(connection)
+            self.reaped += 1
+            if self._reap is not None:
+                await self._reap(connection)
+        return len(stale)
+
+    def gauges(self) -> dict:
+        now = self.tracker.clock()
+        return {
+            "active": len(self.tracker),
+            "idle": sum(1 for _ in self.tracker.idle_since(now - self.interval)),
+            "reaped": self.reaped,
+        }
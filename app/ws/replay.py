@@ -0,0 +1,108 @@
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Deque, Iterable, List, Optional, Tuple
+
+
+REPLAY_TRUNCATED = "replay_truncated"
+
+
+def to_seq(created_at: Optional[str]) -> int:
+    """Secuencia base de un mensaje: su created_at en microsegundos"""
+    if created_at:
+        try:
+            return int(datetime.fromisoformat(created_at).timestamp() * 1_000_000)
+        except ValueError:
+            pass
+    return time.time_ns() // 1000
+
+
+def seq_to_datetime(seq: int) -> datetime:
+    return datetime.fromtimestamp(seq / 1_000_000)
+
+
+class ReplayBuffer:
+    """
+    Historial reciente de mensajes por usuario para reenviar tras una
+    reconexión:
+    - La secuencia se deriva de created_at (µs), de modo que todos los
+      workers asignan el mismo número al mismo mensaje y la historia en
+      base de datos usa la misma escala.
+    - Cada usuario tiene un buffer circular de `size` mensajes; el número
+      de usuarios también está acotado (LRU).
+    - `coverage_start` indica desde qué secuencia el buffer es completo;
+      lo anterior debe recuperarse de notifications_users.
+    """
+
+    def __init__(self, size: int = 50, max_users: int = 10000):
+        self.size = size
+        self.max_users = max_users
+        self._buffers: OrderedDict[str, Deque[Tuple[int, dict]]] = OrderedDict()
+        self._last_seq: dict[str, int] = {}
+        self._evicted_seq: dict[str, int] = {}
+        self._floor = time.time_ns() // 1000
+
+    def record(self, user_id: str, message: dict) -> dict:
+        """Asigna la secuencia al mensaje y lo guarda en el buffer del usuario"""
+        seq = max(to_seq(message.get("created_at")), self.last_seq(user_id) + 1)
+        sequenced = {**message, "seq": seq}
+
+        buffer = self._buffers.get(user_id)
+        if buffer is None:
+            buffer = self._buffers[user_id] = deque(maxlen=self.size)
+            self._evict_users()
+        self._buffers.move_to_end(user_id)
+        if len(buffer) == buffer.maxlen:
+            self._evicted_seq[user_id] = buffer[0][0]
+        buffer.append((seq, sequenced))
+        self._last_seq[user_id] = seq
+        return sequenced
+
+    def _evict_users(self) -> None:
+        while len(self._buffers) > self.max_users:
+            user_id, buffer = self._buffers.popitem(last=False)
+            if buffer:
+                self._floor = max(self._floor, buffer[-1][0])
+            self._last_seq.pop(user_id, None)
+            self._evicted_seq.pop(user_id, None)
+
+    def last_seq(self, user_id: str) -> int:
+        return self._last_seq.get(user_id, 0)
+
+    def coverage_start(self, user_id: str) -> int:
+        """Secuencias mayores a este valor están completas en el buffer"""
+        return max(self._floor, self._evicted_seq.get(user_id, 0))
+
+    def has_gap(self, user_id: str, since: int) -> bool:
+        return since < self.coverage_start(user_id)
+
+    def since(self, user_id: str, since: int) -> List[dict]:
+        return [msg for seq, msg in self._buffers.get(user_id, ()) if seq > since]
+
+    def replay(
+        self,
+        user_id: str,
+        since: int,
+        history: Iterable[dict] = (),
+        history_limit: Optional[int] = None,
+    ) -> List[dict]:
+        """
+        Historia de base de datos seguida del buffer, sin duplicados. Si la
+        historia supera `history_limit` (el loader trae uno de más para
+        detectarlo) se envían solo los primeros mensajes y un marcador
+        `replay_truncated`: el buffer no se envía para no dejar un hueco, y
+        el cliente debe reconectar con since=resume_since.
+        """
+        buffered = self.since(user_id, since)
+        seen = {msg.get("notification_id") for msg in buffered}
+        older = [
+            msg
+            for msg in history
+            if msg["seq"] > since and msg.get("notification_id") not in seen
+        ]
+        older.sort(key=lambda msg: msg["seq"])
+        if history_limit is not None and len(older) > history_limit:
+            older = older[:history_limit]
+            resume_since = older[-1]["seq"] if older else since
+            return older + [{"type": REPLAY_TRUNCATED, "resume_since": resume_since}]
+        return older + buffered
@@ -0,0 +1,443 @@
+import asyncio
+import json
+import time
+import pytest
+import pytest_asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from fastapi import HTTPException
+from app.ws import websocket_manager
+from app.ws.replay import ReplayBuffer
+from app.ws.broadcast import (
+    InMemoryBroadcast,
+    PostgresBroadcast,
+    _postgres_dsn,
+    create_broadcast_backend,
+)
+
+TEST_USER_ID = "e952b630-3226-4364-b367-db273281c5f4"
+ANALYST_CLAIMS = {"sub": "a1b2c3d4-0000-4000-8000-000000000001"}
+OWNER_CLAIMS = {"sub": TEST_USER_ID}
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def reset_manager():
+    """Aísla el estado de módulo entre pruebas."""
+    websocket_manager.active_connections.clear()
+    websocket_manager.broadcast_backend = None
+    websocket_manager.replay_buffer = ReplayBuffer(size=3)
+    yield
+    for connections in list(websocket_manager.active_connections.values()):
+        for connection in list(connections):
+            await connection.close()
+    websocket_manager.active_connections.clear()
+    websocket_manager.broadcast_backend = None
+
+
+@pytest.fixture
+def mock_websocket():
+    websocket = MagicMock()
+    websocket.accept = AsyncMock()
+    websocket.send_json = AsyncMock()
+    return websocket
+
+
+@pytest.mark.asyncio
+async def test_send_notification_without_backend_delivers_locally(mock_websocket):
+    connection = await websocket_manager.connect(mock_websocket, TEST_USER_ID)
+
+    await websocket_manager.send_notification(TEST_USER_ID, {"type": "ping"})
+    await connection.wait_sent()
+
+    mock_websocket.send_json.assert_awaited_once()
+    assert mock_websocket.send_json.await_args.args[0]["type"] == "ping"
+
+
+@pytest.mark.asyncio
+async def test_send_notification_goes_through_backend(mock_websocket):
+    backend = InMemoryBroadcast()
+    backend.publish = AsyncMock(wraps=backend.publish)
+    await websocket_manager.start_broadcast(backend)
+    connection = await websocket_manager.connect(mock_websocket, TEST_USER_ID)
+
+    await websocket_manager.send_notification(TEST_USER_ID, {"type": "x"})
+    await connection.wait_sent()
+
+    backend.publish.assert_awaited_once_with(
+        {"user_id": TEST_USER_ID, "message": {"type": "x"}}
+    )
+    mock_websocket.send_json.assert_awaited_once()
+    assert mock_websocket.send_json.await_args.args[0]["type"] == "x"
+
+
+@pytest.mark.asyncio
+async def test_broadcast_for_user_on_other_worker_is_ignored(mock_websocket):
+    await websocket_manager.start_broadcast(InMemoryBroadcast())
+    connection = await websocket_manager.connect(mock_websocket, TEST_USER_ID)
+
+    await websocket_manager.send_notification("otro-usuario", {"type": "x"})
+    await connection.wait_sent()
+
+    mock_websocket.send_json.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_slow_socket_does_not_block_other_sockets(mock_websocket):
+    async def never_completes(_):
+        await asyncio.sleep(3600)
+
+    slow_websocket = MagicMock()
+    slow_websocket.accept = AsyncMock()
+    slow_websocket.send_json = AsyncMock(side_effect=never_completes)
+    await websocket_manager.connect(slow_websocket, TEST_USER_ID)
+    fast_connection = await websocket_manager.connect(mock_websocket, TEST_USER_ID)
+
+    await asyncio.wait_for(
+        websocket_manager.send_notification(TEST_USER_ID, {"type": "x"}), 1
+    )
+    await asyncio.wait_for(fast_connection.wait_sent(), 1)
+
+    mock_websocket.send_json.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_delivered_messages_carry_increasing_seq(mock_websocket):
+    connection = await websocket_manager.connect(mock_websocket, TEST_USER_ID)
+    created_at = "2025-05-29T10:00:00"
+
+    await websocket_manager.send_notification(
+        TEST_USER_ID, {"type": "a", "created_at": created_at}
+    )
+    await websocket_manager.send_notification(
+        TEST_USER_ID, {"type": "b", "created_at": created_at}
+    )
+    await connection.wait_sent()
+
+    seqs = [c.args[0]["seq"] for c in mock_websocket.send_json.await_args_list]
+    assert seqs[1] == seqs[0] + 1
+
+
+@pytest.mark.asyncio
+async def test_reconnect_with_since_replays_only_missing(mock_websocket):
+    for n in range(3):
+        await websocket_manager.send_notification(
+            TEST_USER_ID, {"type": "new_notification", "notification_id": str(n)}
+        )
+    first_seq = websocket_manager.replay_buffer.since(TEST_USER_ID, 0)[0]["seq"]
+    load_history = AsyncMock(return_value=[])
+
+    connection = await websocket_manager.connect(
+        mock_websocket, TEST_USER_ID, since=first_seq, load_history=load_history
+    )
+    await connection.wait_sent()
+
+    sent = [
+        c.args[0]["notification_id"] for c in mock_websocket.send_json.await_args_list
+    ]
+    assert sent == ["1", "2"]
+    load_history.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_reconnect_with_old_since_loads_history(mock_websocket):
+    for n in range(5):
+        await websocket_manager.send_notification(
+            TEST_USER_ID, {"type": "new_notification", "notification_id": str(n)}
+        )
+    buffered = websocket_manager.replay_buffer.since(TEST_USER_ID, 0)
+    history = [{"notification_id": "1", "seq": buffered[0]["seq"] - 1}]
+    load_history = AsyncMock(return_value=history)
+
+    connection = await websocket_manager.connect(
+        mock_websocket,
+        TEST_USER_ID,
+        since=0,
+        load_history=load_history,
+        claims=OWNER_CLAIMS,
+    )
+    await connection.wait_sent()
+
+    sent = [
+        c.args[0]["notification_id"] for c in mock_websocket.send_json.await_args_list
+    ]
+    assert sent == ["1", "2", "3", "4"]
+    load_history.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("claims", [None, ANALYST_CLAIMS])
+async def test_history_is_not_loaded_for_other_callers(mock_websocket, claims):
+    for n in range(5):
+        await websocket_manager.send_notification(
+            TEST_USER_ID, {"type": "new_notification", "notification_id": str(n)}
+        )
+    load_history = AsyncMock(return_value=[{"notification_id": "1", "seq": 1}])
+
+    connection = await websocket_manager.connect(
+        mock_websocket, TEST_USER_ID, since=0, load_history=load_history, claims=claims
+    )
+    await connection.wait_sent()
+
+    sent = [
+        c.args[0]["notification_id"] for c in mock_websocket.send_json.await_args_list
+    ]
+    assert sent == ["2", "3", "4"]
+    load_history.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_reconnect_with_more_missed_than_buffer_is_truncated(mock_websocket):
+    size = websocket_manager.REPLAY_BUFFER_SIZE
+    history = [
+        {"type": "new_notification", "notification_id": str(n), "seq": n}
+        for n in range(1, size + 2)
+    ]
+    load_history = AsyncMock(return_value=history)
+
+    connection = await websocket_manager.connect(
+        mock_websocket,
+        TEST_USER_ID,
+        since=0,
+        load_history=load_history,
+        claims=OWNER_CLAIMS,
+    )
+    await connection.wait_sent()
+
+    sent = [c.args[0] for c in mock_websocket.send_json.await_args_list]
+    assert [m["seq"] for m in sent[:-1]] == list(range(1, size + 1))
+    assert sent[-1] == {"type": "replay_truncated", "resume_since": size}
+
+
+@pytest.mark.asyncio
+async def test_subscribe_and_receive_topic_events(mock_websocket):
+    connection = await websocket_manager.connect(
+        mock_websocket, "analyst", claims=ANALYST_CLAIMS
+    )
+
+    websocket_manager.handle_client_message(
+        connection,
+        json.dumps(
+            {
+                "action": "subscribe",
+                "topic": "requests.created",
+                "filters": {"credit_type_id": "ct-1"},
+            }
+        ),
+    )
+    await websocket_manager.publish_topic_event(
+        "requests.created", {"request_id": "r-1", "credit_type_id": "ct-1"}
+    )
+    await websocket_manager.publish_topic_event(
+        "requests.created", {"request_id": "r-2", "credit_type_id": "ct-2"}
+    )
+    await connection.wait_sent()
+
+    sent = [c.args[0] for c in mock_websocket.send_json.await_args_list]
+    assert sent[0]["type"] == "subscribed"
+    assert [m["event"]["request_id"] for m in sent[1:]] == ["r-1"]
+
+
+@pytest.mark.asyncio
+async def test_invalid_subscription_returns_error(mock_websocket):
+    connection = await websocket_manager.connect(
+        mock_websocket, "analyst", claims=ANALYST_CLAIMS
+    )
+
+    websocket_manager.handle_client_message(
+        connection, json.dumps({"action": "subscribe", "topic": "desconocido"})
+    )
+    websocket_manager.handle_client_message(connection, "no-es-json")
+    await connection.wait_sent()
+
+    sent = [c.args[0]["type"] for c in mock_websocket.send_json.await_args_list]
+    assert sent == ["error", "error"]
+
+
+@pytest.mark.asyncio
+async def test_anonymous_subscribe_is_refused(mock_websocket):
+    connection = await websocket_manager.connect(mock_websocket, TEST_USER_ID)
+
+    websocket_manager.handle_client_message(
+        connection, json.dumps({"action": "subscribe", "topic": "requests.created"})
+    )
+    await websocket_manager.publish_topic_event(
+        "requests.created", {"request_id": "r-1", "client_id": "otro"}
+    )
+    await connection.wait_sent()
+
+    sent = [c.args[0] for c in mock_websocket.send_json.await_args_list]
+    assert [m["type"] for m in sent] == ["error"]
+    assert "token" in sent[0]["detail"]
+
+
+@pytest.mark.asyncio
+async def test_subscribe_with_token_in_message(mock_websocket, monkeypatch):
+    def verify(token):
+        if token != "valido":
+            raise HTTPException(status_code=401, detail="Token inválido")
+        return ANALYST_CLAIMS
+
+    monkeypatch.setattr(websocket_manager, "verify_token", verify)
+    connection = await websocket_manager.connect(mock_websocket, TEST_USER_ID)
+    subscribe = {"action": "subscribe", "topic": "requests.created"}
+
+    websocket_manager.handle_client_message(
+        connection, json.dumps({**subscribe, "token": "falso"})
+    )
+    websocket_manager.handle_client_message(
+        connection, json.dumps({**subscribe, "token": "valido"})
+    )
+    await connection.wait_sent()
+
+    sent = [c.args[0]["type"] for c in mock_websocket.send_json.await_args_list]
+    assert sent == ["error", "subscribed"]
+    assert connection.claims == ANALYST_CLAIMS
+
+
+@pytest.mark.asyncio
+async def test_without_topic_role_only_own_requests(mock_websocket, monkeypatch):
+    monkeypatch.setattr(websocket_manager, "TOPIC_ROLES", {"analyst"})
+    claims = {"sub": TEST_USER_ID, "role": "client"}
+    connection = await websocket_manager.connect(
+        mock_websocket, TEST_USER_ID, claims=claims
+    )
+
+    for filters in (None, {"client_id": "otro"}, {"client_id": TEST_USER_ID}):
+        websocket_manager.handle_client_message(
+            connection,
+            json.dumps(
+                {"action": "subscribe", "topic": "requests.created", "filters": filters}
+            ),
+        )
+    await connection.wait_sent()
+
+    sent = [c.args[0]["type"] for c in mock_websocket.send_json.await_args_list]
+    assert sent == ["error", "error", "subscribed"]
+
+
+@pytest.mark.asyncio
+async def test_publish_event_from_loop_is_non_blocking(mock_websocket):
+    connection = await websocket_manager.connect(
+        mock_websocket, "analyst", claims=ANALYST_CLAIMS
+    )
+    websocket_manager.handle_client_message(
+        connection,
+        json.dumps({"action": "subscribe", "topic": "requests.status_changed"}),
+    )
+
+    websocket_manager.publish_event("requests.status_changed", {"request_id": "r-1"})
+    for _ in range(3):
+        await asyncio.sleep(0)
+    await connection.wait_sent()
+
+    assert mock_websocket.send_json.await_args.args[0]["type"] == "topic_event"
+
+
+@pytest.mark.asyncio
+async def test_disconnect_removes_connection(mock_websocket):
+    await websocket_manager.connect(mock_websocket, TEST_USER_ID)
+
+    await websocket_manager.disconnect(mock_websocket, TEST_USER_ID)
+
+    assert TEST_USER_ID not in websocket_manager.active_connections
+
+
+@pytest.mark.asyncio
+async def test_silent_listener_survives_past_heartbeat_timeout(mock_websocket):
+    connection = await websocket_manager.connect(mock_websocket, TEST_USER_ID)
+    websocket_manager.touch(connection)
+    later = time.monotonic() + websocket_manager.HEARTBEAT_TIMEOUT + 1
+
+    await websocket_manager.heartbeat.reap_stale(later)
+
+    assert not connection.closed
+    assert websocket_manager.connection_gauges()["active"] == 1
+
+
+@pytest.mark.asyncio
+async def test_client_using_json_heartbeat_is_reaped_when_silent(mock_websocket):
+    mock_websocket.close = AsyncMock()
+    connection = await websocket_manager.connect(mock_websocket, TEST_USER_ID)
+    websocket_manager.handle_client_message(connection, '{"type": "pong"}')
+    later = time.monotonic() + websocket_manager.HEARTBEAT_TIMEOUT + 1
+
+    await websocket_manager.heartbeat.reap_stale(later)
+
+    assert connection.closed
+    assert TEST_USER_ID not in websocket_manager.active_connections
+
+
+@pytest.mark.asyncio
+async def test_queue_depth_stats(mock_websocket):
+    await websocket_manager.connect(mock_websocket, TEST_USER_ID)
+
+    stats = websocket_manager.queue_depth_stats()
+
+    assert stats == {"connections": 1, "total_depth": 0, "max_depth": 0}
+
+
+@pytest.mark.asyncio
+async def test_start_broadcast_falls_back_to_memory_on_error():
+    failing_backend = MagicMock()
+    failing_backend.start = AsyncMock(side_effect=RuntimeError("sin base de datos"))
+
+    await websocket_manager.start_broadcast(failing_backend)
+
+    assert isinstance(websocket_manager.broadcast_backend, InMemoryBroadcast)
+
+
+@pytest.mark.asyncio
+async def test_stop_broadcast_resets_backend():
+    await websocket_manager.start_broadcast(InMemoryBroadcast())
+
+    await websocket_manager.stop_broadcast()
+
+    assert websocket_manager.broadcast_backend is None
+
+
+@pytest.mark.asyncio
+async def test_postgres_backend_dispatches_notifies():
+    backend = PostgresBroadcast(dsn="postgresql://test")
+    handler = AsyncMock()
+    backend._handler = handler
+    backend._loop = MagicMock()
+    backend._listen_conn = MagicMock()
+    backend._listen_conn.notifies = [
+        SimpleNamespace(payload=json.dumps({"user_id": "1", "message": {}})),
+        SimpleNamespace(payload="no-es-json"),
+    ]
+
+    backend._on_readable()
+
+    backend._listen_conn.poll.assert_called_once()
+    assert backend._loop.create_task.call_count == 1
+    handler.assert_called_once_with({"user_id": "1", "message": {}})
+    backend._loop.create_task.call_args[0][0].close()
+
+
+@pytest.mark.asyncio
+async def test_postgres_backend_oversized_payload_is_delivered_locally():
+    backend = PostgresBroadcast(dsn="postgresql://test")
+    backend._handler = AsyncMock()
+    backend._notify = MagicMock()
+    message = {"user_id": "1", "message": {"body": "x" * 9000}}
+
+    await backend.publish(message)
+
+    backend._handler.assert_awaited_once_with(message)
+    backend._notify.assert_not_called()
+
+
+def test_postgres_dsn_strips_sqlalchemy_driver():
+    assert (
+        _postgres_dsn("postgresql+psycopg2://u:p@host:5432/db")
+        == "postgresql://u:p@host:5432/db"
+    )
+
+
+def test_create_broadcast_backend_by_name(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "postgresql://u:p@host/db")
+
+    assert isinstance(create_broadcast_backend("memory"), InMemoryBroadcast)
+    assert isinstance(create_broadcast_backend("postgres"), PostgresBroadcast)
+    with pytest.raises(ValueError):
+        create_broadcast_backend("redis")
@@ -0,0 +1,103 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from app.ws.connection import (
+    WS_CLOSE_OVERFLOW,
+    DeliveryStats,
+    ManagedConnection,
+    OverflowPolicy,
+)
+
+
+@pytest.fixture
+def mock_websocket():
+    websocket = MagicMock()
+    websocket.send_json = AsyncMock()
+    websocket.close = AsyncMock()
+    return websocket
+
+
+def build_connection(websocket, policy, max_queue=2, on_close=None):
+    return ManagedConnection(
+        websocket,
+        "user-1",
+        max_queue=max_queue,
+        policy=policy,
+        stats=DeliveryStats(),
+        on_close=on_close,
+    )
+
+
+@pytest.mark.asyncio
+async def test_writer_task_sends_in_order(mock_websocket):
+    connection = build_connection(mock_websocket, OverflowPolicy.DROP_OLDEST, 10)
+    connection.start()
+
+    for i in range(3):
+        assert connection.enqueue({"n": i})
+    await connection.wait_sent()
+
+    sent = [call.args[0]["n"] for call in mock_websocket.send_json.await_args_list]
+    assert sent == [0, 1, 2]
+    assert connection.stats.sent == 3
+    await connection.close()
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_policy_keeps_latest_messages(mock_websocket):
+    connection = build_connection(mock_websocket, OverflowPolicy.DROP_OLDEST)
+
+    for i in range(4):
+        assert connection.enqueue({"n": i})
+
+    assert connection.depth == 2
+    assert connection.stats.dropped == 2
+    assert [connection.queue.get_nowait()["n"] for _ in range(2)] == [2, 3]
+
+
+@pytest.mark.asyncio
+async def test_drop_newest_policy_rejects_incoming(mock_websocket):
+    connection = build_connection(mock_websocket, OverflowPolicy.DROP_NEWEST)
+
+    results = [connection.enqueue({"n": i}) for i in range(3)]
+
+    assert results == [True, True, False]
+    assert connection.stats.dropped == 1
+    assert connection.queue.get_nowait()["n"] == 0
+
+
+@pytest.mark.asyncio
+async def test_disconnect_policy_closes_socket(mock_websocket):
+    on_close = AsyncMock()
+    connection = build_connection(
+        mock_websocket, OverflowPolicy.DISCONNECT, on_close=on_close
+    )
+
+    for i in range(3):
+        connection.enqueue({"n": i})
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    assert connection.closed
+    assert connection.stats.overflow_disconnects == 1
+    assert connection.stats.dropped == 3
+    mock_websocket.close.assert_awaited_once_with(code=WS_CLOSE_OVERFLOW)
+    on_close.assert_awaited_once_with(connection)
+    assert connection.enqueue({"n": 99}) is False
+
+
+@pytest.mark.asyncio
+async def test_send_error_closes_connection(mock_websocket):
+    mock_websocket.send_json.side_effect = RuntimeError("socket cerrado")
+    on_close = AsyncMock()
+    connection = build_connection(
+        mock_websocket, OverflowPolicy.DROP_OLDEST, on_close=on_close
+    )
+    connection.start()
+
+    connection.enqueue({"n": 1})
+    await asyncio.wait_for(connection._writer, 1)
+
+    assert connection.closed
+    assert connection.stats.send_errors == 1
+    on_close.assert_awaited_once_with(connection)
@@ -0,0 +1,92 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from app.ws.connection import ManagedConnection
+from app.ws.heartbeat import PING_MESSAGE, ActivityTracker, Heartbeat
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def tracker(clock):
+    return ActivityTracker(clock=clock)
+
+
+def build_connection(user_id: str) -> ManagedConnection:
+    websocket = MagicMock()
+    websocket.send_json = AsyncMock()
+    websocket.close = AsyncMock()
+    return ManagedConnection(websocket, user_id, max_queue=10)
+
+
+def test_idle_since_stops_at_first_recent_connection(tracker, clock):
+    old = build_connection("old")
+    recent = build_connection("recent")
+    tracker.touch(old)
+    clock.now += 30
+    tracker.touch(recent)
+
+    assert list(tracker.idle_since(clock.now - 10)) == [old]
+
+
+def test_touch_moves_connection_to_the_end(tracker, clock):
+    first = build_connection("first")
+    second = build_connection("second")
+    tracker.touch(first)
+    tracker.touch(second)
+    clock.now += 30
+    tracker.touch(first)
+
+    assert list(tracker.idle_since(clock.now - 10)) == [second]
+
+
+@pytest.mark.asyncio
+async def test_tick_pings_idle_connections(tracker, clock):
+    idle = build_connection("idle")
+    active = build_connection("active")
+    heartbeat = Heartbeat(tracker, interval=20, timeout=60)
+    tracker.touch(idle)
+    clock.now += 25
+    tracker.touch(active)
+
+    await heartbeat.tick()
+
+    assert idle.queue.get_nowait() == PING_MESSAGE
+    assert active.queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_tick_reaps_stale_connections(tracker, clock):
+    stale = build_connection("stale")
+    alive = build_connection("alive")
+    reap = AsyncMock()
+    heartbeat = Heartbeat(tracker, interval=20, timeout=60, reap=reap)
+    tracker.touch(stale)
+    clock.now += 50
+    tracker.touch(alive)
+    clock.now += 15
+
+    await heartbeat.tick()
+
+    reap.assert_awaited_once_with(stale)
+    assert len(tracker) == 1
+    assert heartbeat.reaped == 1
+
+
+def test_gauges_report_active_idle_and_reaped(tracker, clock):
+    heartbeat = Heartbeat(tracker, interval=20, timeout=60)
+    tracker.touch(build_connection("a"))
+    clock.now += 30
+    tracker.touch(build_connection("b"))
+
+    assert heartbeat.gauges() == {"active": 2, "idle": 1, "reaped": 0}
@@ -0,0 +1,97 @@
+from datetime import datetime
+from app.ws.replay import ReplayBuffer, seq_to_datetime, to_seq
+
+USER_ID = "e952b630-3226-4364-b367-db273281c5f4"
+
+
+def message(n: int, created_at: str = "2025-05-29T10:00:00") -> dict:
+    return {"notification_id": str(n), "created_at": created_at}
+
+
+def test_seq_is_derived_from_created_at():
+    created_at = "2025-05-29T10:00:00.250000"
+
+    seq = to_seq(created_at)
+
+    assert seq_to_datetime(seq) == datetime.fromisoformat(created_at)
+
+
+def test_record_assigns_monotonic_seq():
+    buffer = ReplayBuffer(size=5)
+
+    first = buffer.record(USER_ID, message(1))
+    second = buffer.record(USER_ID, message(2))
+
+    assert second["seq"] == first["seq"] + 1
+    assert buffer.last_seq(USER_ID) == second["seq"]
+
+
+def test_record_does_not_mutate_original_message():
+    buffer = ReplayBuffer(size=5)
+    original = message(1)
+
+    buffer.record(USER_ID, original)
+
+    assert "seq" not in original
+
+
+def test_since_returns_only_newer_messages():
+    buffer = ReplayBuffer(size=5)
+    first = buffer.record(USER_ID, message(1))
+    buffer.record(USER_ID, message(2))
+
+    assert [m["notification_id"] for m in buffer.since(USER_ID, first["seq"])] == ["2"]
+
+
+def test_buffer_is_bounded_and_reports_gap():
+    buffer = ReplayBuffer(size=2)
+    buffer._floor = 0
+    first = buffer.record(USER_ID, message(1))
+    buffer.record(USER_ID, message(2))
+    buffer.record(USER_ID, message(3))
+
+    assert len(buffer.since(USER_ID, 0)) == 2
+    assert buffer.coverage_start(USER_ID) == first["seq"]
+    assert buffer.has_gap(USER_ID, first["seq"] - 1)
+    assert not buffer.has_gap(USER_ID, first["seq"])
+
+
+def test_messages_before_worker_start_are_a_gap():
+    buffer = ReplayBuffer(size=2)
+
+    assert buffer.has_gap(USER_ID, 0)
+
+
+def test_user_eviction_raises_floor():
+    buffer = ReplayBuffer(size=2, max_users=1)
+    evicted = buffer.record("otro-usuario", message(1, "2999-01-01T00:00:00"))
+    buffer.record(USER_ID, message(2))
+
+    assert buffer.coverage_start(USER_ID) == evicted["seq"]
+    assert buffer.since("otro-usuario", 0) == []
+
+
+def test_replay_merges_history_without_duplicates():
+    buffer = ReplayBuffer(size=5)
+    buffered = buffer.record(USER_ID, message(2))
+    history = [
+        {"notification_id": "2", "seq": buffered["seq"]},
+        {"notification_id": "1", "seq": buffered["seq"] - 10},
+        {"notification_id": "0", "seq": 5},
+    ]
+
+    replayed = buffer.replay(USER_ID, 5, history)
+
+    assert [m["notification_id"] for m in replayed] == ["1", "2"]
+
+
+def test_replay_truncates_history_beyond_limit():
+    buffer = ReplayBuffer(size=2)
+    buffered = buffer.record(USER_ID, message(9))
+    history = [{"notification_id": str(n), "seq": 10 + n} for n in range(5, 0, -1)]
+
+    replayed = buffer.replay(USER_ID, 10, history, history_limit=3)
+
+    assert [m.get("notification_id") for m in replayed[:-1]] == ["1", "2", "3"]
+    assert replayed[-1] == {"type": "replay_truncated", "resume_since": 13}
+    assert buffered not in replayed
@@ -0,0 +1,99 @@
+import pytest
+from unittest.mock import MagicMock
+from app.ws.connection import ManagedConnection
+from app.ws.topics import (
+    REQUEST_CREATED,
+    REQUEST_STATUS_CHANGED,
+    InvalidSubscriptionError,
+    TopicIndex,
+)
+
+CREDIT_TYPE_A = "a1b2c3d4-e5f6-4789-abcd-1234567890ab"
+CREDIT_TYPE_B = "b2c3d4e5-f6a7-4890-bcde-2345678901bb"
+
+
+def build_connection(user_id: str = "analyst") -> ManagedConnection:
+    return ManagedConnection(MagicMock(), user_id, max_queue=10)
+
+
+def test_unfiltered_subscription_matches_every_event():
+    index = TopicIndex()
+    connection = build_connection()
+    index.subscribe(connection, REQUEST_STATUS_CHANGED)
+
+    assert index.match(REQUEST_STATUS_CHANGED, {"request_id": "1"}) == {connection}
+    assert index.match(REQUEST_CREATED, {"request_id": "1"}) == set()
+
+
+def test_filtered_subscription_matches_only_equal_values():
+    index = TopicIndex()
+    connection_a = build_connection("a")
+    connection_b = build_connection("b")
+    index.subscribe(connection_a, REQUEST_CREATED, {"credit_type_id": CREDIT_TYPE_A})
+    index.subscribe(connection_b, REQUEST_CREATED, {"credit_type_id": CREDIT_TYPE_B})
+
+    matched = index.match(REQUEST_CREATED, {"credit_type_id": CREDIT_TYPE_A})
+
+    assert matched == {connection_a}
+
+
+def test_all_filters_must_match():
+    index = TopicIndex()
+    connection = build_connection()
+    index.subscribe(
+        connection,
+        REQUEST_STATUS_CHANGED,
+        {"credit_type_id": CREDIT_TYPE_A, "status_id": "approved"},
+    )
+
+    assert (
+        index.match(
+            REQUEST_STATUS_CHANGED,
+            {"credit_type_id": CREDIT_TYPE_A, "status_id": "rejected"},
+        )
+        == set()
+    )
+    assert index.match(
+        REQUEST_STATUS_CHANGED,
+        {"credit_type_id": CREDIT_TYPE_A, "status_id": "approved"},
+    ) == {connection}
+
+
+def test_unknown_topic_is_rejected():
+    index = TopicIndex()
+
+    with pytest.raises(InvalidSubscriptionError):
+        index.subscribe(build_connection(), "requests.deleted")
+
+
+def test_subscription_limit_per_connection():
+    index = TopicIndex(max_per_connection=1)
+    connection = build_connection()
+    index.subscribe(connection, REQUEST_CREATED)
+
+    with pytest.raises(InvalidSubscriptionError):
+        index.subscribe(connection, REQUEST_STATUS_CHANGED)
+
+
+def test_unsubscribe_single_topic():
+    index = TopicIndex()
+    connection = build_connection()
+    index.subscribe(connection, REQUEST_CREATED, {"credit_type_id": CREDIT_TYPE_A})
+    index.subscribe(connection, REQUEST_STATUS_CHANGED)
+
+    index.unsubscribe(connection, REQUEST_CREATED, {"credit_type_id": CREDIT_TYPE_A})
+
+    assert index.match(REQUEST_CREATED, {"credit_type_id": CREDIT_TYPE_A}) == set()
+    assert index.subscriptions(connection) == {(REQUEST_STATUS_CHANGED, ())}
+
+
+def test_unsubscribe_all_cleans_index():
+    index = TopicIndex()
+    connection = build_connection()
+    index.subscribe(connection, REQUEST_CREATED, {"credit_type_id": CREDIT_TYPE_A})
+    index.subscribe(connection, REQUEST_STATUS_CHANGED)
+
+    index.unsubscribe(connection)
+
+    assert index.subscriptions(connection) == set()
+    assert not index._index
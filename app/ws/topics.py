@@ -0,0 +1,115 @@
+from collections import defaultdict
+from typing import Dict, Optional, Set, Tuple
+from app.ws.connection import ManagedConnection
+
+REQUEST_CREATED = "requests.created"
+REQUEST_UPDATED = "requests.updated"
+REQUEST_STATUS_CHANGED = "requests.status_changed"
+
+TOPICS = (REQUEST_CREATED, REQUEST_UPDATED, REQUEST_STATUS_CHANGED)
+
+MAX_SUBSCRIPTIONS_PER_CONNECTION = 20
+
+FilterKey = Optional[Tuple[str, str]]
+Filters = Tuple[Tuple[str, str], ...]
+
+
+class InvalidSubscriptionError(ValueError):
+    pass
+
+
+class SubscriptionForbiddenError(InvalidSubscriptionError):
+    pass
+
+
+def normalize_filters(filters: Optional[dict]) -> Filters:
+    return tuple(sorted((str(k), str(v)) for k, v in (filters or {}).items()))
+
+
+class TopicIndex:
+    """
+    Índice de suscripciones por tópico:
+    - Las suscripciones sin filtros quedan bajo la clave None del tópico.
+    - Las filtradas se indexan por su primer par (campo, valor); el resto
+      de filtros se verifica solo sobre esos candidatos.
+    Publicar cuesta O(suscriptores coincidentes + campos del evento),
+    independiente del total de conexiones.
+    """
+
+    def __init__(self, max_per_connection: int = MAX_SUBSCRIPTIONS_PER_CONNECTION):
+        self.max_per_connection = max_per_connection
+        self._index: Dict[
+            str, Dict[FilterKey, Dict[ManagedConnection, Set[Filters]]]
+        ] = defaultdict(lambda: defaultdict(dict))
+        self._by_connection: Dict[ManagedConnection, Set[Tuple[str, Filters]]] = (
+            defaultdict(set)
+        )
+
+    def subscribe(
+        self, connection: ManagedConnection, topic: str, filters: Optional[dict] = None
+    ) -> None:
+        if topic not in TOPICS:
+            raise InvalidSubscriptionError(f"Tópico '{topic}' no soportado.")
+        normalized = normalize_filters(filters)
+        subscriptions = self._by_connection[connection]
+        if (topic, normalized) in subscriptions:
+            return
+        if len(subscriptions) >= self.max_per_connection:
+            raise InvalidSubscriptionError("Límite de suscripciones alcanzado.")
+
+        key = normalized[0] if normalized else None
+        self._index[topic][key].setdefault(connection, set()).add(normalized)
+        subscriptions.add((topic, normalized))
+
+    def unsubscribe(
+        self,
+        connection: ManagedConnection,
+        topic: Optional[str] = None,
+        filters: Optional[dict] = None,
+    ) -> None:
+        """Sin tópico elimina todas las suscripciones de la conexión"""
+        subscriptions = self._by_connection.get(connection)
+        if not subscriptions:
+            return
+        if topic is None:
+            targets = list(subscriptions)
+        else:
+            targets = [(topic, normalize_filters(filters))]
+
+        for target_topic, normalized in targets:
+            if (target_topic, normalized) not in subscriptions:
+                continue
+            subscriptions.discard((target_topic, normalized))
+            key = normalized[0] if normalized else None
+            bucket = self._index[target_topic][key]
+            bucket[connection].discard(normalized)
+            if not bucket[connection]:
+                del bucket[connection]
+            if not bucket:
+                del self._index[target_topic][key]
+            if not self._index[target_topic]:
+                del self._index[target_topic]
+
+        if not subscriptions:
+            del self._by_connection[connection]
+
+    def match(self, topic: str, event: dict) -> Set[ManagedConnection]:
+        buckets = self._index.get(topic)
+        if not buckets:
+            return set()
+
+        fields = {str(k): str(v) for k, v in event.items() if v is not None}
+        matched = set(buckets.get(None, ()))
+        for field, value in fields.items():
+            for connection, filter_sets in buckets.get((field, value), {}).items():
+                if connection in matched:
+                    continue
+                if any(
+                    all(fields.get(k) == v for k, v in normalized)
+                    for normalized in filter_sets
+                ):
+                    matched.add(connection)
+        return matched
+
+    def subscriptions(self, connection: ManagedConnection) -> Set[Tuple[str, Filters]]:
+        return set(self._by_connection.get(connection, ()))
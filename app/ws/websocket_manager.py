@@ -1,21 +1,353 @@
-from fastapi import WebSocket
-from typing import Dict, List
+import asyncio
+import json
+import logging
+import os
+from fastapi import HTTPException, WebSocket
+from typing import Awaitable, Callable, Dict, List, Optional
+from app.ws.broadcast import (
+    BroadcastBackend,
+    InMemoryBroadcast,
+    create_broadcast_backend,
+)
+from app.ws.connection import (
+    WS_CLOSE_GOING_AWAY,
+    DeliveryStats,
+    ManagedConnection,
+    OverflowPolicy,
+)
+from app.ws.heartbeat import ActivityTracker, Heartbeat
+from app.ws.replay import ReplayBuffer
+from app.ws.topics import (
+    InvalidSubscriptionError,
+    SubscriptionForbiddenError,
+    TopicIndex,
+)
+from app.tracing.tracer import current_traceparent, tracer
 
-active_connections: Dict[str, List[WebSocket]] = {}
+logger = logging.getLogger(__name__)
+
+SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", "100"))
+OVERFLOW_POLICY = OverflowPolicy(os.getenv("WS_OVERFLOW_POLICY", "drop_oldest"))
+HEARTBEAT_INTERVAL = float(os.getenv("WS_HEARTBEAT_INTERVAL", "20"))
+HEARTBEAT_TIMEOUT = float(os.getenv("WS_HEARTBEAT_TIMEOUT", "60"))
+REPLAY_BUFFER_SIZE = int(os.getenv("WS_REPLAY_BUFFER_SIZE", "50"))
+# Roles (claim "role" o "roles") que ven los eventos de todas las
+# solicitudes; vacío = cualquier usuario autenticado, como /requests
+TOPIC_ROLES = {
+    r.strip() for r in os.getenv("WS_TOPIC_ROLES", "").split(",") if r.strip()
+}
+
+HistoryLoader = Callable[[str, int, int], Awaitable[List[dict]]]
+
+active_connections: Dict[str, List[ManagedConnection]] = {}
+broadcast_backend: Optional[BroadcastBackend] = None
+delivery_stats = DeliveryStats()
+activity_tracker = ActivityTracker()
+replay_buffer = ReplayBuffer(size=REPLAY_BUFFER_SIZE)
+topic_index = TopicIndex()
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+async def _reap_connection(connection: ManagedConnection):
+    await connection.close(code=WS_CLOSE_GOING_AWAY)
+
+
+heartbeat = Heartbeat(
+    activity_tracker,
+    interval=HEARTBEAT_INTERVAL,
+    timeout=HEARTBEAT_TIMEOUT,
+    reap=_reap_connection,
+)
+
+
+def verify_token(token: str) -> dict:
+    """Claims del JWT; HTTPException si no es válido"""
+    from app.shared.services.jwtService import get_jwt_service
+
+    return get_jwt_service().verify_token(token)
+
+
+def authenticate(token: Optional[str]) -> Optional[dict]:
+    """Claims del token o None si falta o no es válido"""
+    if not token:
+        return None
+    try:
+        return verify_token(token)
+    except HTTPException:
+        return None
+
+
+def _is_owner(claims: Optional[dict], user_id: str) -> bool:
+    """El token verificado pertenece al usuario del socket"""
+    return claims is not None and claims.get("sub") == str(user_id)
+
+
+def _roles(claims: dict) -> set:
+    roles = claims.get("roles", claims.get("role", ()))
+    return {roles} if isinstance(roles, str) else set(roles or ())
+
+
+def authorize_subscription(
+    connection: ManagedConnection, filters: Optional[dict]
+) -> None:
+    """
+    Los eventos de tópico exponen montos y riesgo de todas las solicitudes:
+    se exige un JWT verificado. Sin uno de los roles de WS_TOPIC_ROLES solo
+    se permite suscribirse a las solicitudes propias (filtro client_id igual
+    al sub del token).
+    """
+    claims = connection.claims
+    if not claims or not claims.get("sub"):
+        raise SubscriptionForbiddenError("Se requiere un token válido.")
+    if not TOPIC_ROLES or TOPIC_ROLES & _roles(claims):
+        return
+    if str((filters or {}).get("client_id")) != str(claims["sub"]):
+        raise SubscriptionForbiddenError(
+            "Sin permiso para ver solicitudes de otros clientes."
+        )
+
+
+async def connect(
+    websocket: WebSocket,
+    user_id: str,
+    since: Optional[int] = None,
+    load_history: Optional[HistoryLoader] = None,
+    claims: Optional[dict] = None,
+) -> ManagedConnection:
+    """
+    Registra el socket. Si el cliente indica `since`, se reenvían los
+    mensajes posteriores: primero los anteriores al buffer (load_history,
+    en orden cronológico y con hasta REPLAY_BUFFER_SIZE + 1 mensajes) y
+    luego los del buffer, antes de cualquier mensaje nuevo. Si la historia
+    excede REPLAY_BUFFER_SIZE el reenvío se corta con `replay_truncated`.
+    La historia de la base solo se carga si `claims` es del mismo usuario.
+    """
+    history: List[dict] = []
+    if (
+        since is not None
+        and load_history is not None
+        and _is_owner(claims, user_id)
+        and replay_buffer.has_gap(user_id, since)
+    ):
+        history = await load_history(
+            user_id, since, replay_buffer.coverage_start(user_id)
+        )
 
-async def connect(websocket: WebSocket, user_id: str):
     await websocket.accept()
+    connection = ManagedConnection(
+        websocket,
+        user_id,
+        max_queue=SEND_QUEUE_SIZE,
+        policy=OVERFLOW_POLICY,
+        stats=delivery_stats,
+        on_close=_remove_connection,
+    )
+    connection.claims = claims
+    connection.start()
     if user_id not in active_connections:
         active_connections[user_id] = []
-    active_connections[user_id].append(websocket)
+    active_connections[user_id].append(connection)
+    if since is not None:
+        for message in replay_buffer.replay(
+            user_id, since, history, history_limit=REPLAY_BUFFER_SIZE
+        ):
+            connection.enqueue(message)
+    return connection
+
+
+async def _remove_connection(connection: ManagedConnection):
+    activity_tracker.remove(connection)
+    topic_index.unsubscribe(connection)
+    connections = active_connections.get(connection.user_id)
+    if connections and connection in connections:
+        connections.remove(connection)
+        if not connections:
+            del active_connections[connection.user_id]
+
 
 async def disconnect(websocket: WebSocket, user_id: str):
-    if user_id in active_connections:
-        active_connections[user_id].remove(websocket)
-        if not active_connections[user_id]:
-            del active_connections[user_id]
+    for connection in list(active_connections.get(user_id, [])):
+        if connection.websocket is websocket:
+            await connection.close()
+
+
+def touch(connection: ManagedConnection):
+    """Registra actividad si la conexión usa el latido JSON"""
+    if not connection.closed and connection in activity_tracker:
+        activity_tracker.touch(connection)
+
+
+def _is_heartbeat(text: str) -> bool:
+    if text in ("ping", "pong"):
+        return True
+    try:
+        payload = json.loads(text)
+    except ValueError:
+        return False
+    return isinstance(payload, dict) and payload.get("type") == "pong"
+
+
+def handle_client_message(connection: ManagedConnection, text: str):
+    """
+    Procesa mensajes del cliente: "ping"/"pong" o acciones JSON
+    {"action": "subscribe"|"unsubscribe", "topic": ..., "filters": {...},
+    "token": ...}. Un mensaje de latido suma la conexión al latido JSON del
+    servidor; el token (opcional si se envió al conectar) autentica la
+    conexión antes de suscribirla.
+    """
+    if _is_heartbeat(text):
+        if not connection.closed:
+            activity_tracker.touch(connection)
+        if text == "ping":
+            connection.enqueue({"type": "pong"})
+        return
+    try:
+        payload = json.loads(text)
+        action = payload.get("action")
+        topic = payload.get("topic")
+        filters = payload.get("filters")
+        if filters is not None and not isinstance(filters, dict):
+            raise InvalidSubscriptionError("Los filtros deben ser un objeto.")
+        if action == "subscribe":
+            if payload.get("token"):
+                claims = authenticate(payload["token"])
+                if claims is None:
+                    raise SubscriptionForbiddenError("Token inválido o expirado.")
+                connection.claims = claims
+            authorize_subscription(connection, filters)
+            topic_index.subscribe(connection, topic, filters)
+            connection.enqueue(
+                {"type": "subscribed", "topic": topic, "filters": filters}
+            )
+        elif action == "unsubscribe":
+            topic_index.unsubscribe(connection, topic, filters)
+            connection.enqueue(
+                {"type": "unsubscribed", "topic": topic, "filters": filters}
+            )
+    except (ValueError, AttributeError) as e:
+        connection.enqueue({"type": "error", "detail": str(e)})
+
+
+def connection_gauges() -> dict:
+    """
+    Conexiones abiertas de este worker; idle y reaped se refieren solo a
+    las que usan el latido JSON
+    """
+    return {
+        "worker": os.getpid(),
+        **heartbeat.gauges(),
+        "active": sum(len(c) for c in active_connections.values()),
+    }
+
+
+async def deliver_local(user_id: str, message: dict):
+    """
+    Asigna la secuencia, guarda el mensaje en el buffer de reenvío y lo
+    encola en los sockets del usuario conectados a este worker.
+    """
+    message = replay_buffer.record(user_id, message)
+    for connection in list(active_connections.get(user_id, [])):
+        connection.enqueue(message)
+
+
+def queue_depth_stats() -> dict:
+    """Profundidad de las colas de envío de este worker"""
+    depths = [c.depth for conns in active_connections.values() for c in conns]
+    return {
+        "connections": len(depths),
+        "total_depth": sum(depths),
+        "max_depth": max(depths, default=0),
+    }
+
+
+async def deliver_topic_local(topic: str, event: dict):
+    """Encola el evento en los sockets de este worker suscritos al tópico"""
+    message = {"type": "topic_event", "topic": topic, "event": event}
+    for connection in topic_index.match(topic, event):
+        connection.enqueue(message)
+
+
+async def _on_broadcast(envelope: dict):
+    traceparent = envelope.get("traceparent")
+    if traceparent is None:
+        await _deliver_envelope(envelope)
+        return
+    # Continúa la traza del worker que publicó
+    with tracer.start_trace("ws.deliver", traceparent):
+        await _deliver_envelope(envelope)
+
+
+async def _deliver_envelope(envelope: dict):
+    if "topic" in envelope:
+        await deliver_topic_local(envelope["topic"], envelope["event"])
+    else:
+        await deliver_local(envelope["user_id"], envelope["message"])
+
+
+async def start_broadcast(backend: Optional[BroadcastBackend] = None):
+    """Suscribe este worker al canal de difusión (una vez por proceso)"""
+    global broadcast_backend, _loop
+    _loop = asyncio.get_running_loop()
+    backend = backend or create_broadcast_backend()
+    try:
+        await backend.start(_on_broadcast)
+    except Exception as e:
+        logger.error(
+            "No se pudo iniciar el backend de difusión (%s); "
+            "se usará entrega en memoria: %s",
+            type(backend).__name__,
+            e,
+        )
+        backend = InMemoryBroadcast()
+        await backend.start(_on_broadcast)
+    broadcast_backend = backend
+
+
+async def stop_broadcast():
+    global broadcast_backend
+    if broadcast_backend is not None:
+        await broadcast_backend.stop()
+        broadcast_backend = None
+
+
+def _envelope(payload: dict) -> dict:
+    traceparent = current_traceparent()
+    if traceparent is not None:
+        payload["traceparent"] = traceparent
+    return payload
+
 
 async def send_notification(user_id: str, message: dict):
-    if user_id in active_connections:
-        for connection in active_connections[user_id]:
-            await connection.send_json(message)
+    with tracer.span("ws.send_notification"):
+        if broadcast_backend is None:
+            await deliver_local(user_id, message)
+            return
+        await broadcast_backend.publish(
+            _envelope({"user_id": user_id, "message": message})
+        )
+
+
+async def publish_topic_event(topic: str, event: dict):
+    with tracer.span("ws.publish_topic_event", **{"ws.topic": topic}):
+        if broadcast_backend is None:
+            await deliver_topic_local(topic, event)
+            return
+        await broadcast_backend.publish(_envelope({"topic": topic, "event": event}))
+
+
+def publish_event(topic: str, event: dict):
+    """
+    Publica un evento de tópico sin bloquear al productor. Puede llamarse
+    desde el event loop o desde hilos del threadpool (endpoints síncronos).
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    if loop is not None:
+        loop.create_task(publish_topic_event(topic, event))
+    elif _loop is not None and _loop.is_running():
+        asyncio.run_coroutine_threadsafe(publish_topic_event(topic, event), _loop)
+    else:
+        logger.debug("Evento '%s' descartado: no hay event loop activo", topic)
@@ -0,0 +1,118 @@
+"""
+Benchmark de compresión de respuestas: costo de CPU frente a bytes ahorrados.
+
+Sirve cuerpos representativos (listado, página, exportación NDJSON en
+streaming y notificaciones) a través de CompressionMiddleware con distintos
+niveles de gzip y, si está instalado, brotli. Reporta por ruta los bytes
+originales, los enviados y los milisegundos de CPU por MB ahorrado.
+
+Uso:
+    python -m benchmarks.bench_compression --rows 1000 --requests 20
+"""
+
+import argparse
+import asyncio
+import json
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+from app.config.compression import CompressionMiddleware, CompressionStats, brotli
+from app.shared.responses.json_response import FastJSONResponse
+from benchmarks.bench_json_responses import build_rows
+
+
+def build_notifications(count: int) -> list:
+    base = datetime(2025, 5, 29, 10, 0)
+    return [
+        {
+            "notification_id": str(uuid4()),
+            "title": "Solicitud aprobada",
+            "message": "Tu solicitud de crédito agrícola fue aprobada.",
+            "read_at": None,
+            "created_at": (base + timedelta(minutes=i)).isoformat(),
+        }
+        for i in range(count)
+    ]
+
+
+def build_app(stats: CompressionStats, level: int, quality: int, rows: list):
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=1024,
+        gzip_level=level,
+        brotli_quality=quality,
+        stats=stats,
+    )
+    list_body = {"data": [row.model_dump(mode="json") for row in rows[:100]]}
+    page_body = {"data": list_body["data"][:10], "pagination": {"page": 1}}
+    notifications = {"data": build_notifications(50)}
+
+    @app.get("/requests/")
+    def get_requests():
+        return list_body
+
+    @app.get("/requests/paginated-list")
+    def get_paginated_list():
+        return page_body
+
+    @app.get("/notifications/")
+    def get_notifications():
+        return notifications
+
+    @app.get("/requests/export")
+    def export_requests():
+        def lines():
+            for start in range(0, len(rows), 500):
+                batch = rows[start : start + 500]
+                yield "".join(f"{row.model_dump_json()}\n" for row in batch)
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    return app
+
+
+async def run_variant(encoding: str, level: int, quality: int, rows: list, n: int):
+    stats = CompressionStats()
+    app = build_app(stats, level, quality, rows)
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Accept-Encoding": encoding}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        for _ in range(n):
+            for path in (
+                "/requests/",
+                "/requests/paginated-list",
+                "/notifications/",
+                "/requests/export",
+            ):
+                response = await c.get(path, headers=headers)
+                response.raise_for_status()
+    return stats.snapshot()
+
+
+async def main_async(args):
+    rows = build_rows(args.rows)
+    variants = [("gzip", level, 0) for level in (1, 6, 9)]
+    if brotli is not None:
+        variants += [("br", 0, quality) for quality in (1, 4, 11)]
+
+    results = {}
+    for encoding, level, quality in variants:
+        name = f"{encoding}-{level or quality}"
+        results[name] = await run_variant(encoding, level, quality, rows, args.requests)
+    print(json.dumps(results, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=20)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark de renderizado de correos para envíos masivos.
+
+Mide tiempo y asignaciones de memoria (tracemalloc) de TemplateService en
+tres escenarios:
+- cold: cada envío corresponde a una solicitud distinta (caché fría).
+- warm: reenvío de las mismas solicitudes (caché caliente).
+- no-cache: motor sin caché, para aislar el costo del renderizado Jinja2.
+
+Uso:
+    python -m benchmarks.bench_email_templates --sends 5000
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.modules.mails.services.template_engine import TemplateEngine
+from app.modules.mails.services.template_service import TemplateService
+
+
+def build_requests(count: int) -> list:
+    base = datetime(2025, 5, 29, 10, 0)
+    return [
+        SimpleNamespace(
+            id=uuid4(),
+            requested_amount=1000000.0 + i * 1000,
+            term_months=12 + i % 48,
+            annual_interest_rate=12.0 + i % 20,
+            created_at=base + timedelta(minutes=i),
+            updated_at=base + timedelta(minutes=i),
+            warning_flags=["Sin seguro agrícola", "Bajo aporte propio"],
+        )
+        for i in range(count)
+    ]
+
+
+def run_scenario(service: TemplateService, requests: list) -> dict:
+    tracemalloc.start()
+    start = time.perf_counter()
+    for i, request in enumerate(requests):
+        if i % 3 == 0:
+            service.request_sent(request)
+        elif i % 3 == 1:
+            service.request_approved(request, approved_amount=request.requested_amount)
+        else:
+            service.request_rejected(request)
+    elapsed = time.perf_counter() - start
+    allocated, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "sends": len(requests),
+        "total_ms": round(elapsed * 1000, 2),
+        "per_render_us": round(elapsed / len(requests) * 1_000_000, 2),
+        "allocated_kib": round(allocated / 1024, 1),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sends", type=int, default=3000)
+    args = parser.parse_args()
+
+    requests = build_requests(args.sends)
+
+    build_start = time.perf_counter()
+    engine = TemplateEngine(cache_size=args.sends)
+    build_ms = (time.perf_counter() - build_start) * 1000
+    cached_service = TemplateService(engine=engine)
+    uncached_service = TemplateService(engine=TemplateEngine(cache_size=0))
+
+    results = {
+        "engine_build_ms": round(build_ms, 2),
+        "cold": run_scenario(cached_service, requests),
+        "warm": run_scenario(cached_service, requests),
+        "no_cache": run_scenario(uncached_service, requests),
+        "cache": {"hits": engine.hits, "misses": engine.misses},
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
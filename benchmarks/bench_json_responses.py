@@ -0,0 +1,105 @@
+"""
+Benchmark de serialización de respuestas de solicitudes.
+
+Compara, para listas de RequestResponse, el costo de construir el cuerpo
+JSON de la respuesta:
+- before: dict + jsonable_encoder + JSONResponse (comportamiento previo).
+- orjson: dict + jsonable_encoder + FastJSONResponse.
+- model: RequestListResponse serializado una vez con ModelResponse
+  (pydantic-core, sin jsonable_encoder).
+
+Uso:
+    python -m benchmarks.bench_json_responses --rows 100 1000 --repeat 50
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.modules.requests.dtos.crud_request_dto import (
+    RequestListResponse,
+    RequestResponse,
+)
+from app.shared.entities.client_profile_entity import ClientProfile  # noqa: F401
+from app.shared.entities.credit_type_enity import CreditType
+from app.shared.entities.notification_entity import Notification  # noqa: F401
+from app.shared.entities.notifications_user_entity import (  # noqa: F401
+    NotificationsUser,
+)
+from app.shared.entities.requestEntity import Request  # noqa: F401
+from app.shared.entities.request_status_entity import RequestStatus
+from app.shared.responses.json_response import FastJSONResponse, ModelResponse
+
+
+def build_rows(count: int) -> list:
+    base = datetime(2025, 5, 29, 10, 0)
+    credit_type = CreditType(name="Agrícola", code="AGRO", description="Crédito")
+    status = RequestStatus(name="Pendiente", code="PENDING", description="Estado")
+    return [
+        RequestResponse(
+            id=uuid4(),
+            client_id=uuid4(),
+            credit_type_id=credit_type.id,
+            status_id=status.id,
+            credit_type=credit_type,
+            status=status,
+            requested_amount=1000000.0 + i,
+            term_months=12 + i % 48,
+            annual_interest_rate=12.5,
+            risk_score=float(i % 1000),
+            risk_assessment_details={
+                "score_details": {"income": 50, "debt": 20, "history": i % 7},
+                "ratios": {"debt_to_income": 0.35, "loan_to_value": 0.8},
+            },
+            warning_flags=["Sin seguro agrícola", "Bajo aporte propio"],
+            purpose_description="Compra de fertilizantes y semillas.",
+            created_at=base + timedelta(minutes=i),
+            updated_at=base + timedelta(minutes=i),
+        )
+        for i in range(count)
+    ]
+
+
+def measure(render, repeat: int) -> dict:
+    render()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        body = render().body
+    elapsed = time.perf_counter() - start
+    return {
+        "per_response_ms": round(elapsed / repeat * 1000, 3),
+        "bytes": len(body),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    results = {}
+    for count in args.rows:
+        rows = build_rows(count)
+        results[count] = {
+            "before": measure(
+                lambda: JSONResponse(jsonable_encoder({"data": rows})), args.repeat
+            ),
+            "orjson": measure(
+                lambda: FastJSONResponse(jsonable_encoder({"data": rows})),
+                args.repeat,
+            ),
+            "model": measure(
+                lambda: ModelResponse(RequestListResponse(data=rows)), args.repeat
+            ),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark del costo de autenticación por request.
+
+Compara jwt_guard en tres escenarios:
+- no_cache: verificación completa del JWT en cada llamada (comportamiento
+  previo).
+- cached: caché de tokens verificados (mismos usuarios que vuelven).
+- memo: guard resuelto dos veces por request, como en approve_request; la
+  segunda resolución sale del memo en request.state.
+
+Uso:
+    python -m benchmarks.bench_jwt_guard --requests 20000 --users 100
+"""
+
+import argparse
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+from uuid import uuid4
+
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwt
+
+from app.shared.guards.jwtGuard import jwt_guard
+from app.shared.services.jwtService import JwtService
+from app.shared.services.token_cache import TokenCache
+
+SECRET = "benchmark-secret"
+AUDIENCE = "authenticated"
+
+
+def build_tokens(users: int) -> list:
+    exp = int(time.time()) + 3600
+    return [
+        HTTPAuthorizationCredentials(
+            scheme="Bearer",
+            credentials=jwt.encode(
+                {"sub": str(uuid4()), "aud": AUDIENCE, "exp": exp},
+                SECRET,
+                algorithm="HS256",
+            ),
+        )
+        for _ in range(users)
+    ]
+
+
+def run_scenario(service: JwtService, tokens: list, requests: int, calls: int):
+    start = time.perf_counter()
+    with patch("app.shared.guards.jwtGuard.get_jwt_service", return_value=service):
+        for i in range(requests):
+            request = SimpleNamespace(state=SimpleNamespace())
+            credentials = tokens[i % len(tokens)]
+            for _ in range(calls):
+                jwt_guard(request, credentials)
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": requests,
+        "guard_calls_per_request": calls,
+        "total_ms": round(elapsed * 1000, 2),
+        "per_request_us": round(elapsed / requests * 1_000_000, 2),
+        "cache": service.cache.stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=100)
+    args = parser.parse_args()
+
+    tokens = build_tokens(args.users)
+
+    def service(cache_size: int) -> JwtService:
+        return JwtService(
+            SECRET,
+            algorithm="HS256",
+            audience=AUDIENCE,
+            cache=TokenCache(max_size=cache_size),
+        )
+
+    results = {
+        "no_cache": run_scenario(service(0), tokens, args.requests, calls=1),
+        "cached": run_scenario(service(args.users), tokens, args.requests, calls=1),
+        "memo": run_scenario(service(args.users), tokens, args.requests, calls=2),
+        "no_cache_twice": run_scenario(service(0), tokens, args.requests, calls=2),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Prueba de carga con escenarios realistas contra la app real.
+
+Clientes que crean y ajustan solicitudes, analistas que paginan, filtran,
+aprueban y rechazan, y clientes escuchando el WebSocket. Reporta en JSON
+el throughput y las latencias p50/p95/p99 por endpoint.
+
+La base de datos es un SQLite temporal creado desde los modelos, o la
+indicada con --database-url (p. ej. un PostgreSQL local migrado con
+alembic). Con --generate se cargan antes datos sintéticos a escala. Los
+correos no se envían.
+
+Uso:
+    python -m benchmarks.bench_load --duration 30 --clients 50 --analysts 10
+    python -m benchmarks.bench_load --mode socket --database-url postgresql://...
+"""
+
+import argparse
+import asyncio
+import json
+
+from benchmarks.loadtest.runner import LoadConfig, run_load
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mode", choices=("asgi", "socket"), default="asgi")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--analysts", type=int, default=5)
+    parser.add_argument("--listeners", type=int, default=10)
+    parser.add_argument(
+        "--think-time",
+        type=float,
+        default=0.0,
+        help="Pausa media (s) entre pasos de cada usuario; 0 = carga máxima.",
+    )
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--generate",
+        type=int,
+        default=0,
+        help="Clientes sintéticos a cargar antes de la prueba (ver generate_data).",
+    )
+    args = parser.parse_args()
+
+    config = LoadConfig(
+        mode=args.mode,
+        duration=args.duration,
+        clients=args.clients,
+        analysts=args.analysts,
+        listeners=args.listeners,
+        think_time=args.think_time,
+        database_url=args.database_url,
+        seed=args.seed,
+        generate=args.generate,
+    )
+    print(json.dumps(asyncio.run(run_load(config)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
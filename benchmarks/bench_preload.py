@@ -0,0 +1,150 @@
+"""
+Benchmark de arranque y memoria de gunicorn con y sin preload.
+
+Para cada variante lanza gunicorn con gunicorn.conf.py y mide:
+- startup_to_first_response_ms: desde el lanzamiento hasta la primera
+  respuesta exitosa de "/".
+- first_request_ms / warm_request_ms: latencia del primer request y
+  mediana de los siguientes.
+- Por worker: RSS, PSS, memoria compartida y privada según
+  /proc/<pid>/smaps_rollup. PSS reparte las páginas compartidas entre los
+  procesos que las usan, así que su suma es el costo real de memoria.
+
+Requiere Linux. No necesita base de datos: "/" no consulta y las variables
+que falten se completan como en bench_import_time.
+
+Uso:
+    python -m benchmarks.bench_preload --workers 4 --requests 50
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.bench_import_time import PLACEHOLDER_ENV, ROOT
+
+SMAPS_FIELDS = (
+    "Rss",
+    "Pss",
+    "Shared_Clean",
+    "Shared_Dirty",
+    "Private_Clean",
+    "Private_Dirty",
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def memory_usage(pid: int) -> Dict[str, int]:
+    """Campos de smaps_rollup en KiB"""
+    usage = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines():
+        key, _, rest = line.partition(":")
+        if key in SMAPS_FIELDS:
+            usage[key] = int(rest.split()[0])
+    return {
+        "rss_kb": usage["Rss"],
+        "pss_kb": usage["Pss"],
+        "shared_kb": usage["Shared_Clean"] + usage["Shared_Dirty"],
+        "private_kb": usage["Private_Clean"] + usage["Private_Dirty"],
+    }
+
+
+def children(pid: int) -> List[int]:
+    path = Path(f"/proc/{pid}/task/{pid}/children")
+    return [int(p) for p in path.read_text().split()]
+
+
+def run_variant(preload: bool, workers: int, requests: int) -> dict:
+    port = _free_port()
+    env = {
+        **PLACEHOLDER_ENV,
+        **os.environ,
+        "GUNICORN_PRELOAD": "true" if preload else "false",
+        "GUNICORN_BIND": f"127.0.0.1:{port}",
+        "WEB_CONCURRENCY": str(workers),
+    }
+    url = f"http://127.0.0.1:{port}/"
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "main:app", "-c", "gunicorn.conf.py"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client(timeout=5) as client:
+            while True:
+                if process.poll() is not None:
+                    raise RuntimeError("gunicorn terminó antes de responder")
+                try:
+                    request_start = time.perf_counter()
+                    client.get(url).raise_for_status()
+                    break
+                except httpx.TransportError:
+                    time.sleep(0.02)
+            first_response = time.perf_counter()
+            first_request_ms = (first_response - request_start) * 1000
+
+            # Espera a que arranquen todos los workers
+            deadline = time.monotonic() + 30
+            while len(children(process.pid)) < workers and time.monotonic() < deadline:
+                time.sleep(0.05)
+            time.sleep(1)
+
+            latencies = []
+            for _ in range(requests):
+                request_start = time.perf_counter()
+                client.get(url).raise_for_status()
+                latencies.append((time.perf_counter() - request_start) * 1000)
+
+        per_worker = [memory_usage(pid) for pid in children(process.pid)]
+        master = memory_usage(process.pid)
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(30)
+
+    def avg(key: str) -> int:
+        return round(statistics.mean(w[key] for w in per_worker))
+
+    return {
+        "startup_to_first_response_ms": round((first_response - start) * 1000, 1),
+        "first_request_ms": round(first_request_ms, 2),
+        "warm_request_ms": round(statistics.median(latencies), 2),
+        "workers": len(per_worker),
+        "worker_avg_kb": {k: avg(k) for k in per_worker[0]},
+        "master_kb": master,
+        "total_pss_kb": master["pss_kb"] + sum(w["pss_kb"] for w in per_worker),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    results = {
+        name: run_variant(preload, args.workers, args.requests)
+        for name, preload in (("no_preload", False), ("preload", True))
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark de throughput del middleware de encabezados de seguridad.
+
+Compara la implementación ASGI pura contra la anterior basada en
+BaseHTTPMiddleware sobre dos rutas:
+- "/": respuesta mínima, donde domina el costo del middleware.
+- "/requests": listado JSON paginado (datos en memoria, sin base de datos).
+
+Las peticiones se envían con httpx.ASGITransport, sin red de por medio.
+
+Uso:
+    python -m benchmarks.bench_security_headers --requests 3000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from uuid import uuid4
+
+import httpx
+from fastapi import FastAPI, Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.config.security import SECURITY_HEADERS, SecurityHeadersMiddleware
+
+
+class LegacySecurityHeadersMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        response: Response = await call_next(request)
+        for name, value in SECURITY_HEADERS.items():
+            response.headers[name] = value
+        return response
+
+
+def build_app(middleware, rows: list) -> FastAPI:
+    app = FastAPI()
+    if middleware is not None:
+        app.add_middleware(middleware)
+
+    @app.get("/")
+    def index():
+        return "Bienvenido a la API de AgriCapital"
+
+    @app.get("/requests")
+    def list_requests(page: int = 1, limit: int = 20):
+        start = (page - 1) * limit
+        return {
+            "data": rows[start : start + limit],
+            "total": len(rows),
+            "page": page,
+            "limit": limit,
+        }
+
+    return app
+
+
+async def run_scenario(app: FastAPI, path: str, requests: int, concurrency: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        await c.get(path)
+        queue = asyncio.Queue()
+        for _ in range(requests):
+            queue.put_nowait(None)
+
+        async def worker():
+            while not queue.empty():
+                queue.get_nowait()
+                response = await c.get(path)
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return {
+        "requests": requests,
+        "rps": round(requests / elapsed, 1),
+        "per_request_us": round(elapsed / requests * 1_000_000, 2),
+    }
+
+
+async def main_async(args):
+    rows = [
+        {
+            "id": str(uuid4()),
+            "requested_amount": 1000000.0 + i,
+            "term_months": 12,
+            "status": "Pendiente",
+        }
+        for i in range(200)
+    ]
+    variants = {
+        "none": None,
+        "legacy": LegacySecurityHeadersMiddleware,
+        "asgi": SecurityHeadersMiddleware,
+    }
+    results = {}
+    for path in ("/", "/requests?limit=50"):
+        results[path] = {
+            name: await run_scenario(
+                build_app(middleware, rows), path, args.requests, args.concurrency
+            )
+            for name, middleware in variants.items()
+        }
+    print(json.dumps(results, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Carga datos sintéticos para pruebas a escala: perfiles de cliente,
+solicitudes y notificaciones de usuario con distribuciones plausibles de
+ingresos, tamaño de finca, puntaje crediticio y estados.
+
+En PostgreSQL los bloques se cargan con COPY en paralelo (un proceso y una
+conexión por bloque) y al final se ejecuta ANALYZE. El esquema debe estar
+migrado con alembic. En SQLite se crean las tablas y se inserta por lotes.
+
+Uso:
+    python -m benchmarks.generate_data --database-url postgresql://... \\
+        --clients 1000000 --chunk-size 50000 --workers 8 --seed 42
+"""
+
+import argparse
+import json
+
+from benchmarks.loadtest.datagen import generate
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--clients", type=int, default=100_000)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    report = generate(
+        args.database_url,
+        args.clients,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        seed=args.seed,
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
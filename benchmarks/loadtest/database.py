@@ -0,0 +1,104 @@
+"""
+Base de datos para las pruebas de carga: PostgreSQL local (esquema ya
+migrado con alembic) o un sustituto SQLite creado desde los modelos.
+"""
+
+import random
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List
+from uuid import UUID, uuid4
+
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, SQLModel, select
+
+from app.modules.requests.services.request_service import (
+    REQUEST_APPROVED_NOTIFICATION_ID,
+    REQUEST_REJECTED_NOTIFICATION_ID,
+    REQUEST_SENT_NOTIFICATION_ID,
+)
+from app.shared.entities.client_profile_entity import ClientProfile
+from app.shared.entities.credit_type_enity import CreditType
+from app.shared.entities.notification_entity import Notification
+from app.shared.entities.notifications_user_entity import NotificationsUser  # noqa
+from app.shared.entities.requestEntity import Request  # noqa: F401
+from app.shared.entities.request_status_entity import RequestStatus
+
+REQUEST_STATUSES = {
+    "PENDING": "Pendiente",
+    "APPROVED": "Aprobada",
+    "REJECTED": "Rechazada",
+}
+CREDIT_TYPES = {
+    "WORKING_CAPITAL": "Capital de trabajo",
+    "INVESTMENT": "Inversión",
+    "CONSUMPTION": "Consumo",
+}
+NOTIFICATIONS = {
+    REQUEST_SENT_NOTIFICATION_ID: "Solicitud enviada",
+    REQUEST_APPROVED_NOTIFICATION_ID: "Solicitud aprobada",
+    REQUEST_REJECTED_NOTIFICATION_ID: "Solicitud rechazada",
+}
+
+
+@dataclass
+class Fixtures:
+    status_ids: Dict[str, UUID]
+    credit_type_ids: List[UUID]
+    client_ids: List[UUID] = field(default_factory=list)
+
+
+def _get_or_create(session: Session, model, code: str, name: str):
+    instance = session.exec(select(model).where(model.code == code)).first()
+    if instance is None:
+        instance = model(code=code, name=name, description=name)
+        session.add(instance)
+        session.flush()
+    return instance
+
+
+def prepare_database(engine: Engine, clients: int, seed: int = 0) -> Fixtures:
+    """
+    Crea los datos de referencia que falten (estados, tipos de crédito y
+    notificaciones) y `clients` perfiles de cliente nuevos. En SQLite crea
+    antes las tablas.
+    """
+    if engine.dialect.name == "sqlite":
+        SQLModel.metadata.create_all(engine)
+
+    rng = random.Random(seed)
+    with Session(engine) as session:
+        statuses = {
+            code: _get_or_create(session, RequestStatus, code, name).id
+            for code, name in REQUEST_STATUSES.items()
+        }
+        credit_types = [
+            _get_or_create(session, CreditType, code, name).id
+            for code, name in CREDIT_TYPES.items()
+        ]
+        for notification_id, title in NOTIFICATIONS.items():
+            if session.get(Notification, notification_id) is None:
+                session.add(
+                    Notification(id=notification_id, title=title, message=title)
+                )
+
+        client_ids = []
+        for _ in range(clients):
+            profile = ClientProfile(
+                user_id=uuid4(),
+                email=f"loadtest-{rng.randrange(10**9)}@example.com",
+                date_of_birth=date(rng.randint(1960, 2000), rng.randint(1, 12), 1),
+                annual_income=rng.uniform(20_000_000, 200_000_000),
+                years_of_agricultural_experience=rng.randint(0, 30),
+                has_agricultural_insurance=rng.random() < 0.5,
+                internal_credit_history_score=rng.randint(300, 900),
+                current_debt_to_income_ratio=rng.uniform(0, 0.6),
+                farm_size_hectares=rng.uniform(1, 200),
+            )
+            session.add(profile)
+            client_ids.append(profile.user_id)
+        session.commit()
+
+    return Fixtures(
+        status_ids=statuses, credit_type_ids=credit_types, client_ids=client_ids
+    )
@@ -0,0 +1,382 @@
+"""
+Generador de datos sintéticos: perfiles de cliente, solicitudes y
+notificaciones de usuario con distribuciones plausibles.
+
+- Reproducible: cada bloque usa su propio generador sembrado con
+  (seed, índice del bloque), así que el resultado no depende de cuántos
+  procesos se usen ni del orden en que terminen.
+- PostgreSQL: cada bloque se genera y se carga con COPY en un proceso
+  aparte, con su propia conexión y transacción.
+- SQLite (sustituto local): inserción por lotes en un solo proceso.
+"""
+
+import csv
+import io
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy.engine import Engine, make_url
+
+from app.db.engine import create_db_engine
+from benchmarks.loadtest.database import NOTIFICATIONS, prepare_database
+
+CLIENT_COLUMNS = (
+    "user_id",
+    "email",
+    "date_of_birth",
+    "address_city",
+    "address_region",
+    "annual_income",
+    "years_of_agricultural_experience",
+    "has_agricultural_insurance",
+    "internal_credit_history_score",
+    "current_debt_to_income_ratio",
+    "farm_size_hectares",
+    "created_at",
+    "updated_at",
+)
+REQUEST_COLUMNS = (
+    "id",
+    "client_id",
+    "requested_amount",
+    "term_months",
+    "annual_interest_rate",
+    "credit_type_id",
+    "status_id",
+    "created_at",
+    "updated_at",
+    "approved_amount",
+    "approved_at",
+    "analyst_id",
+    "rejection_reason",
+    "risk_score",
+    "risk_assessment_details",
+    "warning_flags",
+    "applicant_contribution_amount",
+    "collateral_value",
+    "number_of_dependents",
+    "other_income_sources",
+    "previous_defaults",
+)
+NOTIFICATION_USER_COLUMNS = (
+    "id",
+    "notification_id",
+    "user_id",
+    "read_at",
+    "created_at",
+    "updated_at",
+)
+TABLES = (
+    ("client_profiles", CLIENT_COLUMNS),
+    ("requests", REQUEST_COLUMNS),
+    ("notifications_users", NOTIFICATION_USER_COLUMNS),
+)
+JSON_COLUMNS = {"risk_assessment_details", "warning_flags"}
+
+REGIONS = {
+    "Antioquia": ("Medellín", "Rionegro", "Urrao"),
+    "Boyacá": ("Tunja", "Duitama", "Sogamoso"),
+    "Cundinamarca": ("Zipaquirá", "Fusagasugá", "Facatativá"),
+    "Huila": ("Neiva", "Pitalito", "Garzón"),
+    "Meta": ("Villavicencio", "Granada", "Puerto López"),
+    "Nariño": ("Pasto", "Ipiales", "Túquerres"),
+    "Tolima": ("Ibagué", "Espinal", "Líbano"),
+}
+STATUS_WEIGHTS = {"PENDING": 0.5, "APPROVED": 0.3, "REJECTED": 0.2}
+REJECTION_REASONS = (
+    "Capacidad de pago insuficiente",
+    "Historial crediticio desfavorable",
+    "Garantía insuficiente",
+    "Nivel de endeudamiento elevado",
+)
+TERMS = (6, 12, 18, 24, 36, 48, 60)
+TERM_WEIGHTS = (5, 30, 10, 25, 15, 10, 5)
+HISTORY_DAYS = 730
+# Fecha de referencia fija: con la misma semilla se obtienen las mismas filas
+REFERENCE_NOW = datetime(2025, 6, 1)
+
+
+@dataclass(frozen=True)
+class References:
+    status_ids: Dict[str, UUID]
+    credit_type_ids: Sequence[UUID]
+    notification_ids: Sequence[UUID]
+    now: datetime
+
+
+def _uuid(rng: random.Random) -> UUID:
+    return UUID(int=rng.getrandbits(128), version=4)
+
+
+def _lognormal(rng: random.Random, median: float, sigma: float) -> float:
+    return rng.lognormvariate(math.log(median), sigma)
+
+
+def _clip(value: float, low: float, high: float) -> float:
+    return max(low, min(high, value))
+
+
+def _created_at(rng: random.Random, now: datetime) -> datetime:
+    # Más actividad reciente: la antigüedad sigue una exponencial truncada
+    days = min(rng.expovariate(1 / 180), HISTORY_DAYS)
+    return now - timedelta(days=days, seconds=rng.randrange(86400))
+
+
+def _risk(score: int, dti: float, insured: bool, ratio: float) -> tuple:
+    """Aproximación barata del puntaje de riesgo (0-100) y sus alertas"""
+    risk = 100 - (score - 300) / 6 + dti * 40 + ratio * 25 - (8 if insured else 0)
+    risk = round(_clip(risk, 0, 100), 2)
+    flags = []
+    if score < 500:
+        flags.append("Historial crediticio bajo")
+    if dti > 0.4:
+        flags.append("Alto nivel de endeudamiento")
+    if not insured:
+        flags.append("Sin seguro agrícola")
+    if ratio > 0.35:
+        flags.append("Cuota alta frente al ingreso")
+    return risk, flags
+
+
+def generate_chunk(
+    index: int, start: int, count: int, seed: int, refs: References
+) -> Dict[str, List[dict]]:
+    """Filas de los clientes [start, start + count) con sus solicitudes"""
+    rng = random.Random(f"{seed}:{index}")
+    now = refs.now
+    statuses, weights = zip(*STATUS_WEIGHTS.items())
+    clients, requests, notifications = [], [], []
+
+    for number in range(start, start + count):
+        user_id = _uuid(rng)
+        created_at = _created_at(rng, now)
+        age = int(_clip(rng.gauss(45, 12), 18, 80))
+        income = round(_clip(_lognormal(rng, 38_000_000, 0.7), 8_000_000, 2e9), 2)
+        farm_size = round(_clip(_lognormal(rng, 8, 1.1), 0.5, 5_000), 2)
+        score = int(_clip(rng.gauss(640, 95), 300, 900))
+        dti = round(rng.betavariate(2, 5) * 0.9, 4)
+        insured = rng.random() < _clip(0.15 + farm_size / 100, 0, 0.9)
+        region = rng.choice(tuple(REGIONS))
+        clients.append(
+            {
+                "user_id": user_id,
+                "email": f"cliente{number}@example.com",
+                "date_of_birth": date(now.year - age, rng.randint(1, 12), 1),
+                "address_city": rng.choice(REGIONS[region]),
+                "address_region": region,
+                "annual_income": income,
+                "years_of_agricultural_experience": rng.randint(0, max(0, age - 18)),
+                "has_agricultural_insurance": insured,
+                "internal_credit_history_score": score,
+                "current_debt_to_income_ratio": dti,
+                "farm_size_hectares": farm_size,
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+        )
+
+        # ~85 % de los clientes tiene una solicitud (a lo sumo una por cliente)
+        if rng.random() >= 0.85:
+            continue
+        requested_at = min(
+            created_at + timedelta(hours=rng.uniform(1, 72)), now - timedelta(hours=1)
+        )
+        amount = round(_clip(income * rng.uniform(0.1, 1.5), 1e6, 5e9), -3)
+        term = rng.choices(TERMS, TERM_WEIGHTS)[0]
+        rate = round(rng.uniform(12, 32), 2)
+        monthly_rate = rate / 100 / 12
+        payment = amount * monthly_rate / (1 - (1 + monthly_rate) ** -term)
+        ratio = payment * 12 / income
+        risk, flags = _risk(score, dti, insured, ratio)
+        status = rng.choices(statuses, weights)[0]
+        decided_at = requested_at + timedelta(days=rng.uniform(0.5, 10))
+        if decided_at >= now:
+            # Una decisión posterior a la fecha de referencia aún no ocurrió
+            status = "PENDING"
+        collateral = (
+            round(amount * rng.uniform(0.5, 2), -3) if rng.random() < 0.6 else None
+        )
+        requests.append(
+            {
+                "id": _uuid(rng),
+                "client_id": user_id,
+                "requested_amount": amount,
+                "term_months": term,
+                "annual_interest_rate": rate,
+                "credit_type_id": rng.choice(refs.credit_type_ids),
+                "status_id": refs.status_ids[status],
+                "created_at": requested_at,
+                "updated_at": requested_at if status == "PENDING" else decided_at,
+                "approved_amount": (
+                    round(amount * rng.uniform(0.7, 1), -3)
+                    if status == "APPROVED"
+                    else None
+                ),
+                "approved_at": decided_at if status == "APPROVED" else None,
+                "analyst_id": _uuid(rng) if status != "PENDING" else None,
+                "rejection_reason": (
+                    rng.choice(REJECTION_REASONS) if status == "REJECTED" else None
+                ),
+                "risk_score": risk,
+                "risk_assessment_details": {
+                    "credit_score": score,
+                    "debt_to_income": dti,
+                    "payment_to_income_ratio": round(ratio, 4),
+                    "final_risk_score": risk,
+                },
+                "warning_flags": flags,
+                "applicant_contribution_amount": round(
+                    amount * rng.uniform(0, 0.3), -3
+                ),
+                "collateral_value": collateral,
+                "number_of_dependents": min(int(rng.expovariate(1 / 1.8)), 10),
+                "other_income_sources": (
+                    round(income * rng.uniform(0, 0.3), 2)
+                    if rng.random() < 0.4
+                    else 0.0
+                ),
+                "previous_defaults": rng.choices((0, 1, 2, 3), (80, 13, 5, 2))[0],
+            }
+        )
+
+        # Notificación de envío y, si ya se decidió, la de la decisión
+        sent, approved, rejected = refs.notification_ids
+        events = [(sent, requested_at)]
+        if status != "PENDING":
+            events.append((approved if status == "APPROVED" else rejected, decided_at))
+        for notification_id, at in events:
+            read_at = (
+                at + timedelta(hours=rng.expovariate(1 / 24))
+                if rng.random() < 0.7
+                else None
+            )
+            notifications.append(
+                {
+                    "id": _uuid(rng),
+                    "notification_id": notification_id,
+                    "user_id": user_id,
+                    "read_at": read_at if read_at and read_at < now else None,
+                    "created_at": at,
+                    "updated_at": at,
+                }
+            )
+
+    return {
+        "client_profiles": clients,
+        "requests": requests,
+        "notifications_users": notifications,
+    }
+
+
+def _csv_value(column: str, value):
+    if value is None:
+        return None
+    if column in JSON_COLUMNS:
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def to_csv(rows: List[dict], columns: Sequence[str]) -> io.StringIO:
+    """CSV para COPY ... (FORMAT csv): los None quedan como campo vacío (NULL)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    for row in rows:
+        writer.writerow([_csv_value(c, row[c]) for c in columns])
+    buffer.seek(0)
+    return buffer
+
+
+def _copy_chunk(dsn: str, index: int, start: int, count: int, seed: int, refs):
+    """Genera y carga un bloque; se ejecuta en un proceso del pool"""
+    import psycopg2
+
+    tables = generate_chunk(index, start, count, seed, refs)
+    with psycopg2.connect(dsn) as conn, conn.cursor() as cursor:
+        for table, columns in TABLES:
+            cursor.copy_expert(
+                f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                to_csv(tables[table], columns),
+            )
+    conn.close()
+    return {table: len(rows) for table, rows in tables.items()}
+
+
+def _insert_chunk(engine: Engine, tables: Dict[str, List[dict]]) -> Dict[str, int]:
+    from sqlmodel import SQLModel
+
+    with engine.begin() as conn:
+        for table, _ in TABLES:
+            if tables[table]:
+                conn.execute(SQLModel.metadata.tables[table].insert(), tables[table])
+    return {table: len(rows) for table, rows in tables.items()}
+
+
+def _chunks(clients: int, chunk_size: int):
+    for index, start in enumerate(range(0, clients, chunk_size)):
+        yield index, start, min(chunk_size, clients - start)
+
+
+def generate(
+    database_url: str,
+    clients: int,
+    chunk_size: int = 50_000,
+    workers: Optional[int] = None,
+    seed: int = 0,
+    engine: Optional[Engine] = None,
+    now: datetime = REFERENCE_NOW,
+) -> dict:
+    """
+    Carga `clients` perfiles (con sus solicitudes y notificaciones) y
+    devuelve las filas insertadas por tabla y la duración.
+    """
+    engine = engine or create_db_engine(database_url)
+    fixtures = prepare_database(engine, clients=0, seed=seed)
+    refs = References(
+        status_ids=fixtures.status_ids,
+        credit_type_ids=tuple(sorted(fixtures.credit_type_ids)),
+        notification_ids=tuple(NOTIFICATIONS),
+        now=now,
+    )
+    totals = {table: 0 for table, _ in TABLES}
+    start = time.perf_counter()
+
+    if engine.dialect.name == "postgresql":
+        dsn = (
+            make_url(database_url)
+            .set(drivername="postgresql")
+            .render_as_string(hide_password=False)
+        )
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            futures = [
+                pool.submit(_copy_chunk, dsn, index, offset, count, seed, refs)
+                for index, offset, count in _chunks(clients, chunk_size)
+            ]
+            for future in futures:
+                for table, rows in future.result().items():
+                    totals[table] += rows
+        with engine.begin() as conn:
+            conn.exec_driver_sql(
+                "ANALYZE client_profiles, requests, notifications_users"
+            )
+    else:
+        for index, offset, count in _chunks(clients, chunk_size):
+            tables = generate_chunk(index, offset, count, seed, refs)
+            for table, rows in _insert_chunk(engine, tables).items():
+                totals[table] += rows
+
+    elapsed = time.perf_counter() - start
+    return {
+        "rows": totals,
+        "seconds": round(elapsed, 2),
+        "rows_per_second": round(sum(totals.values()) / elapsed) if elapsed else None,
+    }
@@ -0,0 +1,282 @@
+"""
+Ejecución de la prueba de carga contra la app real (main.app):
+- mode="asgi": en proceso, con httpx.ASGITransport y un cliente WebSocket
+  ASGI mínimo; mide la app sin red de por medio.
+- mode="socket": la app se sirve con uvicorn en un puerto local y httpx y
+  websockets se conectan por TCP.
+
+En ambos casos generador y app comparten el event loop, como un único
+worker de uvicorn: la cifra es una cota inferior de lo que sostiene un
+worker dedicado.
+"""
+
+import asyncio
+import os
+import random
+import socket
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Optional
+from uuid import UUID, uuid4
+
+import httpx
+from jose import jwt
+
+from benchmarks.bench_import_time import PLACEHOLDER_ENV
+
+JWT_SECRET = "loadtest-secret"
+JWT_AUDIENCE = "authenticated"
+
+
+@dataclass
+class LoadConfig:
+    mode: str = "asgi"
+    duration: float = 10.0
+    clients: int = 20
+    analysts: int = 5
+    listeners: int = 10
+    think_time: float = 0.0
+    database_url: Optional[str] = None
+    seed: int = 0
+    # Clientes sintéticos (con solicitudes) a cargar antes de la prueba
+    generate: int = 0
+
+
+def prepare_environment(database_url: Optional[str]) -> str:
+    """
+    Variables para importar main. Sin DATABASE_URL explícita se usa un
+    SQLite nuevo en un directorio temporal. Debe llamarse antes de
+    importar cualquier módulo que lea los settings.
+    """
+    if database_url is None:
+        path = os.path.join(tempfile.mkdtemp(prefix="loadtest-"), "loadtest.db")
+        database_url = f"sqlite:///{path}"
+    for key, value in PLACEHOLDER_ENV.items():
+        os.environ.setdefault(key, value)
+    os.environ.update(
+        {
+            "DATABASE_URL": database_url,
+            "DATABASE_ECHO": "false",
+            "JWT_SECRET_KEY": JWT_SECRET,
+            "JWT_ALGORITHM": "HS256",
+            "JWT_AUDIENCE": JWT_AUDIENCE,
+            "JWT_JWKS_URL": "",
+            "WS_BROADCAST_BACKEND": "memory",
+        }
+    )
+    return database_url
+
+
+class _NullMailTransport:
+    """Sustituye a FastMail: la prueba de carga no envía correos"""
+
+    async def send_message(self, message) -> None:
+        return None
+
+
+class AsgiWebSocket:
+    """Cliente WebSocket que habla ASGI directamente con la app"""
+
+    def __init__(self, app, path: str):
+        self.app = app
+        self.path = path
+        self._to_app: asyncio.Queue = asyncio.Queue()
+        self._from_app: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self):
+        scope = {
+            "type": "websocket",
+            "asgi": {"version": "3.0"},
+            "scheme": "ws",
+            "http_version": "1.1",
+            "path": self.path,
+            "raw_path": self.path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"host", b"loadtest")],
+            "client": ("127.0.0.1", 0),
+            "server": ("loadtest", 80),
+            "subprotocols": [],
+        }
+        await self._to_app.put({"type": "websocket.connect"})
+        self._task = asyncio.create_task(
+            self.app(scope, self._to_app.get, self._from_app.put)
+        )
+        message = await self._from_app.get()
+        if message["type"] != "websocket.accept":
+            raise ConnectionError(f"WebSocket rechazado: {message}")
+        return self
+
+    async def receive(self) -> str:
+        message = await self._from_app.get()
+        if message["type"] == "websocket.close":
+            raise ConnectionError("WebSocket cerrado por el servidor")
+        return message.get("text") or message.get("bytes", b"").decode()
+
+    async def __aexit__(self, *exc):
+        await self._to_app.put({"type": "websocket.disconnect", "code": 1000})
+        try:
+            await asyncio.wait_for(self._task, timeout=5)
+        except (asyncio.TimeoutError, Exception):
+            self._task.cancel()
+
+
+@asynccontextmanager
+async def _socket_websocket(base_url: str, path: str):
+    import websockets
+
+    async with websockets.connect(base_url + path) as ws:
+
+        class _Adapter:
+            async def receive(self) -> str:
+                try:
+                    return await ws.recv()
+                except websockets.ConnectionClosed as e:
+                    raise ConnectionError(str(e)) from e
+
+        yield _Adapter()
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _token_factory():
+    exp = int(time.time()) + 24 * 3600
+    tokens = {}
+
+    def token_for(user_id: UUID) -> str:
+        token = tokens.get(user_id)
+        if token is None:
+            token = tokens[user_id] = jwt.encode(
+                {"sub": str(user_id), "aud": JWT_AUDIENCE, "exp": exp},
+                JWT_SECRET,
+                algorithm="HS256",
+            )
+        return token
+
+    return token_for
+
+
+async def _run_scenarios(config: LoadConfig, app, client, ws_connect, fixtures):
+    from benchmarks.loadtest import scenarios
+    from benchmarks.loadtest.stats import LoadStats
+
+    stats = LoadStats()
+    ctx = scenarios.Context(
+        client=client,
+        stats=stats,
+        fixtures=fixtures,
+        token_for=_token_factory(),
+        ws_connect=ws_connect,
+        stop=asyncio.Event(),
+        think_time=config.think_time,
+        seed=config.seed,
+    )
+    rng = random.Random(config.seed)
+    tasks = [
+        asyncio.create_task(scenarios.client_scenario(ctx, client_id))
+        for client_id in fixtures.client_ids[: config.clients]
+    ]
+    tasks += [
+        asyncio.create_task(scenarios.analyst_scenario(ctx, uuid4()))
+        for _ in range(config.analysts)
+    ]
+    listener_ids = rng.sample(
+        fixtures.client_ids, min(config.listeners, len(fixtures.client_ids))
+    )
+    tasks += [
+        asyncio.create_task(scenarios.websocket_listener(ctx, user_id))
+        for user_id in listener_ids
+    ]
+    await asyncio.sleep(config.duration)
+    ctx.stop.set()
+    await asyncio.gather(*tasks)
+    stats.finish()
+    return stats.summary()
+
+
+async def run_load(config: LoadConfig) -> dict:
+    database_url = prepare_environment(config.database_url)
+
+    import main
+    from app.db.session import engine
+    from app.modules.mails.dependencies import get_mail_service
+    from app.modules.mails.services.mail_service import MailService
+    from benchmarks.loadtest.database import prepare_database
+
+    fixtures = prepare_database(
+        engine, max(config.clients, config.listeners), seed=config.seed
+    )
+    generated = None
+    if config.generate:
+        from benchmarks.loadtest.datagen import generate
+
+        generated = generate(
+            database_url, config.generate, seed=config.seed, engine=engine
+        )
+    app = main.app
+    app.dependency_overrides[get_mail_service] = lambda: MailService(
+        _NullMailTransport()
+    )
+
+    if config.mode == "asgi":
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://loadtest"
+            ) as client:
+                summary = await _run_scenarios(
+                    config,
+                    app,
+                    client,
+                    lambda path: AsgiWebSocket(app, path),
+                    fixtures,
+                )
+    elif config.mode == "socket":
+        import uvicorn
+
+        port = _free_port()
+        server = uvicorn.Server(
+            uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+        )
+        serve = asyncio.create_task(server.serve())
+        while not server.started:
+            if serve.done():
+                serve.result()
+            await asyncio.sleep(0.01)
+        try:
+            async with httpx.AsyncClient(
+                base_url=f"http://127.0.0.1:{port}",
+                limits=httpx.Limits(max_connections=None),
+            ) as client:
+                summary = await _run_scenarios(
+                    config,
+                    app,
+                    client,
+                    lambda path: _socket_websocket(f"ws://127.0.0.1:{port}", path),
+                    fixtures,
+                )
+        finally:
+            server.should_exit = True
+            await serve
+    else:
+        raise ValueError(f"Modo desconocido: {config.mode}")
+
+    return {
+        "config": {
+            "mode": config.mode,
+            "database": engine.dialect.name,
+            "clients": config.clients,
+            "analysts": config.analysts,
+            "listeners": config.listeners,
+            "think_time_s": config.think_time,
+            "generated": generated,
+        },
+        **summary,
+    }
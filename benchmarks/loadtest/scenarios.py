@@ -0,0 +1,194 @@
+"""
+Escenarios de usuario. Cada uno es una corrutina que repite su guion
+hasta que se activa `ctx.stop`:
+- client_scenario: un cliente crea su solicitud, la consulta y la ajusta.
+- analyst_scenario: un analista pagina y filtra solicitudes, abre una
+  pendiente y la aprueba o la rechaza.
+- websocket_listener: un cliente conectado al WebSocket de notificaciones.
+"""
+
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+from uuid import UUID
+
+import httpx
+
+from benchmarks.loadtest.database import Fixtures
+from benchmarks.loadtest.stats import LoadStats
+
+
+@dataclass
+class Context:
+    client: httpx.AsyncClient
+    stats: LoadStats
+    fixtures: Fixtures
+    token_for: Callable[[UUID], str]
+    # ws_connect(path) -> async context manager con receive() -> str
+    ws_connect: Callable[[str], Any]
+    stop: asyncio.Event
+    think_time: float = 0.0
+    seed: int = 0
+
+
+async def call(
+    ctx: Context, name: str, method: str, url: str, user_id: UUID, **kwargs
+) -> Optional[httpx.Response]:
+    headers = {"Authorization": f"Bearer {ctx.token_for(user_id)}"}
+    start = time.perf_counter()
+    try:
+        response = await ctx.client.request(method, url, headers=headers, **kwargs)
+    except httpx.HTTPError as e:
+        ctx.stats.record_failure(name, e)
+        return None
+    ctx.stats.record(name, time.perf_counter() - start, response.status_code)
+    return response
+
+
+def _data(response: Optional[httpx.Response]) -> Any:
+    if response is None or response.status_code >= 400:
+        return None
+    return response.json().get("data")
+
+
+async def _think(ctx: Context, rng: random.Random) -> None:
+    if ctx.think_time > 0:
+        await asyncio.sleep(rng.expovariate(1 / ctx.think_time))
+    else:
+        await asyncio.sleep(0)
+
+
+async def client_scenario(ctx: Context, client_id: UUID) -> None:
+    rng = random.Random(f"{ctx.seed}-{client_id}")
+    while not ctx.stop.is_set():
+        created = _data(
+            await call(
+                ctx,
+                "POST /requests/",
+                "POST",
+                "/requests/",
+                client_id,
+                json={
+                    "client_id": str(client_id),
+                    "requested_amount": round(rng.uniform(1e6, 50e6), 2),
+                    "term_months": rng.choice((6, 12, 24, 36)),
+                    "annual_interest_rate": round(rng.uniform(10, 30), 2),
+                    "credit_type_id": str(rng.choice(ctx.fixtures.credit_type_ids)),
+                    "status_id": str(ctx.fixtures.status_ids["PENDING"]),
+                    "number_of_dependents": rng.randint(0, 4),
+                    "other_income_sources": round(rng.uniform(0, 5e6), 2),
+                    "previous_defaults": rng.choice((0, 0, 0, 1)),
+                    "collateral_value": round(rng.uniform(0, 80e6), 2),
+                },
+            )
+        )
+        await _think(ctx, rng)
+        await call(
+            ctx,
+            "GET /requests/client/{client_id}",
+            "GET",
+            f"/requests/client/{client_id}",
+            client_id,
+        )
+        await _think(ctx, rng)
+        if created:
+            await call(
+                ctx,
+                "PATCH /requests/{id}",
+                "PATCH",
+                f"/requests/{created['id']}",
+                client_id,
+                json={"requested_amount": round(rng.uniform(1e6, 50e6), 2)},
+            )
+        await _think(ctx, rng)
+
+
+async def analyst_scenario(ctx: Context, analyst_id: UUID) -> None:
+    rng = random.Random(f"{ctx.seed}-{analyst_id}")
+    statuses = ctx.fixtures.status_ids
+    while not ctx.stop.is_set():
+        await call(
+            ctx,
+            "GET /requests/paginated-list",
+            "GET",
+            "/requests/paginated-list",
+            analyst_id,
+            params={"page": rng.randint(1, 5), "per_page": 20},
+        )
+        await _think(ctx, rng)
+        pending = _data(
+            await call(
+                ctx,
+                "GET /requests/paginated-list?status_id",
+                "GET",
+                "/requests/paginated-list",
+                analyst_id,
+                params={
+                    "status_id": str(statuses["PENDING"]),
+                    "per_page": 20,
+                    "order_by": "created_at",
+                    "sort_order": "desc",
+                },
+            )
+        )
+        await _think(ctx, rng)
+        if not pending:
+            continue
+        request_id = rng.choice(pending)["id"]
+        request = _data(
+            await call(
+                ctx,
+                "GET /requests/{id}",
+                "GET",
+                f"/requests/{request_id}",
+                analyst_id,
+            )
+        )
+        await _think(ctx, rng)
+        if not request:
+            continue
+        if rng.random() < 0.6:
+            await call(
+                ctx,
+                "PATCH /requests/{id}/approve",
+                "PATCH",
+                f"/requests/{request_id}/approve",
+                analyst_id,
+                json={
+                    "approved_amount": request["requested_amount"],
+                    "status_id": str(statuses["APPROVED"]),
+                },
+            )
+        else:
+            await call(
+                ctx,
+                "PATCH /requests/{id}/reject",
+                "PATCH",
+                f"/requests/{request_id}/reject",
+                analyst_id,
+                json={
+                    "rejection_reason": "Capacidad de pago insuficiente",
+                    "status_id": str(statuses["REJECTED"]),
+                },
+            )
+        await _think(ctx, rng)
+
+
+async def websocket_listener(ctx: Context, user_id: UUID) -> None:
+    name = "WS /ws/{user_id}"
+    start = time.perf_counter()
+    try:
+        async with ctx.ws_connect(f"/ws/{user_id}") as ws:
+            ctx.stats.record(name, time.perf_counter() - start, 101)
+            while not ctx.stop.is_set():
+                try:
+                    raw = await asyncio.wait_for(ws.receive(), timeout=0.5)
+                except asyncio.TimeoutError:
+                    continue
+                message: Dict[str, Any] = json.loads(raw)
+                ctx.stats.record_ws_message(message.get("type", "unknown"))
+    except (ConnectionError, OSError) as e:
+        ctx.stats.record_failure(name, e)
@@ -0,0 +1,92 @@
+import math
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Sequence
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> Optional[float]:
+    """Percentil por rango más cercano sobre valores ya ordenados"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class EndpointStats:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.statuses: Counter = Counter()
+        self.errors = 0
+
+    def summary(self, elapsed: float) -> dict:
+        values = sorted(self.latencies)
+
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 2) if value is not None else None
+
+        return {
+            "count": len(values),
+            "errors": self.errors,
+            "throughput_rps": round(len(values) / elapsed, 2) if elapsed else None,
+            "p50_ms": ms(percentile(values, 50)),
+            "p95_ms": ms(percentile(values, 95)),
+            "p99_ms": ms(percentile(values, 99)),
+            "max_ms": ms(values[-1] if values else None),
+            "statuses": {
+                str(k): v
+                for k, v in sorted(self.statuses.items(), key=lambda i: str(i[0]))
+            },
+        }
+
+
+class LoadStats:
+    """
+    Latencias por endpoint. Se cuentan como error las respuestas 5xx y
+    las fallas de transporte; los 4xx esperables (p. ej. 404) no.
+    """
+
+    def __init__(self):
+        self.endpoints: Dict[str, EndpointStats] = {}
+        self.ws_messages: Counter = Counter()
+        self.started_at = time.perf_counter()
+        self.finished_at: Optional[float] = None
+
+    def _endpoint(self, name: str) -> EndpointStats:
+        stats = self.endpoints.get(name)
+        if stats is None:
+            stats = self.endpoints[name] = EndpointStats()
+        return stats
+
+    def record(self, name: str, seconds: float, status: int) -> None:
+        stats = self._endpoint(name)
+        stats.latencies.append(seconds)
+        stats.statuses[status] += 1
+        if status >= 500:
+            stats.errors += 1
+
+    def record_failure(self, name: str, exc: BaseException) -> None:
+        stats = self._endpoint(name)
+        stats.errors += 1
+        stats.statuses[type(exc).__name__] += 1
+
+    def record_ws_message(self, message_type: str) -> None:
+        self.ws_messages[message_type] += 1
+
+    def finish(self) -> None:
+        self.finished_at = time.perf_counter()
+
+    def summary(self) -> dict:
+        end = self.finished_at or time.perf_counter()
+        elapsed = end - self.started_at
+        total = sum(len(s.latencies) for s in self.endpoints.values())
+        return {
+            "duration_s": round(elapsed, 3),
+            "requests": total,
+            "throughput_rps": round(total / elapsed, 2) if elapsed else None,
+            "errors": sum(s.errors for s in self.endpoints.values()),
+            "endpoints": {
+                name: stats.summary(elapsed)
+                for name, stats in sorted(self.endpoints.items())
+            },
+            "websocket_messages": dict(self.ws_messages),
+        }
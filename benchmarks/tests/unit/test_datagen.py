@@ -0,0 +1,89 @@
+import csv
+import statistics
+from datetime import datetime
+from uuid import uuid4
+import pytest
+from sqlmodel import Session, func, select
+from app.db.engine import create_db_engine
+from benchmarks.loadtest.datagen import (
+    CLIENT_COLUMNS,
+    REQUEST_COLUMNS,
+    References,
+    generate,
+    generate_chunk,
+    to_csv,
+)
+from app.shared.entities.client_profile_entity import ClientProfile
+from app.shared.entities.notifications_user_entity import NotificationsUser
+from app.shared.entities.requestEntity import Request
+
+
+@pytest.fixture
+def refs():
+    return References(
+        status_ids={code: uuid4() for code in ("PENDING", "APPROVED", "REJECTED")},
+        credit_type_ids=(uuid4(), uuid4()),
+        notification_ids=(uuid4(), uuid4(), uuid4()),
+        now=datetime(2025, 6, 1),
+    )
+
+
+def test_chunks_are_reproducible_and_independent(refs):
+    first = generate_chunk(3, 300, 100, seed=7, refs=refs)
+
+    assert first == generate_chunk(3, 300, 100, seed=7, refs=refs)
+    assert first != generate_chunk(4, 300, 100, seed=7, refs=refs)
+    assert first != generate_chunk(3, 300, 100, seed=8, refs=refs)
+
+
+def test_distributions_are_plausible(refs):
+    tables = generate_chunk(0, 0, 5000, seed=1, refs=refs)
+    clients, requests = tables["client_profiles"], tables["requests"]
+    incomes = [c["annual_income"] for c in clients]
+    scores = [c["internal_credit_history_score"] for c in clients]
+
+    assert 25e6 < statistics.median(incomes) < 55e6
+    assert statistics.mean(incomes) > statistics.median(incomes)  # cola larga
+    assert all(300 <= s <= 900 for s in scores)
+    assert 0.8 < len(requests) / len(clients) < 0.9
+    assert len({r["client_id"] for r in requests}) == len(requests)
+
+    by_status = {code: 0 for code in refs.status_ids}
+    ids = {v: k for k, v in refs.status_ids.items()}
+    for request in requests:
+        by_status[ids[request["status_id"]]] += 1
+        approved = ids[request["status_id"]] == "APPROVED"
+        assert (request["approved_at"] is not None) == approved
+        assert request["approved_at"] is None or request["approved_at"] < refs.now
+    assert by_status["PENDING"] > by_status["APPROVED"] > by_status["REJECTED"]
+
+
+def test_csv_writes_nulls_as_empty_fields_and_json_columns(refs):
+    tables = generate_chunk(0, 0, 50, seed=1, refs=refs)
+    request = next(r for r in tables["requests"] if r["approved_at"] is None)
+
+    row = next(csv.reader(to_csv([request], REQUEST_COLUMNS)))
+    values = dict(zip(REQUEST_COLUMNS, row))
+
+    assert values["approved_at"] == ""
+    assert values["warning_flags"].startswith("[")
+    assert values["risk_assessment_details"].startswith("{")
+    assert len(
+        next(csv.reader(to_csv(tables["client_profiles"], CLIENT_COLUMNS)))
+    ) == len(CLIENT_COLUMNS)
+
+
+def test_generate_into_sqlite(tmp_path):
+    url = f"sqlite:///{tmp_path / 'data.db'}"
+    engine = create_db_engine(url)
+
+    report = generate(url, 1200, chunk_size=500, seed=3, engine=engine)
+
+    with Session(engine) as session:
+        assert session.exec(select(func.count(ClientProfile.user_id))).one() == 1200
+        assert session.exec(select(func.count(Request.id))).one() == (
+            report["rows"]["requests"]
+        )
+        assert session.exec(select(func.count(NotificationsUser.id))).one() == (
+            report["rows"]["notifications_users"]
+        )
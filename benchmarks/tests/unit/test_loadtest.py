@@ -0,0 +1,73 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+from benchmarks.loadtest.stats import LoadStats, percentile
+
+ROOT = Path(__file__).resolve().parents[3]
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([7], 99) == 7
+    assert percentile([], 50) is None
+
+
+def test_stats_summary_counts_5xx_and_transport_failures_as_errors():
+    stats = LoadStats()
+    stats.record("GET /a", 0.010, 200)
+    stats.record("GET /a", 0.030, 404)
+    stats.record("GET /a", 0.020, 503)
+    stats.record_failure("GET /a", ConnectionError("reset"))
+    stats.record_ws_message("new_notification")
+    stats.finish()
+
+    summary = stats.summary()
+    endpoint = summary["endpoints"]["GET /a"]
+
+    assert summary["requests"] == 3
+    assert endpoint["errors"] == 2
+    assert endpoint["p50_ms"] == 20.0
+    assert endpoint["max_ms"] == 30.0
+    assert endpoint["statuses"] == {
+        "200": 1,
+        "404": 1,
+        "503": 1,
+        "ConnectionError": 1,
+    }
+    assert summary["websocket_messages"] == {"new_notification": 1}
+
+
+def test_load_run_against_sqlite_standin():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.bench_load",
+            "--duration",
+            "1",
+            "--clients",
+            "3",
+            "--analysts",
+            "1",
+            "--listeners",
+            "2",
+        ],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    report = json.loads(result.stdout)
+
+    assert report["config"]["database"] == "sqlite"
+    assert report["errors"] == 0
+    assert report["endpoints"]["POST /requests/"]["count"] > 0
+    assert report["endpoints"]["WS /ws/{user_id}"]["count"] == 2
+    assert "p99_ms" in report["endpoints"]["GET /requests/paginated-list"]
@@ -0,0 +1,42 @@
+"""
+Configuración de gunicorn para producción.
+
+Con GUNICORN_PRELOAD (activo por defecto) la app se importa una sola vez en
+el master, se precalienta y se congela el heap antes de crear los workers,
+que comparten esas páginas copy-on-write.
+"""
+
+import multiprocessing
+import os
+import time
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() in ("1", "true", "yes")
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "0"))
+
+
+def when_ready(server):
+    if not server.cfg.preload_app:
+        return
+    from app.server.warmup import warm_up
+
+    start = time.perf_counter()
+    timings = warm_up(server.app.wsgi())
+    server.log.info(
+        "App precalentada en %.1f ms: %s", (time.perf_counter() - start) * 1000, timings
+    )
+
+
+def post_fork(server, worker):
+    if not server.cfg.preload_app:
+        return
+    from app.db.session import engine
+    from app.server.warmup import after_fork
+
+    after_fork(engine)
@@ -1,24 +1,68 @@
 from fastapi import FastAPI
+from app.admission.setup import setup_admission
+from app.config.compression import setup_compression
 from app.config.cors import setup_cors
+from app.config.profiling import install_profiling
 from app.config.security import SecurityHeadersMiddleware
+from app.db.session import engine
+from app.db.slow_queries import slow_query_recorder
+from app.metrics.controllers.metrics_routes import router as metricsRouter
+from app.metrics.setup import setup_metrics
+from app.modules.admin.controllers.admin_controller import adminRouter
+from app.modules.dashboard.controllers.dashboard_controller import dashboardRouter
 from app.modules.requests.controllers.request_controller import requestRouter
+from app.modules.requests.services.request_aggregates import create_reconciler
 from app.modules.clients.controllers.client_controller import clientRouter
 from app.modules.notifications.controllers.notification_controller import (
     notificationRouter,
 )
 from app.ws.controllers.websocket_routes import router as websocketRouter
-from dotenv import load_dotenv
+from app.shared.responses.json_response import FastJSONResponse
+from app.shared.services.jwtService import get_jwt_service
+from app.tracing.setup import setup_tracing, shutdown_tracing
+from app.ws.websocket_manager import heartbeat, start_broadcast, stop_broadcast
+from contextlib import asynccontextmanager
+from app.core.env import load_env
+
+load_env()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    jwks = get_jwt_service().key_cache
+    if jwks is not None:
+        jwks.start()
+    await start_broadcast()
+    heartbeat.start()
+    reconciler = create_reconciler(engine)
+    if reconciler is not None:
+        reconciler.start()
+    yield
+    if reconciler is not None:
+        await reconciler.stop()
+    await heartbeat.stop()
+    await stop_broadcast()
+    if jwks is not None:
+        jwks.stop()
+    shutdown_tracing()
 
-load_dotenv()
 
 app = FastAPI(
     title="AgriCapital API",
     description="Backend para la prueba técnica de AgriCapital",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
+# Admisión primero: CORS y cabeceras de seguridad envuelven también el 503
+setup_admission(app)
 setup_cors(app)
+setup_compression(app)
 app.add_middleware(SecurityHeadersMiddleware)
+setup_metrics(app, engine)
+slow_query_recorder.instrument(engine)
+setup_tracing(app, engine)
 
 
 @app.get("/")
@@ -30,3 +74,8 @@ app.include_router(requestRouter)
 app.include_router(clientRouter)
 app.include_router(notificationRouter)
 app.include_router(websocketRouter)
+app.include_router(adminRouter)
+app.include_router(dashboardRouter)
+app.include_router(metricsRouter)
+
+install_profiling(app)